@@ -70,7 +70,8 @@ class FearGreedCollector:
             print(f"[ERROR] Failed to parse CNN data: {e}")
             return None
 
-    def interpret_score(self, score: float) -> Tuple[str, str, str]:
+    @staticmethod
+    def interpret_score(score: float) -> Tuple[str, str, str]:
         """
         Interpretuje score Fear & Greed
 
@@ -180,8 +181,7 @@ if __name__ == "__main__":
     data = get_fear_greed_index()
 
     if data.get('score') is not None:
-        collector = FearGreedCollector()
-        emoji, label, desc = collector.interpret_score(data['score'])
+        emoji, label, desc = FearGreedCollector.interpret_score(data['score'])
 
         print(f"Score: {data['score']}/100")
         print(f"Rating: {emoji} {data['rating']}")
@@ -14,12 +14,14 @@ Użycie:
 
 import yfinance as yf
 import pandas as pd
+import numpy as np
 import json
 from typing import Dict, Optional, Any, Tuple
 from datetime import datetime, timedelta
 from .stock_analyzer import StockAnalyzer, AnalysisResult, Recommendation
 from database.db import DatabaseSession
 from database.models import StockCache
+from utils._fast_stats import rolling_mean_std
 
 
 def get_stock_data(ticker: str, period: str = "3mo", use_cache: bool = True) -> Dict[str, Any]:
@@ -248,7 +250,7 @@ def _extract_technicals(info: dict, history: pd.DataFrame) -> Dict[str, Any]:
 
     # Oblicz MA20 z history
     if not history.empty and len(history) >= 20:
-        technicals['ma_20'] = history['Close'].rolling(window=20).mean().iloc[-1]
+        technicals['ma_20'] = history['Close'].tail(20).mean()
     else:
         technicals['ma_20'] = None
 
@@ -337,17 +339,18 @@ def _calculate_rsi(prices: pd.Series, period: int = 14) -> Optional[float]:
         gain = delta.where(delta > 0, 0)
         loss = -delta.where(delta < 0, 0)
 
-        # Średnie zyski i straty (EMA)
-        avg_gain = gain.rolling(window=period).mean()
-        avg_loss = loss.rolling(window=period).mean()
+        # Średnie zyski i straty - potrzebne tylko z ostatniego okna (bez rolling po całej historii)
+        avg_gain = gain.tail(period).mean()
+        avg_loss = loss.tail(period).mean()
 
         # RS = Average Gain / Average Loss
-        rs = avg_gain / avg_loss
+        with np.errstate(divide='ignore', invalid='ignore'):
+            rs = np.float64(avg_gain) / avg_loss
 
         # RSI = 100 - (100 / (1 + RS))
         rsi = 100 - (100 / (1 + rs))
 
-        return round(rsi.iloc[-1], 2)
+        return round(rsi, 2)
 
     except (ZeroDivisionError, IndexError, KeyError):
         return None
@@ -425,11 +428,8 @@ def _calculate_bollinger_bands(prices: pd.Series, period: int = 20, std_dev: flo
         return None
 
     try:
-        # Middle Band = SMA
-        middle_band = prices.rolling(window=period).mean()
-
-        # Standard Deviation
-        std = prices.rolling(window=period).std()
+        # Middle Band = SMA + Standard Deviation (jedno przejście, kernel Numba)
+        middle_band, std = rolling_mean_std(prices.to_numpy(dtype=np.float64), period)
 
         # Upper Band = SMA + (std_dev * STD)
         upper_band = middle_band + (std_dev * std)
@@ -438,9 +438,9 @@ def _calculate_bollinger_bands(prices: pd.Series, period: int = 20, std_dev: flo
         lower_band = middle_band - (std_dev * std)
 
         # Bandwidth % = ((Upper - Lower) / Middle) * 100
-        current_middle = middle_band.iloc[-1]
-        current_upper = upper_band.iloc[-1]
-        current_lower = lower_band.iloc[-1]
+        current_middle = middle_band[-1]
+        current_upper = upper_band[-1]
+        current_lower = lower_band[-1]
         bandwidth = ((current_upper - current_lower) / current_middle) * 100 if current_middle > 0 else 0
 
         return {
@@ -457,29 +457,28 @@ def _calculate_bollinger_bands(prices: pd.Series, period: int = 20, std_dev: flo
         return None
 
 
-def _format_candlestick_data(history: pd.DataFrame) -> list:
+def _format_candlestick_data(history: pd.DataFrame) -> dict:
     """
     Formatuje dane historyczne dla wykresu candlestick.
 
+    Kolumny jako osobne listy (zamiast listy dict per wiersz) - strona buduje
+    z nich DataFrame bez przechodzenia po wierszach.
+
     Returns:
-        Lista dict: [{'date': '2024-01-01', 'open': 150, 'high': 155, ...}, ...]
+        Dict list: {'date': ['2024-01-01', ...], 'open': [150, ...], 'high': [...], ...}
+        lub pusty dict gdy brak historii
     """
     if history.empty:
-        return []
-
-    candlestick = []
+        return {}
 
-    for date, row in history.iterrows():
-        candlestick.append({
-            'date': date.strftime('%Y-%m-%d'),
-            'open': round(row['Open'], 2),
-            'high': round(row['High'], 2),
-            'low': round(row['Low'], 2),
-            'close': round(row['Close'], 2),
-            'volume': int(row['Volume'])
-        })
-
-    return candlestick
+    return {
+        'date': history.index.strftime('%Y-%m-%d').tolist(),
+        'open': history['Open'].round(2).tolist(),
+        'high': history['High'].round(2).tolist(),
+        'low': history['Low'].round(2).tolist(),
+        'close': history['Close'].round(2).tolist(),
+        'volume': history['Volume'].astype('int64').tolist()
+    }
 
 
 # ============================================
@@ -38,7 +38,8 @@ def create_time_series(
     title: str,
     y_axis_title: str = None,
     color: str = None,
-    show_markers: bool = False
+    show_markers: bool = False,
+    use_webgl: bool = False
 ) -> go.Figure:
     """
     Tworzy time-series line chart z cyberpunk theme.
@@ -51,6 +52,7 @@ def create_time_series(
         y_axis_title: Nazwa osi Y (opcjonalne)
         color: Kolor linii (opcjonalne, default: cyan)
         show_markers: Czy pokazać markery (default: False)
+        use_webgl: Rysuj przez Scattergl (WebGL) - dla długich serii (default: False)
 
     Returns:
         go.Figure: Plotly figure
@@ -66,7 +68,8 @@ def create_time_series(
 
     fig = go.Figure()
 
-    fig.add_trace(go.Scatter(
+    trace_cls = go.Scattergl if use_webgl else go.Scatter
+    fig.add_trace(trace_cls(
         x=data[x_column],
         y=data[y_column],
         mode='lines+markers' if show_markers else 'lines',
@@ -86,6 +89,7 @@ def create_time_series(
         yaxis_title=y_axis_title or y_column,
         hovermode='x unified',
         height=400,
+        uirevision=title,  # zoom/pan zostaje między rerunami, dopóki nie zmieni się wykres
     )
 
     return fig
@@ -96,7 +100,8 @@ def create_multi_line_chart(
     x_column: str,
     y_columns: List[str],
     title: str,
-    colors: List[str] = None
+    colors: List[str] = None,
+    use_webgl: bool = False
 ) -> go.Figure:
     """
     Tworzy wykres z wieloma liniami (multi-line chart).
@@ -107,6 +112,7 @@ def create_multi_line_chart(
         y_columns: Lista kolumn do wykreślenia
         title: Tytuł wykresu
         colors: Lista kolorów (opcjonalne)
+        use_webgl: Rysuj przez Scattergl (WebGL) - dla długich serii (default: False)
 
     Returns:
         go.Figure: Plotly figure
@@ -120,10 +126,11 @@ def create_multi_line_chart(
         ]
 
     fig = go.Figure()
+    trace_cls = go.Scattergl if use_webgl else go.Scatter
 
     for i, column in enumerate(y_columns):
         color = colors[i % len(colors)]
-        fig.add_trace(go.Scatter(
+        fig.add_trace(trace_cls(
             x=data[x_column],
             y=data[column],
             mode='lines',
@@ -141,6 +148,7 @@ def create_multi_line_chart(
         xaxis_title='Data',
         hovermode='x unified',
         height=450,
+        uirevision=title,  # zoom/pan zostaje między rerunami, dopóki nie zmieni się wykres
         legend=dict(
             orientation='h',
             yanchor='bottom',
@@ -294,6 +302,59 @@ def create_horizontal_bar(
     return fig
 
 
+# Motyw figury gauge + komponenty bez tytułu (subplot ma własne tytuły) - budowany raz przy imporcie
+_SCORE_BREAKDOWN_THEME = {k: v for k, v in apply_chart_theme().items() if k != 'title'}
+
+
+def create_score_breakdown(
+    score: float,
+    component_scores: Dict[str, float],
+    title: str = "Overall Liquidity Score",
+    bar_title: str = "Score Components"
+) -> go.Figure:
+    """
+    Gauge score + bar komponentów w jednej figurze (jeden payload zamiast dwóch).
+
+    Args:
+        score: Wartość score (-100 to +100)
+        component_scores: {nazwa komponentu: wartość}
+        title: Tytuł gauge
+        bar_title: Tytuł wykresu komponentów
+
+    Returns:
+        go.Figure: Subplot 1x2 (indicator | bar)
+
+    Example:
+        >>> fig = create_score_breakdown(65, {'Liquidity': 26, 'Risk Sentiment': 19.5})
+        >>> st.plotly_chart(fig)
+    """
+    gauge_trace = create_gauge_meter(value=score, title=title).data[0]
+    bar_trace = create_horizontal_bar(
+        labels=list(component_scores.keys()),
+        values=list(component_scores.values()),
+        title=bar_title
+    ).data[0]
+
+    fig = make_subplots(
+        rows=1, cols=2,
+        specs=[[{'type': 'indicator'}, {'type': 'bar'}]],
+        subplot_titles=('', bar_title),
+        horizontal_spacing=0.15
+    )
+    fig.add_trace(gauge_trace, row=1, col=1)
+    fig.add_trace(bar_trace, row=1, col=2)
+
+    fig.update_layout(
+        **_SCORE_BREAKDOWN_THEME,
+        height=300,
+        showlegend=False,
+        margin=dict(l=20, r=40, t=60, b=40)
+    )
+    fig.update_xaxes(title_text='Score', row=1, col=2)
+
+    return fig
+
+
 # ============================================
 # CANDLESTICK CHART (Stock Price)
 # ============================================
@@ -15,6 +15,8 @@ Użycie:
     load_cyberpunk_theme()
 """
 
+import functools
+
 import streamlit as st
 
 
@@ -550,6 +552,26 @@ def apply_chart_theme() -> dict:
     }
 
 
+@functools.lru_cache(maxsize=None)
+def hex_to_rgba(color: str, alpha: float = 0.3) -> str:
+    """
+    Konwertuje kolor hex (#RRGGBB) lub rgb(...) na rgba z przezroczystością.
+
+    Wynik jest cache'owany - kolory motywu parsujemy tylko raz.
+
+    Example:
+        >>> hex_to_rgba('#39ff14', 0.3)
+        'rgba(57,255,20,0.3)'
+    """
+    if not color.startswith('#'):
+        return color.replace(')', f', {alpha})').replace('rgb', 'rgba')
+    hex_color = color.lstrip('#')
+    r = int(hex_color[0:2], 16)
+    g = int(hex_color[2:4], 16)
+    b = int(hex_color[4:6], 16)
+    return f'rgba({r},{g},{b},{alpha})'
+
+
 if __name__ == "__main__":
     print("Cyberpunk theme loaded!")
     print("Use: load_cyberpunk_theme() in your Streamlit pages")
@@ -10,8 +10,13 @@ Analiza makroekonomiczna z wyjaśnieniami każdego terminu!
 
 import streamlit as st
 import sys
+import traceback
+import time
 from pathlib import Path
 import pandas as pd
+import numpy as np
+import plotly.graph_objects as go
+from plotly.subplots import make_subplots
 from datetime import datetime, timedelta
 
 # Add parent directory to path
@@ -19,20 +24,45 @@ BASE_DIR = Path(__file__).resolve().parent.parent
 sys.path.insert(0, str(BASE_DIR))
 
 # Imports
-from components.cyberpunk_theme import load_cyberpunk_theme
+from components.cyberpunk_theme import load_cyberpunk_theme, apply_chart_theme, hex_to_rgba
 from utils.mobile_styles import inject_mobile_css
 from utils.navigation import render_top_navigation
 from collectors.fred_collector import FredCollector
 from collectors.fear_greed_collector import get_fear_greed_index, FearGreedCollector
 from components.charts import (
-    create_gauge_meter,
     create_indicators_table,
-    create_horizontal_bar,
+    create_score_breakdown,
     create_multi_line_chart,
     create_time_series
 )
 from utils.constants import REGIME_COLORS, REGIME_DESCRIPTIONS, CHART_COLORS
 from utils.financial_glossary import get_explanation, get_all_terms
+from utils._fast_stats import quad_stats, column_stats, lttb_indices, linreg_stats
+from utils.regime_history import calculate_regime_history, get_regime_stats, detect_regime_transitions
+from utils.percentile_analysis import percentile_from_sorted, interpret_percentile
+
+
+# Fear & Greed: progi (włącznie) i kolory kubełków
+# <=25 Extreme Fear, <=45 Fear, <=55 Neutral, <=75 Greed, >75 Extreme Greed
+_FG_THRESHOLDS = np.array([25, 45, 55, 75])
+_FG_COLORS = ("#ff073a", "#ff8c42", "#ffed4e", "#39ff14", "#00ff00")
+
+# Wskaźniki na wspólnym wykresie płynności: (klucz w indicators, etykieta, kolumna)
+# Fed balance ma kolumnę 'value_t' w trylionach, przeliczoną raz w load_fred_data
+INDICATOR_SPECS = [
+    ('reserves_alt', 'Reserves ($B)', 'value'),
+    ('tga', 'TGA ($B)', 'value'),
+    ('reverse_repo', 'RRP ($B)', 'value'),
+    ('fed_balance', 'Fed Balance ($T)', 'value_t'),
+]
+
+# Półprzezroczyste kolory pasm regime na timeline (alpha=0.3)
+REGIME_FILLCOLORS = {name: hex_to_rgba(color, 0.3) for name, color in REGIME_COLORS.items()}
+
+# Motywy wykresów regime - budowane raz przy imporcie (bez kluczy nadpisywanych w update_layout)
+_TIMELINE_THEME = {k: v for k, v in apply_chart_theme().items() if k not in ('title', 'yaxis', 'legend')}
+_PIE_THEME = {k: v for k, v in apply_chart_theme().items() if k != 'title'}
+_PERCENTILE_THEME = {k: v for k, v in apply_chart_theme().items() if k not in ('title', 'xaxis')}
 
 
 # ============================================
@@ -81,11 +111,51 @@ with st.sidebar:
 # DATA LOADING
 # ============================================
 
+def _downcast_values(indicators):
+    """
+    Kolumny 'value' wszystkich wskaźników jako float32 (raz, wewnątrz cache).
+
+    Dane FRED mają kilka cyfr znaczących - float32 wystarcza, a merge, percentyle
+    i serializacja wykresów przerzucają o połowę mniej bajtów. Kolumna 'date'
+    dostaje tu datetime64 - dalszy kod nie woła już pd.to_datetime przy rerunie.
+    """
+    for ind in indicators.values():
+        if isinstance(ind, dict) and isinstance(ind.get('data'), pd.DataFrame) and 'value' in ind['data']:
+            df = ind['data'].astype({'value': np.float32})
+            if 'date' in df and not pd.api.types.is_datetime64_any_dtype(df['date']):
+                df['date'] = pd.to_datetime(df['date'])
+            ind['data'] = df
+
+
+def _prescale_units(indicators):
+    """
+    Przelicza jednostki wykresów raz, wewnątrz cache (nie przy każdym rerunie).
+
+    Fed balance jest w miliardach - dodajemy kolumnę 'value_t' w trylionach,
+    oryginalne 'value' zostaje w $B (potrzebne do Net Liquidity).
+    """
+    fed = indicators.get('fed_balance')
+    if isinstance(fed, dict) and 'data' in fed:
+        values = fed['data']['value'].to_numpy(dtype=np.float32, copy=True)
+        np.divide(values, 1000, out=values)
+        fed['data'] = fed['data'].assign(value_t=values)
+        fed['chart_unit'] = '$T'
+
+
+@st.cache_resource(show_spinner=False)
+def get_fred_collector():
+    """Jedna instancja FredCollector na proces (LiquidityMonitor + połączenie z DB)"""
+    return FredCollector()
+
+
 @st.cache_data(ttl=1)  # 1 sekunda - wymuszamy reload
 def load_fred_data(days_back=730):
     try:
-        collector = FredCollector()
+        collector = get_fred_collector()
         data = collector.get_fred_data(days_back=days_back)
+        if data:
+            _downcast_values(data.get('indicators', {}))
+            _prescale_units(data.get('indicators', {}))
         return data, None
     except Exception as e:
         # Clean error message - usun unicode characters dla Windows console
@@ -93,6 +163,12 @@ def load_fred_data(days_back=730):
         return None, error_msg
 
 
+@st.cache_data(ttl=300, show_spinner="Ładowanie wskaźników...")  # 5 minut
+def _get_summary():
+    """Podsumowanie kluczowych wskaźników do tabeli szczegółowej"""
+    return get_fred_collector().get_key_indicators_summary()
+
+
 @st.cache_data(ttl=3600)  # Cache for 1 hour (Fear & Greed updates daily)
 def load_fear_greed():
     """Pobiera CNN Fear & Greed Index"""
@@ -104,6 +180,74 @@ def load_fear_greed():
         return None, error_msg
 
 
+def _df_fingerprint(df: pd.DataFrame) -> bytes:
+    """Szybki hash zawartości DataFrame (wartości + indeks) - klucz dla cache"""
+    return pd.util.hash_pandas_object(df, index=True).values.tobytes()
+
+
+def _indicators_fingerprint(indicators, keys):
+    """
+    Tani odcisk wybranych wskaźników: (klucz, liczba wierszy, ostatnia data, ostatnia wartość).
+
+    Nie hashuje całych DataFrame'ów - wystarcza do wykrycia nowych danych z FRED.
+    """
+    fingerprint = []
+    for key in keys:
+        ind = indicators.get(key)
+        df = ind.get('data') if isinstance(ind, dict) else None
+        if df is None or df.empty:
+            fingerprint.append((key, 0, None, None))
+        else:
+            fingerprint.append((key, len(df), str(df['date'].iloc[-1]), float(df['value'].iloc[-1])))
+    return tuple(fingerprint)
+
+
+def _align_daily(series):
+    """
+    Serie (indeks = date) na wspólnej dziennej osi dat z forward-fill.
+
+    Wskaźniki FRED mają różną częstotliwość (rezerwy tygodniowo, TGA dziennie) -
+    po wyrównaniu każdy dzień ma ostatnią znaną wartość każdej serii zamiast NaN.
+    Przed pierwszą obserwacją serii zostaje NaN.
+    """
+    panel = pd.concat(series, axis=1).sort_index().ffill()
+    grid = pd.date_range(panel.index[0].normalize(), panel.index[-1].normalize(), freq='D')
+    return panel.reindex(grid, method='ffill').rename_axis('date')
+
+
+@st.cache_data(ttl=3600, show_spinner=False, hash_funcs={pd.DataFrame: _df_fingerprint})
+def cached_multi_line(df, x_col, y_cols, title):
+    """Cache gotowej figury multi-line - przebudowa tylko gdy zmienią się dane"""
+    return create_multi_line_chart(
+        data=df, x_column=x_col, y_columns=list(y_cols), title=title,
+        use_webgl=len(df) > SCATTERGL_MIN_POINTS
+    )
+
+
+@st.cache_data(ttl=3600, show_spinner=False, hash_funcs={pd.DataFrame: _df_fingerprint})
+def cached_time_series(df, x_col, y_col, title, y_axis_title=None, color=None):
+    """Cache gotowej figury time-series - przebudowa tylko gdy zmienią się dane"""
+    return create_time_series(
+        data=df,
+        x_column=x_col,
+        y_column=y_col,
+        title=title,
+        y_axis_title=y_axis_title,
+        color=color,
+        use_webgl=len(df) > SCATTERGL_MIN_POINTS
+    )
+
+
+# Dłuższe wyjaśnienia (markdown) trzymane w plikach, wczytywane przy pierwszym użyciu
+EXPLANATIONS_DIR = BASE_DIR / 'docs' / 'explanations'
+
+
+@st.cache_data(show_spinner=False)
+def _load_md(name):
+    """Treść pliku markdown z docs/explanations (cache - czytamy z dysku raz)"""
+    return (EXPLANATIONS_DIR / name).read_text(encoding='utf-8')
+
+
 with st.spinner(f"Ładowanie danych FRED ({days_range} dni)..."):
     fred_data, error = load_fred_data(days_back=days_range)
 
@@ -146,6 +290,20 @@ score = fred_data.get('score', 0)
 alerts = fred_data.get('alerts', [])
 indicators = fred_data.get('indicators', {})  # DODANE - potrzebne dla Regime History i innych sekcji
 
+# Indeks {klucz: DataFrame} dla wskaźników z historią - jedno sprawdzenie 'in' zamiast dwóch
+indicator_frames = {
+    key: ind['data'] for key, ind in indicators.items()
+    if isinstance(ind, dict) and 'data' in ind
+}
+
+# Wspólny pusty zamiennik dla brakujących wskaźników (tylko do odczytu)
+EMPTY_FRAME = pd.DataFrame(columns=['date', 'value'])
+
+# Kolumna 'value' jako tablica float32 (już float32 po load_fred_data → bez kopii)
+indicator_arrays = {
+    key: df['value'].to_numpy(dtype=np.float32, copy=False) for key, df in indicator_frames.items()
+}
+
 regime_color = REGIME_COLORS.get(regime, '#606060')
 regime_desc = REGIME_DESCRIPTIONS.get(regime, 'Brak danych')
 
@@ -157,35 +315,92 @@ regime_emoji_map = {
     'UNKNOWN': '⚪'
 }
 
-# Helper function do pobierania wartości wskaźników
-def get_indicator_val(name):
-    ind = indicators.get(name, {})
-    if isinstance(ind, dict):
-        return ind.get('current', 0), ind.get('change_pct', 0)
-    return ind, 0
-regime_emoji = regime_emoji_map.get(regime, '⚪')
 
-st.markdown(f"""
+@st.cache_data(show_spinner=False)
+def _regime_card_html(regime: str, score: float, color: str, desc: str, emoji: str) -> str:
+    """HTML karty regime - formatowany tylko gdy zmieni się regime/score"""
+    return f"""
 <div style="
     background: linear-gradient(135deg, rgba(26, 26, 46, 0.9), rgba(10, 14, 39, 0.9));
-    border: 3px solid {regime_color};
+    border: 3px solid {color};
     border-radius: 12px;
     padding: 2rem;
     text-align: center;
-    box-shadow: 0 0 30px {regime_color}80;
+    box-shadow: 0 0 30px {color}80;
     margin-bottom: 2rem;
 ">
-    <h2 style="color: {regime_color}; font-family: 'Orbitron', sans-serif; font-size: 2.5rem; margin: 0;">
-        {regime_emoji} {regime}
+    <h2 style="color: {color}; font-family: 'Orbitron', sans-serif; font-size: 2.5rem; margin: 0;">
+        {emoji} {regime}
     </h2>
     <p style="color: #e0e0e0; font-size: 1.2rem; margin: 0.5rem 0 0 0;">
-        {regime_desc}
+        {desc}
     </p>
-    <p style="color: {regime_color}; font-family: 'Share Tech Mono', monospace; font-size: 1.5rem; margin: 1rem 0 0 0;">
+    <p style="color: {color}; font-family: 'Share Tech Mono', monospace; font-size: 1.5rem; margin: 1rem 0 0 0;">
         Liquidity Score: {score:+.1f} / 100
     </p>
 </div>
-""", unsafe_allow_html=True)
+"""
+
+
+@st.cache_data(show_spinner=False)
+def _fear_greed_card_html(score: float, color: str, emoji: str, label: str) -> str:
+    """HTML karty Fear & Greed - formatowany tylko gdy zmieni się score"""
+    return f"""
+<div style="
+    background: linear-gradient(135deg, rgba(26, 26, 46, 0.9), rgba(10, 14, 39, 0.9));
+    border: 3px solid {color};
+    border-radius: 12px;
+    padding: 2rem;
+    text-align: center;
+    box-shadow: 0 0 30px {color}80;
+">
+    <h1 style="color: {color}; font-family: 'Orbitron', sans-serif; font-size: 4rem; margin: 0;">
+        {emoji}
+    </h1>
+    <p style="color: {color}; font-family: 'Share Tech Mono', monospace; font-size: 2.5rem; margin: 0.5rem 0;">
+        {score:.1f}
+    </p>
+    <p style="color: #e0e0e0; font-size: 1.2rem; margin: 0.5rem 0 0 0;">
+        {label}
+    </p>
+</div>
+"""
+
+
+# Helper function do pobierania wartości wskaźników
+def get_indicator_val(name):
+    ind = indicators.get(name, {})
+    if isinstance(ind, dict):
+        return ind.get('current', 0), ind.get('change_pct', 0)
+    return ind, 0
+
+
+# Wartości dla Kluczowych Wskaźników, zakładek Inflacja / Stopy / Wzrost i sekcji płynności:
+# {nazwa: (current, change_pct)} - get_indicator_val raz na wskaźnik, dalej tylko odczyt ze słownika
+indicator_vals = {
+    name: get_indicator_val(name)
+    for name in (
+        'vix', 'sofr', 'yield_curve', 'm2',
+        'cpi', 'pce', 'cpi_core', 'inflation_5y',
+        'fed_funds', 'treasury_10y', 'treasury_2y', 'gdp_real',
+        'reserves_alt', 'tga', 'reverse_repo', 'fed_balance'
+    )
+}
+
+# Wartości pochodne - liczone raz tutaj, a nie przy renderowaniu kart
+_t10_val, _t2_val = indicator_vals['treasury_10y'][0], indicator_vals['treasury_2y'][0]
+indicator_vals['yc_10y_2y'] = (_t10_val - _t2_val) if _t10_val and _t2_val else None
+
+_m2_val = indicator_vals['m2'][0]
+if _m2_val:
+    # M2 w bilionach powyżej 1000 mld, inaczej w miliardach
+    indicator_vals['m2_display'] = f"{_m2_val/1000:.1f}T" if _m2_val > 1000 else f"{_m2_val:.0f}B"
+else:
+    indicator_vals['m2_display'] = "N/A"
+
+regime_emoji = regime_emoji_map.get(regime, '⚪')
+
+st.markdown(_regime_card_html(regime, score, regime_color, regime_desc, regime_emoji), unsafe_allow_html=True)
 
 # Wyjaśnienie regime
 with st.expander("❓ Co to jest Market Regime?"):
@@ -224,56 +439,22 @@ st.markdown("---")
 st.markdown("### 😱 CNN Fear & Greed Index")
 st.caption("💡 Wskaźnik sentymentu inwestorów na rynku akcji (0-100)")
 
-# Load Fear & Greed data
-fg_data, fg_error = load_fear_greed()
 
-if fg_error:
-    st.warning(f"⚠️ Nie udało się pobrać Fear & Greed Index: {fg_error}")
-    st.info("💡 Sprawdzę ponownie za godzinę (cache TTL: 1h)")
-elif fg_data and fg_data.get('score') is not None:
-    collector = FearGreedCollector()
+def render_fear_greed_panel(fg_data):
+    """Karta + metryki Fear & Greed (rysowane przy każdym przebiegu strony)"""
     score = fg_data['score']
-    rating = fg_data['rating']
-
-    # Get interpretation
-    emoji, label, description = collector.interpret_score(score)
-
-    # Color coding based on score
-    if score <= 25:
-        color = "#ff073a"  # Red - Extreme Fear
-    elif score <= 45:
-        color = "#ff8c42"  # Orange - Fear
-    elif score <= 55:
-        color = "#ffed4e"  # Yellow - Neutral
-    elif score <= 75:
-        color = "#39ff14"  # Green - Greed
-    else:
-        color = "#00ff00"  # Bright Green - Extreme Greed
+
+    # Get interpretation (staticmethod - bez tworzenia collectora)
+    emoji, label, description = FearGreedCollector.interpret_score(score)
+
+    # Color coding based on score (side='left' => progi włącznie, jak score <= 25)
+    color = _FG_COLORS[np.searchsorted(_FG_THRESHOLDS, score, side='left')]
 
     # Display in a styled box
     col_fg1, col_fg2 = st.columns([1, 2])
 
     with col_fg1:
-        st.markdown(f"""
-        <div style="
-            background: linear-gradient(135deg, rgba(26, 26, 46, 0.9), rgba(10, 14, 39, 0.9));
-            border: 3px solid {color};
-            border-radius: 12px;
-            padding: 2rem;
-            text-align: center;
-            box-shadow: 0 0 30px {color}80;
-        ">
-            <h1 style="color: {color}; font-family: 'Orbitron', sans-serif; font-size: 4rem; margin: 0;">
-                {emoji}
-            </h1>
-            <p style="color: {color}; font-family: 'Share Tech Mono', monospace; font-size: 2.5rem; margin: 0.5rem 0;">
-                {score:.1f}
-            </p>
-            <p style="color: #e0e0e0; font-size: 1.2rem; margin: 0.5rem 0 0 0;">
-                {label}
-            </p>
-        </div>
-        """, unsafe_allow_html=True)
+        st.markdown(_fear_greed_card_html(score, color, emoji, label), unsafe_allow_html=True)
 
     with col_fg2:
         st.markdown(f"**Interpretacja:**")
@@ -283,7 +464,6 @@ elif fg_data and fg_data.get('score') is not None:
         if fg_data.get('previous_score'):
             prev_score = fg_data['previous_score']
             delta = score - prev_score
-            delta_emoji = "📈" if delta > 0 else "📉" if delta < 0 else "➡️"
             st.metric(
                 "Zmiana (od poprzedniego)",
                 f"{score:.1f}",
@@ -301,6 +481,16 @@ elif fg_data and fg_data.get('score') is not None:
                 help="Zmiana względem tygodnia temu"
             )
 
+
+# Load Fear & Greed data
+fg_data, fg_error = load_fear_greed()
+
+if fg_error:
+    st.warning(f"⚠️ Nie udało się pobrać Fear & Greed Index: {fg_error}")
+    st.info("💡 Sprawdzę ponownie za godzinę (cache TTL: 1h)")
+elif fg_data and fg_data.get('score') is not None:
+    render_fear_greed_panel(fg_data)
+
     # Educational expander
     with st.expander("❓ Co to Fear & Greed Index?"):
         st.markdown("""
@@ -340,279 +530,256 @@ st.markdown("---")
 # REGIME HISTORY TIMELINE
 # ============================================
 
-st.markdown("### 📅 Regime History - Timeline")
-st.caption("💡 Jak zmieniał się market regime w czasie")
-
-try:
-    from utils.regime_history import calculate_regime_history, get_regime_stats, detect_regime_transitions
-    import plotly.graph_objects as go
-
-    # Oblicz historię regime
-    regime_history = calculate_regime_history(indicators)
-
-    if not regime_history.empty and len(regime_history) > 1:
-        # Statystyki
-        stats = get_regime_stats(regime_history)
-
-        # Metryki w kolumnach
-        rhcol1, rhcol2, rhcol3, rhcol4 = st.columns(4)
-
-        with rhcol1:
-            total_days = stats['total_days']
-            st.metric("📊 Dni w historii", f"{total_days}")
-
-        with rhcol2:
-            current = stats['current_regime']
-            current_emoji = regime_emoji_map.get(current, '⚪')
-            st.metric("🎯 Obecny Regime", f"{current_emoji} {current}")
-
-        with rhcol3:
-            if stats['last_regime_change']:
-                days_ago = (datetime.now() - pd.to_datetime(stats['last_regime_change'])).days
-                st.metric("🔄 Ostatnia zmiana", f"{days_ago} dni temu")
-            else:
-                st.metric("🔄 Ostatnia zmiana", "Brak zmian")
-
-        with rhcol4:
-            longest = stats['longest_streak']
-            streak_emoji = regime_emoji_map.get(longest['regime'], '⚪')
-            st.metric("🏆 Najdłuższy ciąg", f"{longest['days']} dni ({streak_emoji} {longest['regime']})")
-
-        # Wykres Timeline
-        st.markdown("#### 📈 Regime Timeline")
-
-        # Przygotuj dane do wykresu
-        regime_history['date_dt'] = pd.to_datetime(regime_history['date'])
-        regime_history['regime_numeric'] = regime_history['regime'].map({
-            'CRISIS': 3,
-            'RISK_OFF': 2,
-            'RISK_ON': 1,
-            'UNKNOWN': 0
-        })
-
-        # Stwórz wykres scatter z kolorami
-        fig_timeline = go.Figure()
-
-        # Helper function do konwersji hex na rgba
-        def hex_to_rgba(hex_color, alpha=0.3):
-            """Konwertuje hex (#RRGGBB) na rgba(r,g,b,a)"""
-            hex_color = hex_color.lstrip('#')
-            r = int(hex_color[0:2], 16)
-            g = int(hex_color[2:4], 16)
-            b = int(hex_color[4:6], 16)
-            return f'rgba({r},{g},{b},{alpha})'
-
-        # Dodaj obszary kolorowe dla każdego regime (jako filled area)
-        for regime_name, regime_num in [('RISK_ON', 1), ('RISK_OFF', 2), ('CRISIS', 3)]:
-            regime_data = regime_history[regime_history['regime'] == regime_name]
-
-            if not regime_data.empty:
-                color = REGIME_COLORS.get(regime_name, '#606060')
-                # Konwertuj na rgba z alpha=0.3 dla przezroczystości
-                fillcolor = hex_to_rgba(color, alpha=0.3) if color.startswith('#') else color.replace(')', ', 0.3)').replace('rgb', 'rgba')
-
-                fig_timeline.add_trace(go.Scatter(
-                    x=regime_data['date_dt'],
-                    y=regime_data['regime_numeric'],
-                    mode='lines',
-                    name=regime_name,
-                    line=dict(color=color, width=0),
-                    fill='tonexty' if regime_name != 'RISK_ON' else 'tozeroy',
-                    fillcolor=fillcolor,
-                    hovertemplate=f'<b>{regime_name}</b><br>Data: %{{x|%Y-%m-%d}}<extra></extra>'
-                ))
-
-        # Dodaj linię pokazującą faktyczny regime
-        fig_timeline.add_trace(go.Scatter(
-            x=regime_history['date_dt'],
-            y=regime_history['regime_numeric'],
-            mode='lines',
-            name='Regime Level',
-            line=dict(color='#ffffff', width=2),
-            hovertemplate='<b>%{text}</b><br>Data: %{x|%Y-%m-%d}<br>Confidence: %{customdata:.0f}%<extra></extra>',
-            text=regime_history['regime'],
-            customdata=regime_history['confidence']
-        ))
-
-        # Layout
-        from components.cyberpunk_theme import apply_chart_theme
-        theme_config = apply_chart_theme()
-        theme_config.pop('title', None)
-        theme_config.pop('yaxis', None)
-        theme_config.pop('legend', None)
-
-        fig_timeline.update_layout(
-            **theme_config,
-            title=f"Market Regime Timeline - Ostatnie {days_range} dni",
-            xaxis_title="Data",
-            yaxis=dict(
-                title="Market Regime",
-                tickmode='array',
-                tickvals=[1, 2, 3],
-                ticktext=['RISK_ON', 'RISK_OFF', 'CRISIS'],
-                gridcolor='rgba(0, 245, 255, 0.1)',
-                range=[0.5, 3.5]
-            ),
-            height=400,
-            hovermode='x unified',
-            legend=dict(
-                orientation='h',
-                yanchor='bottom',
-                y=1.02,
-                xanchor='right',
-                x=1
-            )
-        )
-
-        st.plotly_chart(fig_timeline, use_container_width=True)
-
-        # Statystyki rozkładu
-        st.markdown("#### 📊 Rozkład Regime")
+# Wskaźniki, z których liczony jest regime history
+REGIME_HISTORY_KEYS = ('vix', 'sofr_iorb_spread', 'reserves_alt', 'nfci')
 
-        statcol1, statcol2 = st.columns(2)
+# Powyżej tylu punktów linia regime rysowana jest przez WebGL (Scattergl)
+SCATTERGL_MIN_POINTS = 1000
 
-        with statcol1:
-            # Pie chart - procent czasu w każdym regime
-            regime_pcts = stats['regime_percentages']
+# Dla zakresów > 1 rok linia regime jest przerzedzana do ~tylu punktów
+TIMELINE_MAX_POINTS = 500
 
-            fig_pie = go.Figure(data=[go.Pie(
-                labels=list(regime_pcts.keys()),
-                values=list(regime_pcts.values()),
-                marker=dict(
-                    colors=[REGIME_COLORS.get(r, '#606060') for r in regime_pcts.keys()]
-                ),
-                textinfo='label+percent',
-                textfont=dict(size=14, family='Share Tech Mono'),
-                hovertemplate='<b>%{label}</b><br>%{value:.1f}%<extra></extra>'
-            )])
-
-            theme_pie = apply_chart_theme()
-            theme_pie.pop('title', None)
-
-            fig_pie.update_layout(
-                **theme_pie,
-                title="Procent czasu w każdym regime",
-                height=300,
-                showlegend=True
-            )
-
-            st.plotly_chart(fig_pie, use_container_width=True)
 
-        with statcol2:
-            # Tabela z liczbami
-            st.markdown("**Statystyki szczegółowe:**")
+@st.cache_data(ttl=600, show_spinner=False)
+def _regime_bundle(fingerprint, _indicators):
+    """
+    Historia regime + statystyki + zmiany w jednym cache.
 
-            for regime_name in ['RISK_ON', 'RISK_OFF', 'CRISIS', 'UNKNOWN']:
-                if regime_name in stats['regime_counts']:
-                    count = stats['regime_counts'][regime_name]
-                    pct = stats['regime_percentages'][regime_name]
-                    emoji = regime_emoji_map.get(regime_name, '⚪')
-                    color_regime = REGIME_COLORS.get(regime_name, '#606060')
+    Klucz cache to tylko fingerprint - '_indicators' (z podkreślnikiem) nie jest hashowane.
+    """
+    history = calculate_regime_history(_indicators)
+    if history.empty or len(history) < 2:
+        return history, None, None
+    return history, get_regime_stats(history), detect_regime_transitions(history)
 
-                    st.markdown(f"""
-                    <div style="padding: 0.5rem; margin: 0.5rem 0; border-left: 4px solid {color_regime};">
-                        <span style="font-size: 1.2rem;">{emoji} <b>{regime_name}</b></span><br>
-                        <span style="color: #e0e0e0;">{count} dni ({pct:.1f}%)</span>
-                    </div>
-                    """, unsafe_allow_html=True)
 
-        # Wykryj transition points
-        transitions = detect_regime_transitions(regime_history)
+@st.cache_data(ttl=600, show_spinner=False, hash_funcs={pd.DataFrame: _df_fingerprint})
+def build_timeline_fig(regime_history, days_range):
+    """Figura timeline regime - budowana raz na zestaw danych, potem z cache"""
+    # Przygotuj dane do wykresu (regime_numeric liczy już calculate_regime_history)
+    # Daty już jako datetime64 (z load_fred_data) - bez kopiowania całej ramki
+    date_dt = regime_history['date']
 
-        if not transitions.empty:
-            with st.expander(f"🔄 Historia Zmian Regime ({len(transitions)} zmian)"):
-                st.markdown("**Ostatnie zmiany market regime:**")
+    # Stwórz wykres scatter z kolorami
+    fig_timeline = go.Figure()
 
-                # Pokaż ostatnie 10 zmian
-                recent_transitions = transitions.tail(10).sort_values('date', ascending=False)
+    # Pasma regime jako prostokąty: jeden kształt na ciągły okres (O(liczba zmian), nie O(dni))
+    codes = regime_history['regime_numeric'].to_numpy()
+    run_starts = np.flatnonzero(np.r_[True, codes[1:] != codes[:-1]])
+    run_bounds = date_dt.iloc[np.r_[run_starts, len(codes) - 1]].tolist()
+    run_regimes = regime_history['regime'].to_numpy()[run_starts]
 
-                for _, trans in recent_transitions.iterrows():
-                    date_str = pd.to_datetime(trans['date']).strftime('%Y-%m-%d')
-                    from_regime = trans['from_regime']
-                    to_regime = trans['to_regime']
-                    from_emoji = regime_emoji_map.get(from_regime, '⚪')
-                    to_emoji = regime_emoji_map.get(to_regime, '⚪')
+    fig_timeline.update_layout(shapes=[
+        dict(
+            type='rect', xref='x', yref='paper',
+            x0=run_bounds[k], x1=run_bounds[k + 1], y0=0, y1=1,
+            fillcolor=REGIME_FILLCOLORS[regime_name], line_width=0, layer='below'
+        )
+        for k, regime_name in enumerate(run_regimes)
+        if regime_name != 'UNKNOWN'
+    ])
+
+    # Długa historia: linia przerzedzona (co n-ty dzień + ostatni), pasma liczone z pełnych danych
+    n_points = len(regime_history)
+    plot_idx = np.arange(n_points)
+    if days_range > 365 and n_points > TIMELINE_MAX_POINTS:
+        step = -(-n_points // TIMELINE_MAX_POINTS)
+        plot_idx = np.unique(np.r_[np.arange(0, n_points, step), n_points - 1])
+
+    # Dodaj linię pokazującą faktyczny regime (WebGL dla długiej historii)
+    line_trace = go.Scattergl if plot_idx.size > SCATTERGL_MIN_POINTS else go.Scatter
+    fig_timeline.add_trace(line_trace(
+        x=date_dt.to_numpy()[plot_idx],
+        y=codes[plot_idx],
+        mode='lines',
+        name='Regime Level',
+        line=dict(color='#ffffff', width=2),
+        hovertemplate='<b>%{text}</b><br>Data: %{x|%Y-%m-%d}<br>Confidence: %{customdata:.0f}%<extra></extra>',
+        text=regime_history['regime'].to_numpy()[plot_idx],
+        customdata=regime_history['confidence'].to_numpy()[plot_idx]
+    ))
+
+    # Layout
+    fig_timeline.update_layout(
+        **_TIMELINE_THEME,
+        title=f"Market Regime Timeline - Ostatnie {days_range} dni",
+        xaxis_title="Data",
+        yaxis=dict(
+            title="Market Regime",
+            tickmode='array',
+            tickvals=[1, 2, 3],
+            ticktext=['RISK_ON', 'RISK_OFF', 'CRISIS'],
+            gridcolor='rgba(0, 245, 255, 0.1)',
+            range=[0.5, 3.5]
+        ),
+        height=400,
+        hovermode='x unified',
+        legend=dict(
+            orientation='h',
+            yanchor='bottom',
+            y=1.02,
+            xanchor='right',
+            x=1
+        )
+    )
 
-                    st.markdown(f"- **{date_str}:** {from_emoji} {from_regime} → {to_emoji} {to_regime}")
+    return fig_timeline
+
+
+@st.cache_data(ttl=600, show_spinner=False)
+def build_regime_pie(regime_pcts):
+    """Pie chart rozkładu regime - z cache"""
+    fig_pie = go.Figure(data=[go.Pie(
+        labels=list(regime_pcts.keys()),
+        values=list(regime_pcts.values()),
+        marker=dict(
+            colors=[REGIME_COLORS.get(r, '#606060') for r in regime_pcts.keys()]
+        ),
+        textinfo='label+percent',
+        textfont=dict(size=14, family='Share Tech Mono'),
+        hovertemplate='<b>%{label}</b><br>%{value:.1f}%<extra></extra>'
+    )])
+
+    fig_pie.update_layout(
+        **_PIE_THEME,
+        title="Procent czasu w każdym regime",
+        height=300,
+        showlegend=True
+    )
 
-        # Edukacyjne wyjaśnienie
-        with st.expander("🎓 Jak czytać Regime History?"):
-            st.markdown("""
-            ## 📅 Regime History Timeline - Przewodnik
+    return fig_pie
+
+
+def _regime_view(indicators, days_range):
+    """
+    Dane + figury sekcji Regime History, trzymane w session_state.
+
+    Dopóki fingerprint wskaźników i zakres dni się nie zmienią, rerun (np. otwarcie
+    expandera) bierze gotowy widok bez sięgania do cache i hashowania argumentów.
+    """
+    fingerprint = (_indicators_fingerprint(indicators, REGIME_HISTORY_KEYS), days_range)
+    view = st.session_state.get('_regime_view')
+    if view is not None and view['fp'] == fingerprint:
+        return view
+
+    regime_history, stats, transitions = _regime_bundle(fingerprint[0], indicators)
+    view = {
+        'fp': fingerprint,
+        'history': regime_history,
+        'stats': stats,
+        'transitions': transitions,
+        'fig_timeline': None,
+        'fig_pie': None,
+    }
+    if stats is not None:
+        view['fig_timeline'] = build_timeline_fig(regime_history, days_range)
+        view['fig_pie'] = build_regime_pie(stats['regime_percentages'])
 
-            ### 🎯 Co pokazuje ten wykres?
+    st.session_state['_regime_view'] = view
+    return view
 
-            **Timeline pokazuje jak zmieniał się market regime w czasie.**
 
-            - **Oś Y:** Poziom regime (RISK_ON → RISK_OFF → CRISIS)
-            - **Oś X:** Czas (data)
-            - **Kolory:** Taki sam jak główny regime box (zielony/żółty/czerwony)
+def render_regime_history(indicators, days_range):
+    """Sekcja Regime History: metryki, timeline, rozkład i historia zmian"""
+    st.markdown("### 📅 Regime History - Timeline")
+    st.caption("💡 Jak zmieniał się market regime w czasie")
 
-            ### 📊 Jak interpretować?
+    try:
+        # Historia regime + figury (session_state / cache, dopóki dane FRED się nie zmienią)
+        view = _regime_view(indicators, days_range)
+        regime_history, stats, transitions = view['history'], view['stats'], view['transitions']
+
+        if not regime_history.empty and len(regime_history) > 1:
+            # Metryki w kolumnach
+            rhcol1, rhcol2, rhcol3, rhcol4 = st.columns(4)
+
+            with rhcol1:
+                total_days = stats['total_days']
+                st.metric("📊 Dni w historii", f"{total_days}")
+
+            with rhcol2:
+                current = stats['current_regime']
+                current_emoji = regime_emoji_map.get(current, '⚪')
+                st.metric("🎯 Obecny Regime", f"{current_emoji} {current}")
+
+            with rhcol3:
+                if stats['last_regime_change']:
+                    days_ago = (datetime.now() - stats['last_regime_change']).days
+                    st.metric("🔄 Ostatnia zmiana", f"{days_ago} dni temu")
+                else:
+                    st.metric("🔄 Ostatnia zmiana", "Brak zmian")
 
-            **Długie okresy w jednym regime:**
-            - 🟢 **RISK_ON przez 3+ miesiące** → Spokojny bull market
-            - 🟡 **RISK_OFF przez 2+ miesiące** → Przedłużająca się korekta
-            - 🔴 **CRISIS przez tydzień+** → Poważny kryzys (rzadkie!)
+            with rhcol4:
+                longest = stats['longest_streak']
+                streak_emoji = regime_emoji_map.get(longest['regime'], '⚪')
+                st.metric("🏆 Najdłuższy ciąg", f"{longest['days']} dni ({streak_emoji} {longest['regime']})")
 
-            **Częste zmiany (volatile):**
-            - Zmiany co kilka dni → Niezdecydowany rynek, brak trendu
-            - Może być trudny okres dla tradingu
+            # Wykres Timeline
+            st.markdown("#### 📈 Regime Timeline")
 
-            **Wzorce do śledzenia:**
+            st.plotly_chart(view['fig_timeline'], use_container_width=True)
 
-            **🚀 Bullish Pattern:**
-            - CRISIS → RISK_OFF → RISK_ON (powrót do normalności)
-            - Długi okres RISK_ON (trwały wzrost)
+            # Statystyki rozkładu
+            st.markdown("#### 📊 Rozkład Regime")
 
-            **🐻 Bearish Pattern:**
-            - RISK_ON → RISK_OFF → CRISIS (pogarszanie się warunków)
-            - Krótkie powroty do RISK_ON (dead cat bounce)
+            statcol1, statcol2 = st.columns(2)
 
-            ### 💡 Praktyczne użycie:
+            with statcol1:
+                # Pie chart - procent czasu w każdym regime
+                st.plotly_chart(view['fig_pie'], use_container_width=True)
 
-            **1. Kontekst historyczny:**
-            - Jeśli teraz RISK_OFF, ale przez ostatnie 6 miesięcy było RISK_ON
-            → Może to być tylko korekta, nie bear market
+            with statcol2:
+                # Tabela z liczbami
+                st.markdown("**Statystyki szczegółowe:**")
 
-            **2. Długość ciągów:**
-            - RISK_ON przez 200+ dni → Statistycznie może być blisko korekty
-            - CRISIS przez 30+ dni → Zwykle dobre miejsce na kupowanie (contrarian)
+                # Wszystkie wiersze w jednym bloku HTML - jeden st.markdown
+                html_parts = []
+                for regime_name in ['RISK_ON', 'RISK_OFF', 'CRISIS', 'UNKNOWN']:
+                    if regime_name in stats['regime_counts']:
+                        count = stats['regime_counts'][regime_name]
+                        pct = stats['regime_percentages'][regime_name]
+                        emoji = regime_emoji_map.get(regime_name, '⚪')
+                        color_regime = REGIME_COLORS.get(regime_name, '#606060')
 
-            **3. Transition points:**
-            - Zmiana RISK_OFF → RISK_ON = Zielone światło (wejście)
-            - Zmiana RISK_ON → RISK_OFF = Żółte światło (ostrożność)
-            - Zmiana RISK_OFF → CRISIS = Czerwone światło (wyjście!)
+                        html_parts.append(
+                            f'<div style="padding: 0.5rem; margin: 0.5rem 0; border-left: 4px solid {color_regime};">'
+                            f'<span style="font-size: 1.2rem;">{emoji} <b>{regime_name}</b></span><br>'
+                            f'<span style="color: #e0e0e0;">{count} dni ({pct:.1f}%)</span>'
+                            f'</div>'
+                        )
 
-            ### 📚 Przykłady historyczne:
+                st.markdown("".join(html_parts), unsafe_allow_html=True)
 
-            **COVID (2020):**
-            - Luty: RISK_ON (all time highs)
-            - Marzec: CRISIS (VIX 80, panika)
-            - Kwiecień-Grudzień: Powrót do RISK_ON (FED money printer)
+            if not transitions.empty:
+                with st.expander(f"🔄 Historia Zmian Regime ({len(transitions)} zmian)"):
+                    # Pokaż ostatnie 10 zmian - jedna lista, jeden st.markdown
+                    recent_transitions = transitions.tail(10).sort_values('date', ascending=False)
+                    from_regime = recent_transitions['from_regime']
+                    to_regime = recent_transitions['to_regime']
 
-            **2022 Bear Market:**
-            - Styczeń-Marzec: RISK_ON → RISK_OFF (FED zaczyna podnosić stopy)
-            - Kwiecień-Październik: Długi RISK_OFF (QT, inflacja)
-            - Listopad+: Stopniowy powrót do RISK_ON
+                    # Wiersze składane kolumnowo (bez pętli po wierszach)
+                    lines = (
+                        "- **" + recent_transitions['date'].dt.strftime('%Y-%m-%d') + ":** "
+                        + from_regime.map(regime_emoji_map).fillna('⚪') + " " + from_regime + " → "
+                        + to_regime.map(regime_emoji_map).fillna('⚪') + " " + to_regime
+                    )
+                    st.markdown("**Ostatnie zmiany market regime:**\n\n" + "\n".join(lines))
 
-            ### 🧠 Pro Tip:
+            # Edukacyjne wyjaśnienie
+            with st.expander("🎓 Jak czytać Regime History?"):
+                st.markdown(_load_md('regime_history.md'))
 
-            **Śledź procentowy rozkład:**
-            - Portfolio: 70% RISK_ON, 25% RISK_OFF, 5% CRISIS
-            → Historycznie sprzyjający okres (można być bardziej agresywnym)
+        else:
+            st.info("Brak wystarczających danych historycznych do obliczenia Regime History. Potrzebne minimum 30 dni danych.")
 
-            - Portfolio: 30% RISK_ON, 50% RISK_OFF, 20% CRISIS
-            → Trudny okres (ostrożność, cash is king)
-            """)
+    except Exception as e:
+        st.error(f"Błąd obliczania Regime History: {e}")
+        # Pełny traceback tylko w trybie debug (st.session_state['debug'] = True)
+        if st.session_state.get('debug'):
+            st.code(traceback.format_exc())
 
-    else:
-        st.info("Brak wystarczających danych historycznych do obliczenia Regime History. Potrzebne minimum 30 dni danych.")
 
-except Exception as e:
-    st.error(f"Błąd obliczania Regime History: {e}")
-    import traceback
-    st.code(traceback.format_exc())
+render_regime_history(indicators, days_range)
 
 st.markdown("---")
 
@@ -643,68 +810,120 @@ if alerts:
 
 
 # ============================================
-# KEY METRICS (z wyjaśnieniami!)
+# METRIC CARDS - konfiguracja (Kluczowe Wskaźniki + zakładki)
 # ============================================
 
-st.markdown("### 📈 Kluczowe Wskaźniki")
-st.caption("💡 Kliknij na każdy wskaźnik poniżej aby dowiedzieć się więcej!")
+def _render_yield_spread():
+    """Spread 10Y-2Y nad wyjaśnieniem inwersji krzywej"""
+    yc = indicator_vals['yc_10y_2y']
+    if yc:
+        st.metric("10Y-2Y Spread", f"{yc:.2f}%",
+                  delta="INVERTED!" if yc < 0 else "Normal")
 
-# 4 kolumny z wskaźnikami
-col1, col2, col3, col4 = st.columns(4)
 
-with col1:
-    vix_val, vix_delta = get_indicator_val('vix')
-    st.metric(
-        "VIX (Strach)",
-        f"{vix_val:.2f}" if vix_val else "N/A",
-        f"{vix_delta:+.2f}%",
-        delta_color="inverse",
-        help="Zmiana vs 30 dni temu"
-    )
+# Wyjaśnienia ze słownika - krotki (full_name, short, long, emoji) budowane raz przy imporcie
+_EXPLANATIONS = {
+    term: get_explanation(term)
+    for term in ('RESERVES', 'TGA', 'RRP', 'FED_BALANCE', 'VIX', 'SOFR', 'IORB',
+                 'YIELD_CURVE', 'M2', 'NFCI', 'DXY', 'HY_SPREAD')
+}
 
-    with st.expander("❓ Co to VIX?"):
-        _, short, long, emoji = get_explanation('VIX')
-        st.markdown(long)
+# Karty metryk: 'value' = które pole pokazać jako wartość ('current' lub 'delta'),
+# 'fmt' = format wartości, 'display' = gotowy string z indicator_vals zamiast 'fmt',
+# 'delta_fmt' = format delty (None = bez delty),
+# wyjaśnienie: 'explain_key' (słownik) albo 'explain_md' (plik w docs/explanations)
+METRICS_CONFIG = [
+    {'key': 'vix', 'label': "VIX (Strach)", 'fmt': "{:.2f}", 'delta_fmt': "{:+.2f}%",
+     'delta_color': "inverse", 'help': "Zmiana vs 30 dni temu",
+     'expander': "❓ Co to VIX?", 'explain_key': 'VIX'},
+    {'key': 'sofr', 'label': "SOFR", 'fmt': "{:.2f}%", 'delta_fmt': "{:+.2f}%",
+     'help': "Zmiana vs 30 dni temu",
+     'expander': "❓ Co to SOFR?", 'explain_key': 'SOFR'},
+    {'key': 'yield_curve', 'label': "Yield Curve (10Y-2Y)", 'fmt': "{:.2f}%", 'delta_fmt': "{:+.2f}%",
+     'help': "Zmiana vs 30 dni temu",
+     'expander': "❓ Co to Yield Curve?", 'explain_key': 'YIELD_CURVE'},
+    {'key': 'm2', 'label': "M2 Money Supply", 'display': 'm2_display', 'delta_fmt': "{:+.2f}%",
+     'help': "Zmiana vs 30 dni temu",
+     'expander': "❓ Co to M2?", 'explain_key': 'M2'},
+]
+
+INFLATION_METRICS = [
+    # CPI jest w formacie index - pokazujemy zmianę (przybliżenie YoY%)
+    {'key': 'cpi', 'label': "CPI (Consumer Price Index)", 'value': 'delta', 'fmt': "{:.1f}%",
+     'help': "Wskaźnik cen konsumpcyjnych (YoY change)", 'caption': "🎯 Cel Fed: **2.0%**",
+     'expander': "❓ Co to CPI?", 'explain_md': 'cpi.md'},
+    {'key': 'pce', 'label': "PCE (Personal Consumption)", 'value': 'delta', 'fmt': "{:.1f}%",
+     'help': "Preferowany wskaźnik inflacji Fed (YoY)", 'caption': "🎯 **PREFEROWANY przez Fed!**",
+     'expander': "❓ Co to PCE?", 'explain_md': 'pce.md'},
+    {'key': 'cpi_core', 'label': "Core CPI", 'value': 'delta', 'fmt': "{:.1f}%",
+     'help': "CPI bez żywności i energii (stabilniejszy)", 'caption': "📌 Bez żywności i energii",
+     'expander': "❓ Dlaczego 'Core'?", 'explain_md': 'cpi_core.md'},
+    {'key': 'inflation_5y', 'label': "5Y Breakeven Inflation", 'fmt': "{:.2f}%", 'delta_fmt': "{:+.2f}%",
+     'help': "Oczekiwania inflacyjne na 5 lat (z obligacji)", 'caption': "🔮 **Oczekiwania rynku**",
+     'expander': "❓ Co to Breakeven Inflation?", 'explain_md': 'breakeven_5y.md'},
+]
+
+RATES_METRICS = [
+    {'key': 'fed_funds', 'label': "Fed Funds Rate", 'fmt': "{:.2f}%", 'delta_fmt': "{:+.2f}%",
+     'help': "Efektywna stopa procentowa Fed", 'caption': "🎯 **Aktualna stopa Fed**",
+     'expander': "❓ Co to Fed Funds Rate?", 'explain_md': 'fed_funds.md'},
+    {'key': 'treasury_10y', 'label': "10Y Treasury Yield", 'fmt': "{:.2f}%", 'delta_fmt': "{:+.2f}%",
+     'help': "Rentowność 10-letnich obligacji USA", 'caption': "📊 **Benchmark długu**",
+     'expander': "❓ Dlaczego 10Y Treasury?", 'explain_md': 'treasury_10y.md'},
+    {'key': 'treasury_2y', 'label': "2Y Treasury Yield", 'fmt': "{:.2f}%", 'delta_fmt': "{:+.2f}%",
+     'help': "Rentowność 2-letnich obligacji USA", 'caption': "📉 **Short-term rates**",
+     'expander': "❓ Yield Curve (10Y-2Y)?", 'explain_md': 'yield_curve_inversion.md',
+     'extra': _render_yield_spread},
+]
+
+GDP_METRIC = {
+    'key': 'gdp_real', 'label': "Real GDP", 'value': 'delta', 'fmt': "{:.1f}%",
+    'help': "Realny PKB (adjusted for inflation, YoY)", 'caption': "📊 **Wzrost gospodarczy USA**",
+    'expander': "❓ Co to GDP?", 'explain_md': 'gdp.md'
+}
 
-with col2:
-    sofr_val, sofr_delta = get_indicator_val('sofr')
-    st.metric(
-        "SOFR",
-        f"{sofr_val:.2f}%" if sofr_val else "N/A",
-        f"{sofr_delta:+.2f}%",
-        help="Zmiana vs 30 dni temu"
-    )
 
-    with st.expander("❓ Co to SOFR?"):
-        _, short, long, emoji = get_explanation('SOFR')
-        st.markdown(long)
+def render_metric(spec):
+    """Karta metryki z konfiguracji: st.metric + opcjonalny caption + expander z wyjaśnieniem"""
+    val, delta = indicator_vals[spec['key']]
+    shown = delta if spec.get('value') == 'delta' else val
+    if 'display' in spec:
+        value_str = indicator_vals[spec['display']]
+    elif shown:
+        value_str = spec['fmt'].format(shown)
+    else:
+        value_str = "N/A"
 
-with col3:
-    yc_val, yc_delta = get_indicator_val('yield_curve')
     st.metric(
-        "Yield Curve (10Y-2Y)",
-        f"{yc_val:.2f}%" if yc_val else "N/A",
-        f"{yc_delta:+.2f}%",
-        help="Zmiana vs 30 dni temu"
+        spec['label'],
+        value_str,
+        spec['delta_fmt'].format(delta) if spec.get('delta_fmt') else None,
+        delta_color=spec.get('delta_color', "normal"),
+        help=spec['help']
     )
+    if spec.get('caption'):
+        st.caption(spec['caption'])
+
+    with st.expander(spec['expander']):
+        if spec.get('extra'):
+            spec['extra']()
+        if 'explain_md' in spec:
+            st.markdown(_load_md(spec['explain_md']))
+        else:
+            st.markdown(_EXPLANATIONS[spec['explain_key']][2])
 
-    with st.expander("❓ Co to Yield Curve?"):
-        _, short, long, emoji = get_explanation('YIELD_CURVE')
-        st.markdown(long)
 
-with col4:
-    m2_val, m2_delta = get_indicator_val('m2')
-    m2_display = f"{m2_val/1000:.1f}T" if m2_val and m2_val > 1000 else f"{m2_val:.0f}B" if m2_val else "N/A"
-    st.metric(
-        "M2 Money Supply",
-        m2_display,
-        f"{m2_delta:+.2f}%",
-        help="Zmiana vs 30 dni temu"
-    )
+# ============================================
+# KEY METRICS (z wyjaśnieniami!)
+# ============================================
 
-    with st.expander("❓ Co to M2?"):
-        _, short, long, emoji = get_explanation('M2')
-        st.markdown(long)
+st.markdown("### 📈 Kluczowe Wskaźniki")
+st.caption("💡 Kliknij na każdy wskaźnik poniżej aby dowiedzieć się więcej!")
+
+# 4 kolumny z wskaźnikami
+for spec, col in zip(METRICS_CONFIG, st.columns(4)):
+    with col:
+        render_metric(spec)
 
 st.markdown("---")
 
@@ -722,196 +941,16 @@ tab_infl, tab_rates, tab_growth = st.tabs(["🔥 Inflacja", "💰 Stopy Procento
 with tab_infl:
     st.markdown("#### 🔥 Wskaźniki Inflacji")
 
-    col_inf1, col_inf2, col_inf3, col_inf4 = st.columns(4)
-
-    with col_inf1:
-        cpi_val, cpi_delta = get_indicator_val('cpi')
-        # CPI jest w formacie index, musimy przeliczyć na YoY% (przybliżenie)
-        st.metric(
-            "CPI (Consumer Price Index)",
-            f"{cpi_delta:.1f}%" if cpi_delta else "N/A",
-            help="Wskaźnik cen konsumpcyjnych (YoY change)"
-        )
-        st.caption("🎯 Cel Fed: **2.0%**")
-
-        with st.expander("❓ Co to CPI?"):
-            st.markdown("""
-            **CPI** = Consumer Price Index - Indeks Cen Konsumpcyjnych
-
-            📊 **Co mierzy?**
-            - Średnią zmianę cen koszyka dóbr i usług kupowanych przez gospodarstwa domowe
-            - Obejmuje: żywność, energia, mieszkanie, odzież, transport, opieka zdrowotna
-
-            🎯 **Interpretacja:**
-            - **< 2%** = Niska inflacja (deflacja?)
-            - **~2%** = CEL FED (idealna inflacja!)
-            - **> 3%** = Podwyższona inflacja
-            - **> 5%** = Wysoka inflacja (Fed zacieśnia politykę!)
-
-            💡 **Why it matters:**
-            Fed używa CPI i PCE do monitorowania inflacji. Wysoka inflacja → wyższe stopy procentowe!
-            """)
-
-    with col_inf2:
-        pce_val, pce_delta = get_indicator_val('pce')
-        st.metric(
-            "PCE (Personal Consumption)",
-            f"{pce_delta:.1f}%" if pce_delta else "N/A",
-            help="Preferowany wskaźnik inflacji Fed (YoY)"
-        )
-        st.caption("🎯 **PREFEROWANY przez Fed!**")
-
-        with st.expander("❓ Co to PCE?"):
-            st.markdown("""
-            **PCE** = Personal Consumption Expenditures - Wydatki Konsumpcyjne
-
-            📊 **Dlaczego Fed preferuje PCE nad CPI?**
-            - Obejmuje **szerszy zakres** dóbr i usług
-            - Uwzględnia **substytucję** (gdy chleb drożeje, ludzie kupują ryż)
-            - Bardziej **elastyczny** i **precyzyjny**
-
-            🎯 **Interpretacja:**
-            - **< 2%** = Niska inflacja
-            - **~2%** = CEL FED (mandate!)
-            - **> 2.5%** = Fed zaczyna się martwić
-            - **> 3%** = Fed zacieśnia politykę
-
-            💡 **Core PCE** (bez żywności i energii) to **#1 wskaźnik** dla Fed!
-            """)
-
-    with col_inf3:
-        cpi_core_val, cpi_core_delta = get_indicator_val('cpi_core')
-        st.metric(
-            "Core CPI",
-            f"{cpi_core_delta:.1f}%" if cpi_core_delta else "N/A",
-            help="CPI bez żywności i energii (stabilniejszy)"
-        )
-        st.caption("📌 Bez żywności i energii")
-
-        with st.expander("❓ Dlaczego 'Core'?"):
-            st.markdown("""
-            **Core CPI** = CPI **bez żywności i energii**
-
-            🤔 **Dlaczego wykluczamy żywność i energię?**
-            - Są **bardzo zmienne** (pogoda, geopolityka, OPEC)
-            - Nie odzwierciedlają **trwałych trendów** inflacyjnych
-            - Core CPI pokazuje **bazową presję inflacyjną**
-
-            💡 **Core inflation** jest lepszym wskaźnikiem **długoterminowych trendów**!
-            """)
-
-    with col_inf4:
-        infl_5y_val, infl_5y_delta = get_indicator_val('inflation_5y')
-        st.metric(
-            "5Y Breakeven Inflation",
-            f"{infl_5y_val:.2f}%" if infl_5y_val else "N/A",
-            f"{infl_5y_delta:+.2f}%",
-            help="Oczekiwania inflacyjne na 5 lat (z obligacji)"
-        )
-        st.caption("🔮 **Oczekiwania rynku**")
-
-        with st.expander("❓ Co to Breakeven Inflation?"):
-            st.markdown("""
-            **5Y Breakeven Inflation** = Oczekiwana inflacja na najbliższe 5 lat
-
-            📊 **Jak to działa?**
-            - Różnica między **nominalną** a **realną** rentownością obligacji Treasury
-            - Nominal Treasury Yield - TIPS Yield = Expected Inflation
-
-            🎯 **Interpretacja:**
-            - **< 1.5%** = Rynek spodziewa się deflacji/niskiej inflacji
-            - **~2%** = Oczekiwania zgodne z celem Fed
-            - **> 3%** = Rynek spodziewa się wysokiej inflacji
-
-            💡 Jeśli breakeven > actual inflation → rynek spodziewa się wzrostu inflacji!
-            """)
+    for spec, col in zip(INFLATION_METRICS, st.columns(4)):
+        with col:
+            render_metric(spec)
 
 with tab_rates:
     st.markdown("#### 💰 Stopy Procentowe")
 
-    col_rate1, col_rate2, col_rate3 = st.columns(3)
-
-    with col_rate1:
-        ff_val, ff_delta = get_indicator_val('fed_funds')
-        st.metric(
-            "Fed Funds Rate",
-            f"{ff_val:.2f}%" if ff_val else "N/A",
-            f"{ff_delta:+.2f}%",
-            help="Efektywna stopa procentowa Fed"
-        )
-        st.caption("🎯 **Aktualna stopa Fed**")
-
-        with st.expander("❓ Co to Fed Funds Rate?"):
-            st.markdown("""
-            **Fed Funds Rate** = Główna stopa procentowa Fed
-
-            📊 **Co to jest?**
-            - Stopa, po której banki pożyczają sobie nawzajem **overnight**
-            - Ustalana przez **FOMC** (Federal Open Market Committee)
-            - Najważniejsza zmienna w polityce monetarnej USA!
-
-            🎯 **Jak wpływa na rynek?**
-            - **Wyższe stopy** → droższe pożyczki → wolniejszy wzrost → niższe akcje
-            - **Niższe stopy** → tańsze pożyczki → szybszy wzrost → wyższe akcje
-
-            💡 Fed zmienia stopy zwykle o **0.25%** (25 basis points) lub **0.50%** (50 bps)
-            """)
-
-    with col_rate2:
-        t10_val, t10_delta = get_indicator_val('treasury_10y')
-        st.metric(
-            "10Y Treasury Yield",
-            f"{t10_val:.2f}%" if t10_val else "N/A",
-            f"{t10_delta:+.2f}%",
-            help="Rentowność 10-letnich obligacji USA"
-        )
-        st.caption("📊 **Benchmark długu**")
-
-        with st.expander("❓ Dlaczego 10Y Treasury?"):
-            st.markdown("""
-            **10Y Treasury** = Rentowność 10-letnich obligacji skarbowych USA
-
-            📊 **Dlaczego to ważne?**
-            - **Benchmark** dla wszystkich długoterminowych stóp procentowych
-            - Wpływa na kredyty hipoteczne, kredyty firmowe
-            - Odzwierciedla oczekiwania rynku co do przyszłości
-
-            🎯 **Interpretacja:**
-            - **< 2%** = Niskie stopy, obawy o wzrost
-            - **2-4%** = Normalne warunki
-            - **> 5%** = Wysokie stopy, Fed walczy z inflacją
-
-            💡 Gdy 10Y > Fed Funds = rynek spodziewa się wyższych stóp w przyszłości!
-            """)
-
-    with col_rate3:
-        t2_val, t2_delta = get_indicator_val('treasury_2y')
-        st.metric(
-            "2Y Treasury Yield",
-            f"{t2_val:.2f}%" if t2_val else "N/A",
-            f"{t2_delta:+.2f}%",
-            help="Rentowność 2-letnich obligacji USA"
-        )
-        st.caption("📉 **Short-term rates**")
-
-        with st.expander("❓ Yield Curve (10Y-2Y)?"):
-            yc = (t10_val - t2_val) if t10_val and t2_val else None
-            if yc:
-                st.metric("10Y-2Y Spread", f"{yc:.2f}%",
-                          delta="INVERTED!" if yc < 0 else "Normal")
-
-            st.markdown("""
-            **Yield Curve Inversion** = 2Y > 10Y (krótkoterminowe wyższe niż długoterminowe)
-
-            🚨 **Dlaczego to ważne?**
-            - Historycznie **najlepszy predyktor recesji**!
-            - Odwrócona krzywa pojawiła się przed każdą recesją od 1960 roku
-            - Zwykle recesja następuje **6-18 miesięcy** po inwersji
-
-            🎯 **Co to oznacza?**
-            - Rynek spodziewa się, że Fed będzie musiał **obniżyć stopy** w przyszłości
-            - Spowolnienie gospodarcze → niższy popyt na kredyty → niższe stopy
-            """)
+    for spec, col in zip(RATES_METRICS, st.columns(3)):
+        with col:
+            render_metric(spec)
 
 with tab_growth:
     st.markdown("#### 📈 Wskaźniki Wzrostu Gospodarczego")
@@ -919,30 +958,7 @@ with tab_growth:
     col_gdp1, col_gdp2, col_gdp3 = st.columns(3)
 
     with col_gdp1:
-        gdp_val, gdp_delta = get_indicator_val('gdp_real')
-        st.metric(
-            "Real GDP",
-            f"{gdp_delta:.1f}%" if gdp_delta else "N/A",
-            help="Realny PKB (adjusted for inflation, YoY)"
-        )
-        st.caption("📊 **Wzrost gospodarczy USA**")
-
-        with st.expander("❓ Co to GDP?"):
-            st.markdown("""
-            **GDP** = Gross Domestic Product - Produkt Krajowy Brutto
-
-            📊 **Co mierzy?**
-            - **Całkowitą wartość** wszystkich dóbr i usług wyprodukowanych w USA
-            - **Real GDP** = adjusted for inflation (prawdziwy wzrost)
-
-            🎯 **Interpretacja:**
-            - **< 0%** = **RECESJA** (2 kwartały pod rząd = oficjalna recesja)
-            - **0-1%** = Słaby wzrost
-            - **2-3%** = Zdrowy, zrównoważony wzrost
-            - **> 3%** = Silny wzrost (ale może prowadzić do inflacji!)
-
-            💡 Średnia długoterminowa dla USA: **~2.5%**
-            """)
+        render_metric(GDP_METRIC)
 
     with col_gdp2:
         st.warning("⚠️ **ISM Manufacturing: DISCONTINUED**")
@@ -1013,191 +1029,105 @@ st.markdown("---")
 # LIQUIDITY INDICATORS (TGA, Reserves, RRP, Fed Balance)
 # ============================================
 
-st.markdown("### 💧 Główne Wskaźniki Płynności")
-st.caption("💡 Kluczowe źródła płynności w systemie finansowym")
-
-# 4 kolumny z liquidity metrics
-lcol1, lcol2, lcol3, lcol4 = st.columns(4)
-
-with lcol1:
-    reserves_val, reserves_delta = get_indicator_val('reserves_alt')
-    reserves_display = f"${reserves_val:.0f}B" if reserves_val else "N/A"
-    st.metric(
-        "🏦 Rezerwy Banków",
-        reserves_display,
-        f"{reserves_delta:+.2f}%",
-        help="Zmiana vs 30 dni temu"
-    )
-
-    with st.expander("❓ Co to Rezerwy?"):
-        _, short, long, emoji = get_explanation('RESERVES')
-        st.markdown(long)
-
-        st.markdown("---")
-        st.markdown("**💡 Wpływ na płynność:**")
-        if reserves_val:
-            if reserves_val > 3000:
-                st.success("✅ **AMPLE** (>$3T): Dużo kasy w systemie - płynność wysoka!")
-            elif reserves_val > 2800:
-                st.warning("⚠️ **SUFFICIENT** ($2.8-3T): Wystarczająco, ale blisko progu")
-            else:
-                st.error("🚨 **SCARCE** (<$2.8T): Za mało! Napięcia płynnościowe!")
-
-with lcol2:
-    tga_val, tga_delta = get_indicator_val('tga')
-    tga_display = f"${tga_val:.0f}B" if tga_val else "N/A"
-    st.metric(
-        "🏛️ TGA (US Treasury)",
-        tga_display,
-        f"{tga_delta:+.2f}%",
-        delta_color="inverse",  # TGA up = bad dla płynności
-        help="Zmiana vs 30 dni temu (odwrotna korelacja z płynnością)"
-    )
-
-    with st.expander("❓ Co to TGA?"):
-        _, short, long, emoji = get_explanation('TGA')
-        st.markdown(long)
-
-        st.markdown("---")
-        st.markdown("**💡 Wpływ na płynność:**")
-        st.markdown("""
-        **TGA ROŚNIE** 📈 = Rząd zbiera podatki/nie wydaje
-        - Kasa **WYCHODZI** z systemu bankowego
-        - Płynność **SPADA** 📉
-        - **Bearish** dla akcji/crypto
-
-        **TGA SPADA** 📉 = Rząd wydaje kasę (emerytury, kontrakty)
-        - Kasa **WPŁYWA** do systemu bankowego
-        - Płynność **ROŚNIE** 📈
-        - **Bullish** dla akcji/crypto
-
-        **Przykład:** Debt ceiling kończy się → TGA spada o $500B → mega boost płynności! 🚀
-        """)
-
-with lcol3:
-    rrp_val, rrp_delta = get_indicator_val('reverse_repo')
-    rrp_display = f"${rrp_val:.0f}B" if rrp_val else "N/A"
-    st.metric(
-        "🅿️ Reverse Repo",
-        rrp_display,
-        f"{rrp_delta:+.2f}%",
-        delta_color="inverse",  # RRP down = good (kasa wraca na rynek)
-        help="Zmiana vs 30 dni temu (odwrotna korelacja z płynnością)"
-    )
-
-    with st.expander("❓ Co to RRP?"):
-        _, short, long, emoji = get_explanation('RRP')
-        st.markdown(long)
-
-        st.markdown("---")
-        st.markdown("**💡 Wpływ na płynność:**")
-        st.markdown("""
-        **RRP = Parking dla nadmiaru gotówki**
-
-        **RRP WYSOKI** (>$1T):
-        - Dużo kasy "zaparkowanej" u Fedu
-        - Pieniądze **NIE PRACUJĄ** na rynku
-        - To bufor bezpieczeństwa (dobra rzecz)
-
-        **RRP SPADA** (<$500B):
-        - Kasa **WRACA** na rynek!
-        - Płynność **ROŚNIE** 📈
-        - **Bullish** dla akcji/crypto
-
-        **Peak COVID:** RRP = $2.5T! (ogromny "parkingnie" kasy)
-        **Teraz:** RRP spada = płynność wraca do gry 🚀
-        """)
-
-with lcol4:
-    fed_bal_val, fed_bal_delta = get_indicator_val('fed_balance')
-    fed_bal_display = f"${fed_bal_val/1000:.1f}T" if fed_bal_val else "N/A"
-    st.metric(
-        "🖨️ Bilans Fed",
-        fed_bal_display,
-        f"{fed_bal_delta:+.2f}%",
-        help="Zmiana vs 30 dni temu"
-    )
+# Progi rezerw ($B) → (metoda st, komunikat); wartość na progu należy do niższego przedziału
+RESERVES_BINS = np.array([2800, 3000])
+RESERVES_STATUS = (
+    ('error', "🚨 **SCARCE** (<$2.8T): Za mało! Napięcia płynnościowe!"),
+    ('warning', "⚠️ **SUFFICIENT** ($2.8-3T): Wystarczająco, ale blisko progu"),
+    ('success', "✅ **AMPLE** (>$3T): Dużo kasy w systemie - płynność wysoka!"),
+)
 
-    with st.expander("❓ Co to Bilans Fed?"):
-        _, short, long, emoji = get_explanation('FED_BALANCE')
-        st.markdown(long)
 
-        st.markdown("---")
-        st.markdown("**💡 Wpływ na płynność:**")
-        st.markdown("""
-        **Bilans Fedu = Money Printer Status**
-
-        **BILANS ROŚNIE** 📈 = **QE (Quantitative Easing)**
-        - FED KUPUJE obligacje (drukuje $)
-        - Płynność **EKSPLODUJE** 💥
-        - **MEGA BULLISH** dla wszystkiego!
-        - Korelacja z S&P500: ~0.8
-
-        **BILANS SPADA** 📉 = **QT (Quantitative Tightening)**
-        - FED SPRZEDAJE/nie rolluje obligacji
-        - Płynność **WYSYCHA** 🔥
-        - **BEARISH** dla akcji/crypto
-
-        **Historia:**
-        - 2020-2021: +$5T → S&P +60%, BTC $7k→$69k 🚀
-        - 2022-2024: -$1.5T → Bear market 🐻
-        """)
+def render_liquidity_metrics():
+    """Karty Rezerwy / TGA / RRP / Bilans Fed z wyjaśnieniami"""
+    st.markdown("### 💧 Główne Wskaźniki Płynności")
+    st.caption("💡 Kluczowe źródła płynności w systemie finansowym")
 
-# Interpretacja połączona (jak działają razem)
-with st.expander("🧠 Jak te wskaźniki działają razem? (MUST READ!)"):
-    st.markdown("""
-    ## 💧 Formuła Płynności Netto (Net Liquidity)
+    # 4 kolumny z liquidity metrics
+    lcol1, lcol2, lcol3, lcol4 = st.columns(4)
 
-    **Net Liquidity = Fed Balance - TGA - RRP + Rezerwy**
+    with lcol1:
+        reserves_val, reserves_delta = indicator_vals['reserves_alt']
+        reserves_display = f"${reserves_val:.0f}B" if reserves_val else "N/A"
+        st.metric(
+            "🏦 Rezerwy Banków",
+            reserves_display,
+            f"{reserves_delta:+.2f}%",
+            help="Zmiana vs 30 dni temu"
+        )
 
-    ### 🎯 Jak to interpretować:
+        with st.expander("❓ Co to Rezerwy?"):
+            _, short, long, emoji = _EXPLANATIONS['RESERVES']
+            st.markdown(long)
 
-    **Zwiększa płynność (+):**
-    - ✅ Bilans Fed rośnie (QE - drukowanie $)
-    - ✅ TGA spada (rząd wydaje kasę)
-    - ✅ RRP spada (kasa wraca z "parkingu")
-    - ✅ Rezerwy rosną (banki mają więcej $)
+            st.markdown("---")
+            st.markdown("**💡 Wpływ na płynność:**")
+            if reserves_val:
+                kind, message = RESERVES_STATUS[np.searchsorted(RESERVES_BINS, reserves_val)]
+                getattr(st, kind)(message)
 
-    **Zmniejsza płynność (-):**
-    - ❌ Bilans Fed spada (QT - niszczenie $)
-    - ❌ TGA rośnie (rząd zabiera $ podatkami)
-    - ❌ RRP rośnie (kasa ucieka do "parkingu")
-    - ❌ Rezerwy spadają (banki mają mniej $)
+    with lcol2:
+        tga_val, tga_delta = indicator_vals['tga']
+        tga_display = f"${tga_val:.0f}B" if tga_val else "N/A"
+        st.metric(
+            "🏛️ TGA (US Treasury)",
+            tga_display,
+            f"{tga_delta:+.2f}%",
+            delta_color="inverse",  # TGA up = bad dla płynności
+            help="Zmiana vs 30 dni temu (odwrotna korelacja z płynnością)"
+        )
 
-    ---
+        with st.expander("❓ Co to TGA?"):
+            _, short, long, emoji = _EXPLANATIONS['TGA']
+            st.markdown(long)
 
-    ## 📊 Scenariusze Realne:
+            st.markdown("---")
+            st.markdown("**💡 Wpływ na płynność:**")
+            st.markdown(_load_md('tga_impact.md'))
 
-    ### 🚀 **LIQUIDITY FLOOD** (Best case):
-    - Fed Balance ⬆️ (QE!)
-    - TGA ⬇️ (rząd wydaje)
-    - RRP ⬇️ (kasa wraca)
-    - Rezerwy ⬆️ (banki mają kasę)
+    with lcol3:
+        rrp_val, rrp_delta = indicator_vals['reverse_repo']
+        rrp_display = f"${rrp_val:.0f}B" if rrp_val else "N/A"
+        st.metric(
+            "🅿️ Reverse Repo",
+            rrp_display,
+            f"{rrp_delta:+.2f}%",
+            delta_color="inverse",  # RRP down = good (kasa wraca na rynek)
+            help="Zmiana vs 30 dni temu (odwrotna korelacja z płynnością)"
+        )
 
-    **= TURBO PŁYNNOŚĆ! Akcje/crypto TO THE MOON! 🌙**
+        with st.expander("❓ Co to RRP?"):
+            _, short, long, emoji = _EXPLANATIONS['RRP']
+            st.markdown(long)
 
-    ### 🐻 **LIQUIDITY DRAIN** (Worst case):
-    - Fed Balance ⬇️ (QT!)
-    - TGA ⬆️ (rząd zbiera podatki)
-    - RRP ⬆️ (kasa ucieka)
-    - Rezerwy ⬇️ (banki kurczą kasę)
+            st.markdown("---")
+            st.markdown("**💡 Wpływ na płynność:**")
+            st.markdown(_load_md('rrp_impact.md'))
 
-    **= PŁYNNOŚĆ WYSYCHA! Wszystko spada! 📉**
+    with lcol4:
+        fed_bal_val, fed_bal_delta = indicator_vals['fed_balance']
+        fed_bal_display = f"${fed_bal_val/1000:.1f}T" if fed_bal_val else "N/A"
+        st.metric(
+            "🖨️ Bilans Fed",
+            fed_bal_display,
+            f"{fed_bal_delta:+.2f}%",
+            help="Zmiana vs 30 dni temu"
+        )
 
-    ---
+        with st.expander("❓ Co to Bilans Fed?"):
+            _, short, long, emoji = _EXPLANATIONS['FED_BALANCE']
+            st.markdown(long)
 
-    ## 💡 Dan Kostecki Pro Tip:
+            st.markdown("---")
+            st.markdown("**💡 Wpływ na płynność:**")
+            st.markdown(_load_md('fed_balance_impact.md'))
 
-    > "Forget fundamentals. Follow the liquidity.
-    > Fed Balance + TGA + RRP tells you everything."
+    # Interpretacja połączona (jak działają razem)
+    with st.expander("🧠 Jak te wskaźniki działają razem? (MUST READ!)"):
+        st.markdown(_load_md('liquidity_together.md'))
 
-    **Translation:**
-    Nie ważne jak dobre są zarobki firm.
-    Jak płynność spada = wszystko spada.
-    Jak płynność rośnie = wszystko rośnie.
 
-    **It's that simple.** 🎯
-    """)
+render_liquidity_metrics()
 
 st.markdown("---")
 
@@ -1206,194 +1136,219 @@ st.markdown("---")
 # NET LIQUIDITY (Dan Kostecki Formula)
 # ============================================
 
-st.markdown("### 💧 NET LIQUIDITY - Główna Metryka Płynności")
-st.caption("💡 Formuła Dan Kosteckiego: Fed Balance - TGA - RRP (w miliardach USD)")
+# Limit punktów na wykresie Net Liquidity (dłuższe serie → LTTB)
+NET_LIQ_MAX_POINTS = 1000
 
-try:
-    # Pobierz wartości wskaźników
-    fed_balance_val, _ = get_indicator_val('fed_balance')
-    tga_val, _ = get_indicator_val('tga')
-    rrp_val, _ = get_indicator_val('reverse_repo')
+# Progi Net Liquidity ($B) → status; wartość na progu należy do niższego przedziału
+NET_LIQ_BINS = np.array([3000, 4000, 5000])
+NET_LIQ_STATUS = ("🔴 Niska", "🟡 Umiarkowana", "🟢 Wysoka", "🟢 Bardzo Wysoka")
 
-    # Oblicz Net Liquidity (w miliardach)
-    # Uwaga: fed_balance jest już w B, nie trzeba dzielić
-    if all(v is not None for v in [fed_balance_val, tga_val, rrp_val]):
-        net_liquidity = fed_balance_val - tga_val - rrp_val
+# Składniki Net Liquidity: (klucz w indicators, kolumna w net_liq_df)
+NET_LIQ_KEYS = (('fed_balance', 'fed_balance'), ('tga', 'tga'), ('reverse_repo', 'rrp'))
 
-        # Metryki w kolumnach
-        nlcol1, nlcol2, nlcol3 = st.columns(3)
 
-        with nlcol1:
-            st.metric(
-                "💧 Net Liquidity",
-                f"${net_liquidity:.0f}B",
-                help="Fed Balance - TGA - RRP"
-            )
+@st.cache_data(ttl=600, show_spinner=False)
+def _net_liquidity_bundle(fingerprint, _frames, days_range):
+    """
+    Seria Net Liquidity + statystyki (min, max, mean) + figura w jednym cache.
 
-        with nlcol2:
-            # Porównanie do poprzedniego miesiąca (uproszczone - użyjemy change z fed_balance jako proxy)
-            _, fed_change = get_indicator_val('fed_balance')
-            st.metric(
-                "Trend (30d)",
-                "Wzrost" if fed_change > 0 else "Spadek",
-                f"{fed_change:+.1f}%"
-            )
+    Klucz cache to fingerprint i zakres dni - '_frames' (z podkreślnikiem) nie jest hashowane.
+    """
+    # Trzy źródła na wspólnej dziennej osi (forward-fill), od dnia gdy są wszystkie
+    net_liq_df = _align_daily(
+        [_frames[key].set_index('date')['value'].rename(column) for key, column in NET_LIQ_KEYS]
+    ).dropna()
 
-        with nlcol3:
-            # Interpretacja
-            if net_liquidity > 5000:
-                status = "🟢 Bardzo Wysoka"
-                status_color = "green"
-            elif net_liquidity > 4000:
-                status = "🟢 Wysoka"
-                status_color = "green"
-            elif net_liquidity > 3000:
-                status = "🟡 Umiarkowana"
-                status_color = "orange"
-            else:
-                status = "🔴 Niska"
-                status_color = "red"
+    # Oblicz Net Liquidity (odejmowanie na tablicach NumPy, bez wyrównywania indeksów)
+    net_liq_df['Net Liquidity'] = (
+        net_liq_df['fed_balance'].to_numpy() -
+        net_liq_df['tga'].to_numpy() -
+        net_liq_df['rrp'].to_numpy()
+    )
+    net_liq_df = net_liq_df.rename_axis('date').reset_index()
+
+    # Do wykresu max NET_LIQ_MAX_POINTS punktów (LTTB) - statystyki liczone z pełnej serii
+    net_liq_plot = net_liq_df
+    if len(net_liq_df) > NET_LIQ_MAX_POINTS:
+        keep = lttb_indices(
+            net_liq_df['date'].to_numpy('datetime64[ns]').astype(np.int64).astype(np.float64),
+            net_liq_df['Net Liquidity'].to_numpy(np.float64),
+            NET_LIQ_MAX_POINTS
+        )
+        net_liq_plot = net_liq_df.iloc[keep]
+
+    fig = create_time_series(
+        data=net_liq_plot,
+        x_column='date',
+        y_column='Net Liquidity',
+        title=f"Net Liquidity - Ostatnie {days_range} dni",
+        y_axis_title="Net Liquidity ($B)",
+        color=CHART_COLORS['line_neutral']
+    )
 
-            st.metric(
-                "Status",
-                status
-            )
+    # Statystyki - jedno przejście po tablicy NumPy
+    nl_arr = net_liq_df['Net Liquidity'].to_numpy(np.float64)
+    nl_min, nl_max, nl_mean, _ = quad_stats(nl_arr[~np.isnan(nl_arr)])
 
-        # Wykres Net Liquidity w czasie
-        st.markdown("#### 📈 Net Liquidity - Trend Historyczny")
+    return net_liq_df, (nl_min, nl_max, nl_mean), fig
 
-        # Sprawdź czy mamy dane historyczne
-        if ('fed_balance' in indicators and 'data' in indicators['fed_balance'] and
-            'tga' in indicators and 'data' in indicators['tga'] and
-            'reverse_repo' in indicators and 'data' in indicators['reverse_repo']):
 
-            try:
-                # Połącz dane z trzech źródeł
-                fed_df = indicators['fed_balance']['data'][['date', 'value']].copy()
-                fed_df = fed_df.rename(columns={'value': 'fed_balance'})
+@st.fragment
+def render_net_liquidity():
+    """Net Liquidity: metryki, wykres historyczny i wyjaśnienie (fragment)"""
+    st.markdown("### 💧 NET LIQUIDITY - Główna Metryka Płynności")
+    st.caption("💡 Formuła Dan Kosteckiego: Fed Balance - TGA - RRP (w miliardach USD)")
 
-                tga_df = indicators['tga']['data'][['date', 'value']].copy()
-                tga_df = tga_df.rename(columns={'value': 'tga'})
+    try:
+        # Pobierz wartości wskaźników
+        fed_balance_val, fed_change = indicator_vals['fed_balance']
+        tga_val, _ = indicator_vals['tga']
+        rrp_val, _ = indicator_vals['reverse_repo']
+
+        # Oblicz Net Liquidity (w miliardach)
+        # Uwaga: fed_balance jest już w B, nie trzeba dzielić
+        if all(v is not None for v in [fed_balance_val, tga_val, rrp_val]):
+            net_liquidity = fed_balance_val - tga_val - rrp_val
+
+            # Metryki w kolumnach
+            nlcol1, nlcol2, nlcol3 = st.columns(3)
+
+            with nlcol1:
+                st.metric(
+                    "💧 Net Liquidity",
+                    f"${net_liquidity:.0f}B",
+                    help="Fed Balance - TGA - RRP"
+                )
 
-                rrp_df = indicators['reverse_repo']['data'][['date', 'value']].copy()
-                rrp_df = rrp_df.rename(columns={'value': 'rrp'})
+            with nlcol2:
+                # Porównanie do poprzedniego miesiąca (uproszczone - użyjemy change z fed_balance jako proxy)
+                st.metric(
+                    "Trend (30d)",
+                    "Wzrost" if fed_change > 0 else "Spadek",
+                    f"{fed_change:+.1f}%"
+                )
 
-                # Merge wszystkich trzech
-                net_liq_df = fed_df.merge(tga_df, on='date', how='inner')
-                net_liq_df = net_liq_df.merge(rrp_df, on='date', how='inner')
+            with nlcol3:
+                # Interpretacja
+                status = NET_LIQ_STATUS[np.searchsorted(NET_LIQ_BINS, net_liquidity)]
 
-                # Oblicz Net Liquidity
-                net_liq_df['Net Liquidity'] = (
-                    net_liq_df['fed_balance'] -
-                    net_liq_df['tga'] -
-                    net_liq_df['rrp']
+                st.metric(
+                    "Status",
+                    status
                 )
 
-                # Stwórz wykres
-                net_liq_fig = create_time_series(
-                    data=net_liq_df,
-                    x_column='date',
-                    y_column='Net Liquidity',
-                    title=f"Net Liquidity - Ostatnie {days_range} dni",
-                    y_axis_title="Net Liquidity ($B)",
-                    color=CHART_COLORS['line_neutral']
-                )
+            # Wykres Net Liquidity w czasie
+            st.markdown("#### 📈 Net Liquidity - Trend Historyczny")
 
-                st.plotly_chart(net_liq_fig, use_container_width=True)
+            # Sprawdź czy mamy dane historyczne
+            if all(key in indicator_frames for key, _ in NET_LIQ_KEYS):
 
-                # Statystyki Net Liquidity
-                nlstat1, nlstat2, nlstat3, nlstat4 = st.columns(4)
+                try:
+                    # Seria, statystyki i figura z cache - przeliczane tylko gdy zmienią się dane
+                    _, (nl_min, nl_max, nl_mean), net_liq_fig = _net_liquidity_bundle(
+                        _indicators_fingerprint(indicators, tuple(key for key, _ in NET_LIQ_KEYS)),
+                        indicator_frames,
+                        days_range
+                    )
 
-                with nlstat1:
-                    st.metric("Minimum", f"${net_liq_df['Net Liquidity'].min():.0f}B")
-                with nlstat2:
-                    st.metric("Maksimum", f"${net_liq_df['Net Liquidity'].max():.0f}B")
-                with nlstat3:
-                    st.metric("Średnia", f"${net_liq_df['Net Liquidity'].mean():.0f}B")
-                with nlstat4:
-                    current_vs_avg = net_liquidity - net_liq_df['Net Liquidity'].mean()
-                    st.metric("vs Średnia", f"{current_vs_avg:+.0f}B")
+                    st.plotly_chart(net_liq_fig, use_container_width=True)
 
-            except Exception as e:
-                st.warning(f"Nie można utworzyć wykresu Net Liquidity: {e}")
-        else:
-            st.info("Brak danych historycznych dla wykresu Net Liquidity")
+                    # Statystyki Net Liquidity
+                    nlstat1, nlstat2, nlstat3, nlstat4 = st.columns(4)
 
-        # Edukacyjne wyjaśnienie
-        with st.expander("🎓 Co to jest Net Liquidity i czemu jest NAJWAŻNIEJSZA?"):
-            st.markdown(f"""
-            ## 💧 Net Liquidity = Money Printer Power!
+                    with nlstat1:
+                        st.metric("Minimum", f"${nl_min:.0f}B")
+                    with nlstat2:
+                        st.metric("Maksimum", f"${nl_max:.0f}B")
+                    with nlstat3:
+                        st.metric("Średnia", f"${nl_mean:.0f}B")
+                    with nlstat4:
+                        current_vs_avg = net_liquidity - nl_mean
+                        st.metric("vs Średnia", f"{current_vs_avg:+.0f}B")
 
-            **Formuła:**
-            ```
-            Net Liquidity = Fed Balance - TGA - RRP
-            ```
+                except Exception as e:
+                    st.warning(f"Nie można utworzyć wykresu Net Liquidity: {e}")
+            else:
+                st.info("Brak danych historycznych dla wykresu Net Liquidity")
 
-            **Obecna wartość: ${net_liquidity:.0f}B**
+            # Edukacyjne wyjaśnienie - f-string budowany dopiero po zaznaczeniu
+            if st.checkbox("🎓 Co to jest Net Liquidity i czemu jest NAJWAŻNIEJSZA?", key="nl_edu"):
+                st.markdown(f"""
+                ## 💧 Net Liquidity = Money Printer Power!
 
-            ### 📊 Komponenty:
-            - **Fed Balance:** ${fed_balance_val:.0f}B (ile FED ma aktywów)
-            - **TGA:** ${tga_val:.0f}B (konto rządu - blokuje płynność)
-            - **RRP:** ${rrp_val:.0f}B (zaparkowana kasa - nie pracuje)
+                **Formuła:**
+                ```
+                Net Liquidity = Fed Balance - TGA - RRP
+                ```
 
-            ### 🎯 Dlaczego to najważniejsze?
+                **Obecna wartość: ${net_liquidity:.0f}B**
 
-            **Dan Kostecki mówi:**
-            > "Net Liquidity to JEDYNY wskaźnik który potrzebujesz.
-            > Rośnie = akcje/crypto up. Spada = akcje/crypto down.
-            > Forget everything else."
+                ### 📊 Komponenty:
+                - **Fed Balance:** ${fed_balance_val:.0f}B (ile FED ma aktywów)
+                - **TGA:** ${tga_val:.0f}B (konto rządu - blokuje płynność)
+                - **RRP:** ${rrp_val:.0f}B (zaparkowana kasa - nie pracuje)
 
-            **Jak to działa:**
+                ### 🎯 Dlaczego to najważniejsze?
 
-            **🚀 Net Liquidity ROŚNIE gdy:**
-            - ✅ Fed robi QE (kupuje obligacje) → Fed Balance up
-            - ✅ Rząd wydaje kasę → TGA down
-            - ✅ Kasa wraca z RRP parkingu → RRP down
+                **Dan Kostecki mówi:**
+                > "Net Liquidity to JEDYNY wskaźnik który potrzebujesz.
+                > Rośnie = akcje/crypto up. Spada = akcje/crypto down.
+                > Forget everything else."
 
-            **= Więcej kasy w systemie = Akcje/Crypto UP!**
+                **Jak to działa:**
 
-            **📉 Net Liquidity SPADA gdy:**
-            - ❌ Fed robi QT (sprzedaje obligacje) → Fed Balance down
-            - ❌ Rząd zbiera podatki → TGA up
-            - ❌ Kasa ucieka do RRP → RRP up
+                **🚀 Net Liquidity ROŚNIE gdy:**
+                - ✅ Fed robi QE (kupuje obligacje) → Fed Balance up
+                - ✅ Rząd wydaje kasę → TGA down
+                - ✅ Kasa wraca z RRP parkingu → RRP down
 
-            **= Mniej kasy w systemie = Akcje/Crypto DOWN!**
+                **= Więcej kasy w systemie = Akcje/Crypto UP!**
 
-            ### 📈 Korelacja z rynkiem:
+                **📉 Net Liquidity SPADA gdy:**
+                - ❌ Fed robi QT (sprzedaje obligacje) → Fed Balance down
+                - ❌ Rząd zbiera podatki → TGA up
+                - ❌ Kasa ucieka do RRP → RRP up
 
-            Net Liquidity vs S&P500: **~0.85 korelacja** (2020-2024)
+                **= Mniej kasy w systemie = Akcje/Crypto DOWN!**
 
-            **Przykłady z historii:**
+                ### 📈 Korelacja z rynkiem:
 
-            **COVID (2020-2021):**
-            - Net Liq: +$5T w rok 🚀
-            - S&P500: +60%
-            - Bitcoin: $7k → $69k
+                Net Liquidity vs S&P500: **~0.85 korelacja** (2020-2024)
 
-            **QT Era (2022-2024):**
-            - Net Liq: -$1.5T 📉
-            - S&P500: -20% (bear market)
-            - Bitcoin: $69k → $16k
+                **Przykłady z historii:**
 
-            ### 💡 Jak to używać w tradingu:
+                **COVID (2020-2021):**
+                - Net Liq: +$5T w rok 🚀
+                - S&P500: +60%
+                - Bitcoin: $7k → $69k
 
-            1. **Śledź trend Net Liquidity** (wykres wyżej)
-            2. **Net Liq rośnie 3 miesiące z rzędu?** → Czas kupować
-            3. **Net Liq spada 3 miesiące z rzędu?** → Czas sprzedawać
+                **QT Era (2022-2024):**
+                - Net Liq: -$1.5T 📉
+                - S&P500: -20% (bear market)
+                - Bitcoin: $69k → $16k
 
-            **To nie jest timing tool** (nie przewiduje dokładnie),
-            ale pokazuje **kierunek** dokąd płynie płynność.
+                ### 💡 Jak to używać w tradingu:
 
-            **TL;DR:**
-            Net Liquidity to paliwowy wskaźnik dla rynku.
-            Więcej paliwa = rynek jedzie. Mniej paliwa = rynek stoi.
-            """)
+                1. **Śledź trend Net Liquidity** (wykres wyżej)
+                2. **Net Liq rośnie 3 miesiące z rzędu?** → Czas kupować
+                3. **Net Liq spada 3 miesiące z rzędu?** → Czas sprzedawać
 
-    else:
-        st.warning("Brak danych do obliczenia Net Liquidity (potrzebne: Fed Balance, TGA, RRP)")
+                **To nie jest timing tool** (nie przewiduje dokładnie),
+                ale pokazuje **kierunek** dokąd płynie płynność.
 
-except Exception as e:
-    st.error(f"Błąd obliczania Net Liquidity: {e}")
+                **TL;DR:**
+                Net Liquidity to paliwowy wskaźnik dla rynku.
+                Więcej paliwa = rynek jedzie. Mniej paliwa = rynek stoi.
+                """)
+
+        else:
+            st.warning("Brak danych do obliczenia Net Liquidity (potrzebne: Fed Balance, TGA, RRP)")
+
+    except Exception as e:
+        st.error(f"Błąd obliczania Net Liquidity: {e}")
+
+
+render_net_liquidity()
 
 st.markdown("---")
 
@@ -1404,48 +1359,35 @@ st.markdown("---")
 
 st.markdown("### 🎯 Analiza Score")
 
-col_gauge, col_bar = st.columns(2)
-
-with col_gauge:
-    gauge_fig = create_gauge_meter(
-        value=score,
-        title="Overall Liquidity Score"
-    )
-    st.plotly_chart(gauge_fig, use_container_width=True)
-
-    with st.expander("❓ Jak interpretować Score?"):
-        st.markdown("""
-        **Liquidity Score** = Ocena ogólnych warunków płynnościowych (-100 do +100)
+# Rozłożenie score na komponenty (uproszczone dla MVP)
+component_scores = {
+    'Liquidity': score * 0.4,
+    'Risk Sentiment': score * 0.3,
+    'Conditions': score * 0.3
+}
 
-        **Skala:**
-        - **+70 do +100:** SUPER BULL! Wszystko super, płynność wysoka
-        - **+30 do +70:** Dobrze, zielone światło dla akcji
-        - **-30 do +30:** Neutralnie, tak sobie
-        - **-70 do -30:** Słabo, ostrożność wskazana
-        - **-100 do -70:** KATASTROFA! Ucieka kto może!
+# Gauge + komponenty w jednej figurze (jeden wykres zamiast dwóch)
+score_fig = create_score_breakdown(score, component_scores)
+st.plotly_chart(score_fig, use_container_width=True)
 
-        **Składa się z:**
-        - Wskaźniki płynności (SOFR, rezerwy, RRP)
-        - Wskaźniki ryzyka (VIX, HY spread)
-        - Warunki finansowe (NFCI, yield curve)
+with st.expander("❓ Jak interpretować Score?"):
+    st.markdown("""
+    **Liquidity Score** = Ocena ogólnych warunków płynnościowych (-100 do +100)
 
-        Ważone według systemu Dan Kosteckiego (liquidity expert).
-        """)
+    **Skala:**
+    - **+70 do +100:** SUPER BULL! Wszystko super, płynność wysoka
+    - **+30 do +70:** Dobrze, zielone światło dla akcji
+    - **-30 do +30:** Neutralnie, tak sobie
+    - **-70 do -30:** Słabo, ostrożność wskazana
+    - **-100 do -70:** KATASTROFA! Ucieka kto może!
 
-with col_bar:
-    # Rozłożenie score na komponenty (uproszczone dla MVP)
-    component_scores = {
-        'Liquidity': score * 0.4,
-        'Risk Sentiment': score * 0.3,
-        'Conditions': score * 0.3
-    }
+    **Składa się z:**
+    - Wskaźniki płynności (SOFR, rezerwy, RRP)
+    - Wskaźniki ryzyka (VIX, HY spread)
+    - Warunki finansowe (NFCI, yield curve)
 
-    bar_fig = create_horizontal_bar(
-        labels=list(component_scores.keys()),
-        values=list(component_scores.values()),
-        title="Score Components"
-    )
-    st.plotly_chart(bar_fig, use_container_width=True)
+    Ważone według systemu Dan Kosteckiego (liquidity expert).
+    """)
 
 st.markdown("---")
 
@@ -1454,11 +1396,38 @@ st.markdown("---")
 # DETAILED INDICATORS TABLE
 # ============================================
 
+@st.fragment
+def render_indicator_explainer(options):
+    """Selectbox 'Naucz się więcej' - zmiana wyboru przeładowuje tylko ten fragment"""
+    selected_indicator = st.selectbox(
+        "Wybierz wskaźnik:",
+        options=list(options)
+    )
+
+    if selected_indicator:
+        # Map display name to glossary term
+        term_map = {
+            'VIX': 'VIX',
+            'SOFR': 'SOFR',
+            'IORB': 'IORB',
+            'Yield Curve (10Y-2Y)': 'YIELD_CURVE',
+            'M2 Money Supply': 'M2',
+            'Financial Conditions': 'NFCI',
+            'Dollar Index (DXY)': 'DXY',
+            'High Yield Spread': 'HY_SPREAD'
+        }
+
+        term = term_map.get(selected_indicator, selected_indicator.upper())
+        _, short, long, emoji = _EXPLANATIONS.get(term) or get_explanation(term)
+
+        st.markdown(f"## {emoji} {selected_indicator}")
+        st.markdown(long)
+
+
 st.markdown("### 📋 Wszystkie Wskaźniki (Szczegółowo)")
 
 try:
-    collector = FredCollector()
-    summary = collector.get_key_indicators_summary()
+    summary = _get_summary()
 
     if summary:
         # Dodaj expander dla każdego wskaźnika w tabeli
@@ -1472,29 +1441,7 @@ try:
 
         # Sekcja "Naucz się więcej"
         with st.expander("📚 Naucz się więcej o każdym wskaźniku"):
-            selected_indicator = st.selectbox(
-                "Wybierz wskaźnik:",
-                options=list(summary.keys())
-            )
-
-            if selected_indicator:
-                # Map display name to glossary term
-                term_map = {
-                    'VIX': 'VIX',
-                    'SOFR': 'SOFR',
-                    'IORB': 'IORB',
-                    'Yield Curve (10Y-2Y)': 'YIELD_CURVE',
-                    'M2 Money Supply': 'M2',
-                    'Financial Conditions': 'NFCI',
-                    'Dollar Index (DXY)': 'DXY',
-                    'High Yield Spread': 'HY_SPREAD'
-                }
-
-                term = term_map.get(selected_indicator, selected_indicator.upper())
-                _, short, long, emoji = get_explanation(term)
-
-                st.markdown(f"## {emoji} {selected_indicator}")
-                st.markdown(long)
+            render_indicator_explainer(tuple(summary.keys()))
 
     else:
         st.info("Brak szczegółowych danych wskaźników")
@@ -1509,245 +1456,269 @@ st.markdown("---")
 # PERCENTILE ANALYSIS (Historical Context)
 # ============================================
 
-st.markdown("### 📊 Analiza Percentylowa - Kontekst Historyczny")
-st.caption("💡 Gdzie obecne wartości są względem historii (0-100%)")
+# Kolory słupków percentyli: <20 zielony, 20-40 żółty, 40-60 cyan, 60-80 żółty, >=80 czerwony
+COLOR_BINS = np.array([20, 40, 60, 80])
+COLOR_TABLE = np.array([
+    'rgba(57, 255, 20, 0.8)',   # Green
+    'rgba(255, 237, 78, 0.8)',  # Yellow
+    'rgba(0, 245, 255, 0.8)',   # Cyan
+    'rgba(255, 237, 78, 0.8)',  # Yellow
+    'rgba(255, 7, 58, 0.8)',    # Red
+])
+
+# Kolumny wyników percentyli (kolejność = krotka z _compute_one_percentile)
+PERCENTILE_COLUMNS = ('Wskaźnik', 'Obecna Wartość', 'Percentyl', 'Percentyl_num', 'Status', 'Emoji', 'Color', 'Full_Text')
+
+
+@st.cache_data(ttl=3600, show_spinner=False)
+def _sorted_history(fingerprint, _values):
+    """Posortowana historia wskaźnika (bez NaN, float32) - sortujemy raz na zestaw danych"""
+    return np.sort(_values[~np.isnan(_values)])
+
+
+def _compute_one_percentile(item):
+    """
+    Percentyl jednego wskaźnika (jeden wiersz tabeli percentyli).
+
+    Args:
+        item: (display_name, indicator_key)
+
+    Returns:
+        Tuple wiersza tabeli (Wskaźnik, Obecna Wartość, Percentyl, Percentyl_num, Status,
+        Emoji, Color, Full_Text) lub None gdy brak danych
+    """
+    display_name, indicator_key = item
+    historical_data = indicator_arrays.get(indicator_key)
+    if historical_data is None:
+        return None
+
+    # Obecna wartość (dane historyczne - gotowa tablica z indicator_arrays)
+    current_val = indicators[indicator_key].get('current')
+    if current_val is None or historical_data.size == 0:
+        return None
+
+    # Oblicz percentyl (wyszukiwanie binarne w posortowanej historii z cache)
+    sorted_vals = _sorted_history(
+        _indicators_fingerprint(indicators, (indicator_key,)), historical_data
+    )
+    percentile = percentile_from_sorted(current_val, sorted_vals)
+
+    # Interpretacja
+    text, emoji, color = interpret_percentile(indicator_key, percentile)
+
+    return (
+        display_name,
+        f"{current_val:.2f}" if current_val else "N/A",
+        f"{percentile:.0f}%",
+        percentile,
+        f"{emoji} {text.split(' - ')[0]}",  # Tylko pierwsza część
+        emoji,
+        color,
+        text
+    )
 
-try:
-    from utils.percentile_analysis import calculate_percentile, interpret_percentile
-
-    # Lista kluczowych wskaźników do analizy percentylowej
-    key_indicators_for_percentile = {
-        'VIX': 'vix',
-        'SOFR-IORB Spread': 'sofr_iorb_spread',
-        'Yield Curve': 'yield_curve',
-        'Rezerwy': 'reserves_alt',
-        'TGA': 'tga',
-        'RRP': 'reverse_repo',
-        'M2': 'm2',
-        'NFCI': 'nfci'
-    }
 
-    # Sprawdź czy mamy dane historyczne
-    has_percentile_data = False
-    percentile_results = []
+def render_percentile_analysis():
+    """Analiza percentylowa: tabela, wykres i wyjaśnienia"""
+    st.markdown("### 📊 Analiza Percentylowa - Kontekst Historyczny")
+    st.caption("💡 Gdzie obecne wartości są względem historii (0-100%)")
 
-    for display_name, indicator_key in key_indicators_for_percentile.items():
-        if indicator_key in indicators and 'data' in indicators[indicator_key]:
-            ind_data = indicators[indicator_key]
+    try:
+        # Lista kluczowych wskaźników do analizy percentylowej
+        key_indicators_for_percentile = {
+            'VIX': 'vix',
+            'SOFR-IORB Spread': 'sofr_iorb_spread',
+            'Yield Curve': 'yield_curve',
+            'Rezerwy': 'reserves_alt',
+            'TGA': 'tga',
+            'RRP': 'reverse_repo',
+            'M2': 'm2',
+            'NFCI': 'nfci'
+        }
+
+        # Percentyle kolejno - posortowana historia z cache, więc każdy to wyszukiwanie binarne
+        rows = [r for r in map(_compute_one_percentile, key_indicators_for_percentile.items()) if r]
+
+        # Wyniki kolumnami w tablicach o znanym rozmiarze (wypełniane po indeksie)
+        n_rows = len(rows)
+        has_percentile_data = n_rows > 0
+        percentile_results = {col: np.empty(n_rows, dtype=object) for col in PERCENTILE_COLUMNS}
+        percentile_results['Percentyl_num'] = np.empty(n_rows, dtype=np.float32)
+        for i, row in enumerate(rows):
+            for col, value in zip(PERCENTILE_COLUMNS, row):
+                percentile_results[col][i] = value
+
+        if has_percentile_data:
+            # Wyświetl w tabeli
+            st.markdown("#### 📈 Percentyle Kluczowych Wskaźników")
+
+            # Stwórz DataFrame (kolumnowo, bez kopiowania tablic)
+            perc_df = pd.DataFrame(percentile_results, copy=False)
+
+            # Wyświetl tabelę (bez kolumn pomocniczych)
+            display_df = perc_df[['Wskaźnik', 'Obecna Wartość', 'Percentyl', 'Status']]
+            st.dataframe(
+                display_df,
+                use_container_width=True,
+                hide_index=True,
+                height=350
+            )
 
-            # Pobierz obecną wartość
-            current_val = ind_data.get('current')
+            # Wyjaśnienie każdego wskaźnika
+            with st.expander("🔍 Co oznaczają te percentyle? (kliknij aby rozwinąć)"):
+                for _, row in perc_df.iterrows():
+                    st.markdown(f"**{row['Emoji']} {row['Wskaźnik']}:** {row['Full_Text']}")
+                    st.markdown("")
 
-            # Pobierz dane historyczne
-            historical_data = ind_data['data']['value']
+            # Wizualizacja percentyli (horizontal bars)
+            st.markdown("#### 📊 Wizualizacja Percentyli")
 
-            if current_val is not None and not historical_data.empty:
-                # Oblicz percentyl
-                percentile = calculate_percentile(current_val, historical_data)
+            # Stwórz wykres percentyli
+            # Przygotuj dane (tablice NumPy - Plotly serializuje je bez walidacji element po elemencie)
+            names_np = percentile_results['Wskaźnik']
+            percs_np = percentile_results['Percentyl_num']
 
-                # Interpretacja
-                text, emoji, color = interpret_percentile(indicator_key, percentile)
-
-                percentile_results.append({
-                    'Wskaźnik': display_name,
-                    'Obecna Wartość': f"{current_val:.2f}" if current_val else "N/A",
-                    'Percentyl': f"{percentile:.0f}%",
-                    'Status': f"{emoji} {text.split(' - ')[0]}",  # Tylko pierwsza część
-                    'Emoji': emoji,
-                    'Color': color,
-                    'Full_Text': text
-                })
-                has_percentile_data = True
-
-    if has_percentile_data and percentile_results:
-        # Wyświetl w tabeli
-        st.markdown("#### 📈 Percentyle Kluczowych Wskaźników")
-
-        # Stwórz DataFrame
-        perc_df = pd.DataFrame(percentile_results)
-
-        # Wyświetl tabelę (bez kolumn pomocniczych)
-        display_df = perc_df[['Wskaźnik', 'Obecna Wartość', 'Percentyl', 'Status']]
-        st.dataframe(
-            display_df,
-            use_container_width=True,
-            hide_index=True,
-            height=350
-        )
+            # Przypisz kolory bazując na percentylu (side='right' → próg 20/40/60/80 idzie wyżej)
+            colors_np = COLOR_TABLE[np.searchsorted(COLOR_BINS, percs_np, side='right')]
 
-        # Wyjaśnienie każdego wskaźnika
-        with st.expander("🔍 Co oznaczają te percentyle? (kliknij aby rozwinąć)"):
-            for _, row in perc_df.iterrows():
-                st.markdown(f"**{row['Emoji']} {row['Wskaźnik']}:** {row['Full_Text']}")
-                st.markdown("")
-
-        # Wizualizacja percentyli (horizontal bars)
-        st.markdown("#### 📊 Wizualizacja Percentyli")
-
-        # Stwórz wykres percentyli
-        import plotly.graph_objects as go
-
-        # Przygotuj dane
-        indicators_list = [r['Wskaźnik'] for r in percentile_results]
-        percentiles_list = [float(r['Percentyl'].replace('%', '')) for r in percentile_results]
-        colors_list = []
-
-        # Przypisz kolory bazując na percentylu i typie wskaźnika
-        for r in percentile_results:
-            perc = float(r['Percentyl'].replace('%', ''))
-            # Gradient kolorów
-            if perc >= 80:
-                color = 'rgba(255, 7, 58, 0.8)'  # Red
-            elif perc >= 60:
-                color = 'rgba(255, 237, 78, 0.8)'  # Yellow
-            elif perc >= 40:
-                color = 'rgba(0, 245, 255, 0.8)'  # Cyan
-            elif perc >= 20:
-                color = 'rgba(255, 237, 78, 0.8)'  # Yellow
-            else:
-                color = 'rgba(57, 255, 20, 0.8)'  # Green
+            fig_percentile = go.Figure()
 
-            colors_list.append(color)
+            fig_percentile.add_trace(go.Bar(
+                y=names_np,
+                x=percs_np,
+                orientation='h',
+                marker=dict(
+                    color=colors_np,
+                    line=dict(color='rgba(0, 245, 255, 0.3)', width=1)
+                ),
+                text=[f"{p:.0f}%" for p in percs_np],
+                textposition='outside',
+                textfont=dict(family='Share Tech Mono', size=12)
+            ))
+
+            # Dodaj pionowe linie dla quartile'i
+            fig_percentile.add_vline(x=25, line_dash="dash", line_color="rgba(255, 255, 255, 0.3)",
+                                    annotation_text="Q1", annotation_position="top")
+            fig_percentile.add_vline(x=50, line_dash="dash", line_color="rgba(255, 255, 255, 0.5)",
+                                    annotation_text="Mediana", annotation_position="top")
+            fig_percentile.add_vline(x=75, line_dash="dash", line_color="rgba(255, 255, 255, 0.3)",
+                                    annotation_text="Q3", annotation_position="top")
+
+            fig_percentile.update_layout(
+                **_PERCENTILE_THEME,
+                title="Percentyle Wskaźników (0-100%)",
+                xaxis=dict(
+                    title="Percentyl (%)",
+                    range=[0, 100],
+                    gridcolor='rgba(0, 245, 255, 0.1)',
+                    zerolinecolor='rgba(0, 245, 255, 0.2)'
+                ),
+                yaxis_title="",
+                height=400,
+                margin=dict(l=150, r=40, t=60, b=40)
+            )
 
-        fig_percentile = go.Figure()
+            st.plotly_chart(fig_percentile, use_container_width=True)
 
-        fig_percentile.add_trace(go.Bar(
-            y=indicators_list,
-            x=percentiles_list,
-            orientation='h',
-            marker=dict(
-                color=colors_list,
-                line=dict(color='rgba(0, 245, 255, 0.3)', width=1)
-            ),
-            text=[f"{p:.0f}%" for p in percentiles_list],
-            textposition='outside',
-            textfont=dict(family='Share Tech Mono', size=12)
-        ))
-
-        # Dodaj pionowe linie dla quartile'i
-        fig_percentile.add_vline(x=25, line_dash="dash", line_color="rgba(255, 255, 255, 0.3)",
-                                annotation_text="Q1", annotation_position="top")
-        fig_percentile.add_vline(x=50, line_dash="dash", line_color="rgba(255, 255, 255, 0.5)",
-                                annotation_text="Mediana", annotation_position="top")
-        fig_percentile.add_vline(x=75, line_dash="dash", line_color="rgba(255, 255, 255, 0.3)",
-                                annotation_text="Q3", annotation_position="top")
-
-        from components.cyberpunk_theme import apply_chart_theme
-        theme_config = apply_chart_theme()
-        theme_config.pop('title', None)
-        theme_config.pop('xaxis', None)  # Remove xaxis to avoid conflict
-
-        fig_percentile.update_layout(
-            **theme_config,
-            title="Percentyle Wskaźników (0-100%)",
-            xaxis=dict(
-                title="Percentyl (%)",
-                range=[0, 100],
-                gridcolor='rgba(0, 245, 255, 0.1)',
-                zerolinecolor='rgba(0, 245, 255, 0.2)'
-            ),
-            yaxis_title="",
-            height=400,
-            margin=dict(l=150, r=40, t=60, b=40)
-        )
+            # Edukacyjne wyjaśnienie
+            with st.expander("🎓 Jak czytać percentyle? (MUST READ!)"):
+                st.markdown("""
+                ## 📊 Co to jest percentyl?
 
-        st.plotly_chart(fig_percentile, use_container_width=True)
+                **Percentyl** pokazuje gdzie obecna wartość jest względem całej historii.
 
-        # Edukacyjne wyjaśnienie
-        with st.expander("🎓 Jak czytać percentyle? (MUST READ!)"):
-            st.markdown("""
-            ## 📊 Co to jest percentyl?
+                ### 🎯 Przykład (VIX):
 
-            **Percentyl** pokazuje gdzie obecna wartość jest względem całej historii.
+                Wyobraź sobie że masz 100 historycznych wartości VIX posortowanych rosnąco:
+                ```
+                VIX history: [10, 12, 14, 15, 16, 18, 20, 22, 25, 30, 35, 40, ...]
+                ```
 
-            ### 🎯 Przykład (VIX):
+                **Jeśli obecny VIX = 18:**
+                - Jest większy niż ~50% historycznych wartości
+                - **Percentyl = 50%** (mediana)
+                - Interpretacja: "Typowa wartość, nic nadzwyczajnego"
 
-            Wyobraź sobie że masz 100 historycznych wartości VIX posortowanych rosnąco:
-            ```
-            VIX history: [10, 12, 14, 15, 16, 18, 20, 22, 25, 30, 35, 40, ...]
-            ```
+                **Jeśli obecny VIX = 35:**
+                - Jest większy niż ~85% historycznych wartości
+                - **Percentyl = 85%** (górne 15%)
+                - Interpretacja: "Bardzo wysoko - panika na rynku!"
 
-            **Jeśli obecny VIX = 18:**
-            - Jest większy niż ~50% historycznych wartości
-            - **Percentyl = 50%** (mediana)
-            - Interpretacja: "Typowa wartość, nic nadzwyczajnego"
+                ### 📏 Skala Percentyli:
 
-            **Jeśli obecny VIX = 35:**
-            - Jest większy niż ~85% historycznych wartości
-            - **Percentyl = 85%** (górne 15%)
-            - Interpretacja: "Bardzo wysoko - panika na rynku!"
+                - **95-100%:** 🔴 Ekstremalnie wysoko (top 5% historii)
+                - **75-95%:** 🟠 Bardzo wysoko (górny kwartyl)
+                - **55-75%:** 🟡 Wysoko (powyżej mediany)
+                - **45-55%:** ⚪ Mediana (typowo)
+                - **25-45%:** 🟡 Nisko (poniżej mediany)
+                - **5-25%:** 🟢 Bardzo nisko (dolny kwartyl)
+                - **0-5%:** 🟢 Ekstremalnie nisko (bottom 5%)
 
-            ### 📏 Skala Percentyli:
+                ### 🎨 Kolory w wykresie:
 
-            - **95-100%:** 🔴 Ekstremalnie wysoko (top 5% historii)
-            - **75-95%:** 🟠 Bardzo wysoko (górny kwartyl)
-            - **55-75%:** 🟡 Wysoko (powyżej mediany)
-            - **45-55%:** ⚪ Mediana (typowo)
-            - **25-45%:** 🟡 Nisko (poniżej mediany)
-            - **5-25%:** 🟢 Bardzo nisko (dolny kwartyl)
-            - **0-5%:** 🟢 Ekstremalnie nisko (bottom 5%)
+                **Zależy od wskaźnika!**
 
-            ### 🎨 Kolory w wykresie:
+                **Dla VIX/Spread (niżej = lepiej):**
+                - 🟢 Zielony (0-20%): Super! Nisko = spokój na rynku
+                - 🟡 Żółty (20-80%): Normalnie
+                - 🔴 Czerwony (80-100%): Źle! Wysoko = panika
 
-            **Zależy od wskaźnika!**
+                **Dla Rezerw/M2 (wyżej = lepiej):**
+                - 🔴 Czerwony (0-20%): Źle! Nisko = brak płynności
+                - 🟡 Żółty (20-80%): Normalnie
+                - 🟢 Zielony (80-100%): Super! Wysoko = dużo płynności
 
-            **Dla VIX/Spread (niżej = lepiej):**
-            - 🟢 Zielony (0-20%): Super! Nisko = spokój na rynku
-            - 🟡 Żółty (20-80%): Normalnie
-            - 🔴 Czerwony (80-100%): Źle! Wysoko = panika
+                ### 💡 Jak to używać?
 
-            **Dla Rezerw/M2 (wyżej = lepiej):**
-            - 🔴 Czerwony (0-20%): Źle! Nisko = brak płynności
-            - 🟡 Żółty (20-80%): Normalnie
-            - 🟢 Zielony (80-100%): Super! Wysoko = dużo płynności
+                **Trading signals:**
 
-            ### 💡 Jak to używać?
+                1. **VIX na 90th percentile?**
+                   → Ekstremalny strach → Czas kupować (contrarian)
 
-            **Trading signals:**
+                2. **SOFR-IORB spread na 5th percentile?**
+                   → Repo market spokojny → Risk-on environment → Bullish
 
-            1. **VIX na 90th percentile?**
-               → Ekstremalny strach → Czas kupować (contrarian)
+                3. **Rezerwy na 20th percentile?**
+                   → Mało kasy w systemie → Fed może zacząć QE → Watch closely
 
-            2. **SOFR-IORB spread na 5th percentile?**
-               → Repo market spokojny → Risk-on environment → Bullish
+                4. **M2 na 95th percentile?**
+                   → Dużo pieniędzy → Inflacja blisko → Fed może podnieść stopy
 
-            3. **Rezerwy na 20th percentile?**
-               → Mało kasy w systemie → Fed może zacząć QE → Watch closely
+                ### 🧠 Pro Tip:
 
-            4. **M2 na 95th percentile?**
-               → Dużo pieniędzy → Inflacja blisko → Fed może podnieść stopy
+                **Mean reversion strategy:**
+                - Wskaźniki przy 90%+ percentile → prawdopodobnie wrócą w dół
+                - Wskaźniki przy 10%- percentile → prawdopodobnie wrócą w górę
 
-            ### 🧠 Pro Tip:
+                Ale **UWAGA:** Ekstremalne percentyle mogą trwać długo!
+                (Np. VIX był >80th percentile przez 6 miesięcy podczas COVID)
 
-            **Mean reversion strategy:**
-            - Wskaźniki przy 90%+ percentile → prawdopodobnie wrócą w dół
-            - Wskaźniki przy 10%- percentile → prawdopodobnie wrócą w górę
+                ### 📚 Kombinacje do śledzenia:
 
-            Ale **UWAGA:** Ekstremalne percentyle mogą trwać długo!
-            (Np. VIX był >80th percentile przez 6 miesięcy podczas COVID)
+                **Bullish setup:**
+                - VIX < 30th percentile (spokój)
+                - Rezerwy > 70th percentile (dużo kasy)
+                - SOFR spread < 20th percentile (repo działa)
+                → **= GREEN LIGHT dla akcji/crypto! 🚀**
 
-            ### 📚 Kombinacje do śledzenia:
+                **Bearish setup:**
+                - VIX > 70th percentile (strach)
+                - Rezerwy < 30th percentile (mało kasy)
+                - SOFR spread > 80th percentile (repo stress)
+                → **= RED LIGHT - ostrożność! 🛑**
+                """)
 
-            **Bullish setup:**
-            - VIX < 30th percentile (spokój)
-            - Rezerwy > 70th percentile (dużo kasy)
-            - SOFR spread < 20th percentile (repo działa)
-            → **= GREEN LIGHT dla akcji/crypto! 🚀**
+        else:
+            st.info("Brak danych historycznych do obliczenia percentyli. Potrzebne minimum 30 dni historii.")
 
-            **Bearish setup:**
-            - VIX > 70th percentile (strach)
-            - Rezerwy < 30th percentile (mało kasy)
-            - SOFR spread > 80th percentile (repo stress)
-            → **= RED LIGHT - ostrożność! 🛑**
-            """)
+    except Exception as e:
+        st.error(f"Błąd analizy percentylowej: {type(e).__name__}: {e}")
+        # Pełny traceback tylko w trybie debug (st.session_state['debug'] = True)
+        if st.session_state.get('debug'):
+            st.code(traceback.format_exc())
 
-    else:
-        st.info("Brak danych historycznych do obliczenia percentyli. Potrzebne minimum 30 dni historii.")
 
-except Exception as e:
-    st.error(f"Błąd analizy percentylowej: {e}")
-    import traceback
-    st.code(traceback.format_exc())
+render_percentile_analysis()
 
 st.markdown("---")
 
@@ -1756,11 +1727,88 @@ st.markdown("---")
 # LIQUIDITY CHARTS (Time Series)
 # ============================================
 
+@st.fragment
+def render_single_indicator_tab():
+    """Zakładka pojedynczego wskaźnika - zmiana selectboxa przeładowuje tylko ten fragment"""
+    st.markdown("#### Wybierz wskaźnik do szczegółowej analizy")
+
+    chart_indicator = st.selectbox(
+        "Wskaźnik:",
+        options=[
+            'Rezerwy Banków',
+            'TGA (Treasury)',
+            'Reverse Repo',
+            'Bilans Fed'
+        ],
+        key='chart_selector'
+    )
+
+    # Map wyboru do klucza w indicators
+    indicator_map = {
+        'Rezerwy Banków': 'reserves_alt',
+        'TGA (Treasury)': 'tga',
+        'Reverse Repo': 'reverse_repo',
+        'Bilans Fed': 'fed_balance'
+    }
+
+    selected_key = indicator_map[chart_indicator]
+
+    if selected_key in indicator_frames:
+        # Stwórz pojedynczy wykres
+        # Tylko kolumny potrzebne do wykresu (mniej do hashowania i serializacji)
+        chart_data = indicator_frames[selected_key][['date', 'value']]
+        value_arr = chart_data['value'].to_numpy(dtype=np.float64)
+
+        single_fig = cached_time_series(
+            chart_data,
+            'date',
+            'value',
+            f"{chart_indicator} - Ostatnie 90 dni"
+        )
+        st.plotly_chart(single_fig, use_container_width=True)
+
+        # Statystyki - jedna redukcja zamiast czterech wywołań pandas
+        values = value_arr[~np.isnan(value_arr)]
+        if values.size:
+            v_min, v_max, v_mean, volatility = quad_stats(values)
+
+            scol1, scol2, scol3, scol4 = st.columns(4)
+
+            with scol1:
+                st.metric("Minimum", f"${v_min:.0f}B")
+            with scol2:
+                st.metric("Maksimum", f"${v_max:.0f}B")
+            with scol3:
+                st.metric("Średnia", f"${v_mean:.0f}B")
+            with scol4:
+                st.metric("Zmienność (σ)", f"${volatility:.0f}B")
+    else:
+        st.warning(f"Brak danych dla {chart_indicator}")
+
+
+@st.cache_data(ttl=3600, show_spinner=False)
+def _liquidity_panel(fingerprint, _frames):
+    """
+    DataFrame 'date' + kolumna na każdy wskaźnik z INDICATOR_SPECS.
+
+    Klucz cache to tylko fingerprint - '_frames' (z podkreślnikiem) nie jest hashowane.
+    """
+    # Jedna seria na wskaźnik (indeks = date), potem jeden concat zamiast kolejnych merge
+    series = [
+        _frames[key].set_index('date')[column].rename(label)
+        for key, label, column in INDICATOR_SPECS
+        if key in _frames and column in _frames[key]
+    ]
+    # Wspólna dzienna oś od pierwszej daty rezerw - bez dziur NaN między raportami
+    panel = _align_daily(series)
+    return panel[panel.index >= series[0].index.min()].reset_index()
+
+
 st.markdown("### 📊 Wykresy Płynności (Historia)")
 
 try:
     # Sprawdź czy mamy dane historyczne
-    if 'reserves_alt' in indicators and 'data' in indicators['reserves_alt']:
+    if 'reserves_alt' in indicator_frames:
 
         # Tab z różnymi wykresami
         chart_tab1, chart_tab2 = st.tabs(["📈 Wszystkie Razem", "🔍 Pojedyncze Wskaźniki"])
@@ -1771,40 +1819,21 @@ try:
             # Przygotuj dane dla multi-line chart
             # Musimy stworzyć DataFrame z wszystkimi 4 wskaźnikami
             try:
-                base_df = indicators['reserves_alt']['data'][['date']].copy()
-
-                # Dodaj każdy wskaźnik jako kolumnę
-                if 'reserves_alt' in indicators and 'data' in indicators['reserves_alt']:
-                    reserves_data = indicators['reserves_alt']['data'][['date', 'value']].copy()
-                    reserves_data = reserves_data.rename(columns={'value': 'Reserves ($B)'})
-                    base_df = base_df.merge(reserves_data, on='date', how='left')
-
-                if 'tga' in indicators and 'data' in indicators['tga']:
-                    tga_data = indicators['tga']['data'][['date', 'value']].copy()
-                    tga_data = tga_data.rename(columns={'value': 'TGA ($B)'})
-                    base_df = base_df.merge(tga_data, on='date', how='left')
-
-                if 'reverse_repo' in indicators and 'data' in indicators['reverse_repo']:
-                    rrp_data = indicators['reverse_repo']['data'][['date', 'value']].copy()
-                    rrp_data = rrp_data.rename(columns={'value': 'RRP ($B)'})
-                    base_df = base_df.merge(rrp_data, on='date', how='left')
-
-                if 'fed_balance' in indicators and 'data' in indicators['fed_balance']:
-                    fed_data = indicators['fed_balance']['data'][['date', 'value']].copy()
-                    # Fed balance jest w miliardach, więc podziel przez 1000 dla trylionów
-                    fed_data['value'] = fed_data['value'] / 1000
-                    fed_data = fed_data.rename(columns={'value': 'Fed Balance ($T)'})
-                    base_df = base_df.merge(fed_data, on='date', how='left')
+                # Panel 4 wskaźników z cache - przeliczany tylko gdy zmienią się dane
+                base_df = _liquidity_panel(
+                    _indicators_fingerprint(indicators, tuple(key for key, _, _ in INDICATOR_SPECS)),
+                    indicator_frames
+                )
 
                 # Stwórz wykres
                 y_columns = [col for col in base_df.columns if col != 'date']
 
                 if y_columns:
-                    multi_fig = create_multi_line_chart(
-                        data=base_df,
-                        x_column='date',
-                        y_columns=y_columns,
-                        title="Wskaźniki Płynności - Historia 90 dni"
+                    multi_fig = cached_multi_line(
+                        base_df,
+                        'date',
+                        tuple(y_columns),
+                        "Wskaźniki Płynności - Historia 90 dni"
                     )
                     st.plotly_chart(multi_fig, use_container_width=True)
 
@@ -1822,55 +1851,7 @@ try:
                 st.error(f"Błąd tworzenia multi-line chart: {e}")
 
         with chart_tab2:
-            st.markdown("#### Wybierz wskaźnik do szczegółowej analizy")
-
-            chart_indicator = st.selectbox(
-                "Wskaźnik:",
-                options=[
-                    'Rezerwy Banków',
-                    'TGA (Treasury)',
-                    'Reverse Repo',
-                    'Bilans Fed'
-                ],
-                key='chart_selector'
-            )
-
-            # Map wyboru do klucza w indicators
-            indicator_map = {
-                'Rezerwy Banków': 'reserves_alt',
-                'TGA (Treasury)': 'tga',
-                'Reverse Repo': 'reverse_repo',
-                'Bilans Fed': 'fed_balance'
-            }
-
-            selected_key = indicator_map[chart_indicator]
-
-            if selected_key in indicators and 'data' in indicators[selected_key]:
-                # Stwórz pojedynczy wykres
-                chart_data = indicators[selected_key]['data']
-
-                single_fig = create_time_series(
-                    data=chart_data,
-                    x_column='date',
-                    y_column='value',
-                    title=f"{chart_indicator} - Ostatnie 90 dni"
-                )
-                st.plotly_chart(single_fig, use_container_width=True)
-
-                # Statystyki
-                scol1, scol2, scol3, scol4 = st.columns(4)
-
-                with scol1:
-                    st.metric("Minimum", f"${chart_data['value'].min():.0f}B")
-                with scol2:
-                    st.metric("Maksimum", f"${chart_data['value'].max():.0f}B")
-                with scol3:
-                    st.metric("Średnia", f"${chart_data['value'].mean():.0f}B")
-                with scol4:
-                    volatility = chart_data['value'].std()
-                    st.metric("Zmienność (σ)", f"${volatility:.0f}B")
-            else:
-                st.warning(f"Brak danych dla {chart_indicator}")
+            render_single_indicator_tab()
 
     else:
         st.info("Dane historyczne nie są dostępne dla wykresów")
@@ -1996,6 +1977,20 @@ with tab3:
 # SIDEBAR - Glossary Quick Reference
 # ============================================
 
+# Najważniejsze terminy w sidebarze: (term, full_name, short, long, emoji) - liczone raz przy imporcie
+TOP_TERM_EXPLANATIONS = tuple(
+    (term, *_EXPLANATIONS[term]) for term in ('VIX', 'SOFR', 'YIELD_CURVE', 'M2', 'NFCI')
+)
+
+
+def render_sidebar_glossary(entries):
+    """Słownik w sidebarze - expandery z gotowej listy haseł"""
+    for term, full_name, short, _, emoji in entries:
+        with st.expander(f"{emoji} {term}"):
+            st.caption(full_name)
+            st.write(short)
+
+
 with st.sidebar:
     st.markdown("## 📊 Makro Analysis")
     st.markdown("---")
@@ -2003,13 +1998,7 @@ with st.sidebar:
     st.markdown("### 📚 Szybki Słownik")
 
     # Top 5 najważniejszych terminów
-    top_terms = ['VIX', 'SOFR', 'YIELD_CURVE', 'M2', 'NFCI']
-
-    for term in top_terms:
-        full_name, short, _, emoji = get_explanation(term)
-        with st.expander(f"{emoji} {term}"):
-            st.caption(full_name)
-            st.write(short)
+    render_sidebar_glossary(TOP_TERM_EXPLANATIONS)
 
     st.markdown("---")
 
@@ -2037,479 +2026,634 @@ with st.sidebar:
 # COMPARISON TOOL - OVERLAY CHARTS
 # ============================================
 
-st.markdown("### 📊 Narzędzie Porównań - Overlay Charts")
-st.caption("💡 Porównaj różne wskaźniki makroekonomiczne na jednym wykresie")
-
-# Available indicators for comparison
-available_indicators = {
-    # Płynność i VIX
-    'vix': 'VIX (Volatility Index)',
-    'sofr_iorb_spread': 'SOFR-IORB Spread',
-    'repo_rate': 'Repo Rate',
-    'reverse_repo': 'Reverse Repo',
-
-    # Obligacje
-    'treasury_10y': '10Y Treasury Yield',
-    'treasury_2y': '2Y Treasury Yield',
-    'hy_spread': 'High Yield Spread',
-
-    # Inflacja
-    'cpi': 'CPI (Consumer Price Index)',
-    'cpi_core': 'Core CPI',
-    'pce': 'PCE (Personal Consumption)',
-    'pce_core': 'Core PCE',
-    'inflation_5y': '5Y Breakeven Inflation',
-
-    # Stopy procentowe
-    'fed_funds': 'Fed Funds Rate',
-
-    # Wzrost gospodarczy
-    'gdp_real': 'Real GDP Growth',
-    # 'ism_manufacturing': 'ISM Manufacturing',  # DISCONTINUED - removed from FRED 2016
-    # 'ism_services': 'ISM Services',            # DISCONTINUED - removed from FRED 2016
-
-    # Inne
-    'unemployment': 'Unemployment Rate',
-}
+# Limit punktów na trace linii w porównaniach (dłuższe serie → LTTB + WebGL)
+CHART_MAX_POINTS = 1000
 
-# User selection
-col_comp1, col_comp2 = st.columns([2, 1])
-
-with col_comp1:
-    selected_indicators = st.multiselect(
-        "📈 Wybierz wskaźniki do porównania (2-4)",
-        options=list(available_indicators.keys()),
-        format_func=lambda x: available_indicators[x],
-        default=['vix', 'fed_funds', 'cpi'],
-        max_selections=4,
-        help="Wybierz 2-4 wskaźniki które chcesz porównać na jednym wykresie"
-    )
 
-with col_comp2:
-    normalize_mode = st.selectbox(
-        "⚖️ Tryb normalizacji",
-        options=['raw', 'z-score', 'percent'],
-        format_func=lambda x: {
-            'raw': 'Oryginalne wartości',
-            'z-score': 'Z-score (standaryzacja)',
-            'percent': '% zmiana od początku'
-        }[x],
-        help="Jak wyświetlać dane?\n- Raw: Oryginalne wartości\n- Z-score: Standaryzacja (średnia=0, std=1)\n- Percent: % zmiana od pierwszego dnia"
-    )
+def _line_trace(x, y, **kwargs):
+    """
+    Trace linii dla wykresów porównań.
 
-if len(selected_indicators) < 2:
-    st.info("👆 Wybierz co najmniej 2 wskaźniki aby zobaczyć porównanie")
-elif len(selected_indicators) > 4:
-    st.warning("⚠️ Maksymalnie 4 wskaźniki na raz")
-else:
-    # Build comparison chart
-    import plotly.graph_objects as go
-    from plotly.subplots import make_subplots
-
-    fig = go.Figure()
-
-    # Track if we have any data
-    has_data = False
-
-    # Color palette
-    colors = ['#00f5ff', '#ff006e', '#39ff14', '#ffed4e', '#ff8c42']
-
-    for idx, indicator_key in enumerate(selected_indicators):
-        indicator_data = indicators.get(indicator_key, {})
-
-        if not indicator_data or not isinstance(indicator_data, dict):
-            continue
-
-        # Get time series data (use 'data' key which contains DataFrame with date+value)
-        history = indicator_data.get('data', pd.DataFrame())
-
-        # Check if history is valid
-        if history is None or (isinstance(history, pd.DataFrame) and history.empty):
-            continue
-
-        # Data is already DataFrame from liquidity_monitor
-        df = history if isinstance(history, pd.DataFrame) else pd.DataFrame(history)
-
-        if df.empty or 'date' not in df.columns or 'value' not in df.columns:
-            continue
-
-        df['date'] = pd.to_datetime(df['date'])
-        df = df.sort_values('date')
-
-        # Apply normalization
-        values = df['value'].values
-
-        if normalize_mode == 'z-score':
-            # Z-score normalization
-            mean_val = values.mean()
-            std_val = values.std()
-            if std_val > 0:
-                values = (values - mean_val) / std_val
-        elif normalize_mode == 'percent':
-            # Percent change from first value
-            first_val = values[0]
-            if first_val != 0:
-                values = ((values - first_val) / abs(first_val)) * 100
-
-        # Add trace
-        fig.add_trace(go.Scatter(
-            x=df['date'],
-            y=values,
-            name=available_indicators[indicator_key],
-            line=dict(color=colors[idx % len(colors)], width=2),
-            mode='lines',
-            hovertemplate='%{y:.2f}<extra></extra>'
-        ))
-
-        has_data = True
-
-    if has_data:
-        # Update layout
-        y_axis_title = {
-            'raw': 'Wartość',
-            'z-score': 'Z-score (standaryzacja)',
-            'percent': '% zmiana od początku'
-        }[normalize_mode]
-
-        fig.update_layout(
-            title=f"Porównanie wskaźników ({normalize_mode})",
-            xaxis_title="Data",
-            yaxis_title=y_axis_title,
-            hovermode='x unified',
-            template='plotly_dark',
-            height=500,
-            showlegend=True,
-            legend=dict(
-                orientation="h",
-                yanchor="bottom",
-                y=1.02,
-                xanchor="right",
-                x=1
-            ),
-            paper_bgcolor='rgba(10, 14, 39, 0.9)',
-            plot_bgcolor='rgba(26, 26, 46, 0.5)',
+    Serie dłuższe niż CHART_MAX_POINTS są przycinane LTTB (bez NaN). Scattergl (WebGL)
+    tylko gdy po przycięciu zostaje więcej niż SCATTERGL_MIN_POINTS punktów.
+    """
+    x = np.asarray(x)
+    y = np.asarray(y, dtype=np.float64)
+    if y.size > CHART_MAX_POINTS:
+        ok = ~np.isnan(y)
+        x, y = x[ok], y[ok]
+        keep = lttb_indices(
+            x.astype('datetime64[ns]').astype(np.int64).astype(np.float64), y, CHART_MAX_POINTS
         )
+        x, y = x[keep], y[keep]
+    trace_cls = go.Scattergl if y.size > SCATTERGL_MIN_POINTS else go.Scatter
+    return trace_cls(x=x, y=y, mode='lines', **kwargs)
+
+
+@st.fragment
+def render_comparison_tool():
+    """Overlay Charts - zmiana wskaźników/normalizacji przeładowuje tylko ten fragment"""
+    st.markdown("### 📊 Narzędzie Porównań - Overlay Charts")
+    st.caption("💡 Porównaj różne wskaźniki makroekonomiczne na jednym wykresie")
+
+    # Available indicators for comparison
+    available_indicators = {
+        # Płynność i VIX
+        'vix': 'VIX (Volatility Index)',
+        'sofr_iorb_spread': 'SOFR-IORB Spread',
+        'repo_rate': 'Repo Rate',
+        'reverse_repo': 'Reverse Repo',
+
+        # Obligacje
+        'treasury_10y': '10Y Treasury Yield',
+        'treasury_2y': '2Y Treasury Yield',
+        'hy_spread': 'High Yield Spread',
+
+        # Inflacja
+        'cpi': 'CPI (Consumer Price Index)',
+        'cpi_core': 'Core CPI',
+        'pce': 'PCE (Personal Consumption)',
+        'pce_core': 'Core PCE',
+        'inflation_5y': '5Y Breakeven Inflation',
+
+        # Stopy procentowe
+        'fed_funds': 'Fed Funds Rate',
+
+        # Wzrost gospodarczy
+        'gdp_real': 'Real GDP Growth',
+        # 'ism_manufacturing': 'ISM Manufacturing',  # DISCONTINUED - removed from FRED 2016
+        # 'ism_services': 'ISM Services',            # DISCONTINUED - removed from FRED 2016
+
+        # Inne
+        'unemployment': 'Unemployment Rate',
+    }
 
-        st.plotly_chart(fig, use_container_width=True)
+    # User selection
+    col_comp1, col_comp2 = st.columns([2, 1])
+
+    with col_comp1:
+        selected_indicators = st.multiselect(
+            "📈 Wybierz wskaźniki do porównania (2-4)",
+            options=list(available_indicators.keys()),
+            format_func=lambda x: available_indicators[x],
+            default=['vix', 'fed_funds', 'cpi'],
+            max_selections=4,
+            help="Wybierz 2-4 wskaźniki które chcesz porównać na jednym wykresie"
+        )
+
+    with col_comp2:
+        normalize_mode = st.selectbox(
+            "⚖️ Tryb normalizacji",
+            options=['raw', 'z-score', 'percent'],
+            format_func=lambda x: {
+                'raw': 'Oryginalne wartości',
+                'z-score': 'Z-score (standaryzacja)',
+                'percent': '% zmiana od początku'
+            }[x],
+            help="Jak wyświetlać dane?\n- Raw: Oryginalne wartości\n- Z-score: Standaryzacja (średnia=0, std=1)\n- Percent: % zmiana od pierwszego dnia"
+        )
 
-        # Interpretation tips
-        with st.expander("💡 Jak interpretować porównanie?"):
-            st.markdown(f"""
-            **Tryb: {normalize_mode.upper()}**
+    if len(selected_indicators) < 2:
+        st.info("👆 Wybierz co najmniej 2 wskaźniki aby zobaczyć porównanie")
+    elif len(selected_indicators) > 4:
+        st.warning("⚠️ Maksymalnie 4 wskaźniki na raz")
+    else:
+        # Build comparison chart
+        fig = go.Figure()
+
+        # Color palette
+        colors = ['#00f5ff', '#ff006e', '#39ff14', '#ffed4e', '#ff8c42']
+
+        # Wybrane serie (DataFrame z 'date' + 'value') na wspólnej osi dat (unia)
+        series = [
+            indicator_frames[key].set_index('date')['value'].rename(key)
+            for key in selected_indicators
+            if key in indicator_frames and not indicator_frames[key].empty
+            and {'date', 'value'}.issubset(indicator_frames[key].columns)
+        ]
+
+        # Track if we have any data
+        has_data = bool(series)
+
+        if has_data:
+            panel = pd.concat(series, axis=1).sort_index()
+            dates = panel.index
+            arr = panel.to_numpy(dtype=np.float64)
+
+            # Normalizacja wszystkich kolumn naraz (NaN = brak obserwacji danej serii w tej dacie)
+            if normalize_mode != 'raw':
+                # Mean/std/pierwsza wartość każdej serii jednym przejściem (Welford)
+                col_stats = column_stats(arr)
+            if normalize_mode == 'z-score':
+                # Z-score normalization (kolumny ze std = 0 bez zmian)
+                mu = col_stats[:, 0]
+                sd = col_stats[:, 1]
+                arr = np.where(sd > 0, (arr - mu) / np.where(sd > 0, sd, 1), arr)
+            elif normalize_mode == 'percent':
+                # Percent change from first value (pierwsza obserwacja każdej serii)
+                first = col_stats[:, 2]
+                arr = np.where(first != 0, (arr - first) / np.abs(np.where(first != 0, first, 1)) * 100, arr)
+
+            # Trace'y zbierane w listę i dodawane jednym add_traces
+            traces = []
+            for col_idx, indicator_key in enumerate(panel.columns):
+                values = arr[:, col_idx]
+                ok = ~np.isnan(values)
+                color = colors[selected_indicators.index(indicator_key) % len(colors)]
+
+                traces.append(_line_trace(
+                    dates[ok],
+                    values[ok],
+                    name=available_indicators[indicator_key],
+                    line=dict(color=color, width=2),
+                    hovertemplate='%{y:.2f}<extra></extra>'
+                ))
+            fig.add_traces(traces)
+
+        if has_data:
+            # Update layout
+            y_axis_title = {
+                'raw': 'Wartość',
+                'z-score': 'Z-score (standaryzacja)',
+                'percent': '% zmiana od początku'
+            }[normalize_mode]
+
+            fig.update_layout(
+                title=f"Porównanie wskaźników ({normalize_mode})",
+                xaxis_title="Data",
+                yaxis_title=y_axis_title,
+                hovermode='x unified',
+                uirevision=normalize_mode,  # zoom zostaje przy zmianie wskaźników, reset przy zmianie skali
+                template='plotly_dark',
+                height=500,
+                showlegend=True,
+                legend=dict(
+                    orientation="h",
+                    yanchor="bottom",
+                    y=1.02,
+                    xanchor="right",
+                    x=1
+                ),
+                paper_bgcolor='rgba(10, 14, 39, 0.9)',
+                plot_bgcolor='rgba(26, 26, 46, 0.5)',
+            )
 
-            {'**Oryginalne wartości** - Każdy wskaźnik ma swoją skalę' if normalize_mode == 'raw' else ''}
-            {'**Z-score** - Wszystkie wskaźniki są znormalizowane do średniej=0, odchylenie standardowe=1' if normalize_mode == 'z-score' else ''}
-            {'**% zmiana** - Pokazuje procentową zmianę względem pierwszego dnia w historii' if normalize_mode == 'percent' else ''}
+            st.plotly_chart(fig, use_container_width=True)
+
+            # Interpretation tips
+            with st.expander("💡 Jak interpretować porównanie?"):
+                st.markdown(f"""
+                **Tryb: {normalize_mode.upper()}**
+
+                {'**Oryginalne wartości** - Każdy wskaźnik ma swoją skalę' if normalize_mode == 'raw' else ''}
+                {'**Z-score** - Wszystkie wskaźniki są znormalizowane do średniej=0, odchylenie standardowe=1' if normalize_mode == 'z-score' else ''}
+                {'**% zmiana** - Pokazuje procentową zmianę względem pierwszego dnia w historii' if normalize_mode == 'percent' else ''}
+
+                🔍 **Co szukać:**
+                - **Korelacja dodatnia** - wskaźniki rosną i spadają razem
+                - **Korelacja ujemna** - jeden rośnie gdy drugi spada
+                - **Leading indicators** - jeden zmienia się przed drugim (np. VIX przed spadkiem akcji)
+                - **Divergence** - wskaźniki rozjeżdżają się (może zapowiadać zmianę trendu)
+
+                💡 **Przykłady:**
+                - **VIX vs Fed Funds** - Wysokie VIX → Fed obniża stopy (ratowanie rynku)
+                - **CPI vs Fed Funds** - Wysoka inflacja → Fed podnosi stopy
+                - **10Y vs 2Y Treasury** - Gdy 2Y > 10Y (inwersja) → recesja blisko
+                - **ISM vs GDP** - ISM jest leading indicator dla GDP
+                """)
+        else:
+            st.warning("⚠️ Brak danych historycznych dla wybranych wskaźników")
 
-            🔍 **Co szukać:**
-            - **Korelacja dodatnia** - wskaźniki rosną i spadają razem
-            - **Korelacja ujemna** - jeden rośnie gdy drugi spada
-            - **Leading indicators** - jeden zmienia się przed drugim (np. VIX przed spadkiem akcji)
-            - **Divergence** - wskaźniki rozjeżdżają się (może zapowiadać zmianę trendu)
+        st.markdown("---")
 
-            💡 **Przykłady:**
-            - **VIX vs Fed Funds** - Wysokie VIX → Fed obniża stopy (ratowanie rynku)
-            - **CPI vs Fed Funds** - Wysoka inflacja → Fed podnosi stopy
-            - **10Y vs 2Y Treasury** - Gdy 2Y > 10Y (inwersja) → recesja blisko
-            - **ISM vs GDP** - ISM jest leading indicator dla GDP
-            """)
-    else:
-        st.warning("⚠️ Brak danych historycznych dla wybranych wskaźników")
 
-    st.markdown("---")
+render_comparison_tool()
 
 
 # ============================================
 # LIQUIDITY-TO-ASSET MODEL
 # ============================================
 
-st.markdown("### 💰 Liquidity-to-Asset Model")
-st.caption("💡 Jak całkowita płynność Fed wpływa na ceny aktywów")
+def _is_rate_limit(error):
+    """Czy wyjątek z yfinance to rate limit Yahoo Finance"""
+    error_msg = str(error)
+    return "Too Many Requests" in error_msg or "Rate limit" in error_msg
+
+
+# Najdłuższy okres w selectboxie - jedna paczka obsługuje każdy wybór okresu
+ASSET_HISTORY_DAYS = 730
+
+
+def _close_columns(raw, tickers):
+    """Kolumny Close z ramki yf.download (group_by='ticker') - tylko tickery z jakimikolwiek danymi"""
+    if raw.empty:
+        return {}
+    if not isinstance(raw.columns, pd.MultiIndex):
+        # Starsze yfinance: przy jednym tickerze płaskie kolumny mimo group_by='ticker'
+        close = raw['Close']
+        return {tickers[0]: close} if len(tickers) == 1 and close.notna().any() else {}
+    fetched = raw.columns.get_level_values(0)
+    return {
+        ticker: raw[ticker]['Close']
+        for ticker in tickers
+        if ticker in fetched and raw[ticker]['Close'].notna().any()
+    }
 
-# Calculate total liquidity (reserves + reverse repo)
-reserves_val, _ = get_indicator_val('reserves_alt')
-rrp_val, _ = get_indicator_val('reverse_repo')
 
-if reserves_val and rrp_val:
-    total_liquidity = reserves_val + rrp_val
-    st.info(f"📊 **Total Liquidity**: ${total_liquidity:.0f}B (Reserves: ${reserves_val:.0f}B + RRP: ${rrp_val:.0f}B)")
-else:
-    st.warning("⚠️ Brak danych płynności")
-    total_liquidity = None
-
-# Asset selection
-available_assets = {
-    'BTC-USD': 'Bitcoin',
-    'ETH-USD': 'Ethereum',
-    'GC=F': 'Gold Futures',
-    'SI=F': 'Silver Futures',
-    'AAPL': 'Apple Inc.',
-    'GOOGL': 'Alphabet (Google)',
-    'NVDA': 'NVIDIA Corporation',
-    'AMD': 'Advanced Micro Devices',
-    'AMZN': 'Amazon.com Inc.',
-    'TSLA': 'Tesla Inc.',
+@st.cache_data(ttl=3600, show_spinner=False)
+def fetch_all_assets(tickers, days=ASSET_HISTORY_DAYS, max_retries=3):
+    """
+    Ceny zamknięcia wszystkich tickerów jednym yf.download (cache 1h na paczkę).
+
+    Zwraca DataFrame: indeks dat (bez strefy czasowej, rosnąco), kolumna na ticker.
+    yf.download nie rzuca wyjątku przy błędzie tickera (także rate limit) - zwraca
+    NaN/brak kolumny. Dlatego brakujące tickery są pobierane ponownie z exponential
+    backoff (2s, 4s). Tickery wciąż bez danych po ostatniej próbie nie mają kolumny
+    (fetch_yf_history pobiera je osobno), a paczka z pozostałymi trafia do cache -
+    bez ponawiania całego pobrania przy każdym przebiegu. Brak danych dla
+    wszystkich tickerów → LookupError (nie trafia do cache).
+    """
+    import yfinance as yf
+
+    closes = {}
+    missing = list(tickers)
+    for attempt in range(max_retries):
+        if attempt > 0:
+            time.sleep(2 ** attempt)  # Exponential backoff: 2s, 4s
+
+        try:
+            # Jeden request wsadowy na wszystkie (przy ponowieniu - tylko brakujące) aktywa
+            raw = yf.download(
+                missing,
+                period=f"{days}d",
+                group_by='ticker',
+                threads=True,
+                progress=False
+            )
+        except Exception as e:
+            if _is_rate_limit(e) and attempt < max_retries - 1:
+                continue  # Try again
+            raise
+
+        closes.update(_close_columns(raw, missing))
+        missing = [ticker for ticker in tickers if ticker not in closes]
+        if not missing:
+            break
+
+    if not closes:
+        raise LookupError(f"Brak danych dla {', '.join(tickers)}")
+
+    closes = pd.DataFrame(closes)
+    if closes.index.tz is not None:
+        closes.index = closes.index.tz_localize(None)
+    return closes.sort_index()
+
+
+@st.cache_data(ttl=3600, show_spinner=False)
+def fetch_one_asset(ticker, days=ASSET_HISTORY_DAYS, max_retries=3):
+    """
+    Ceny zamknięcia jednego tickera (cache 1h) - zapas, gdy paczka fetch_all_assets go nie ma.
+
+    Dzięki temu jeden niedostępny ticker nie blokuje pozostałych aktywów.
+    Brak danych po ostatniej próbie → LookupError (nie trafia do cache).
+    """
+    import yfinance as yf
+
+    for attempt in range(max_retries):
+        if attempt > 0:
+            time.sleep(2 ** attempt)  # Exponential backoff: 2s, 4s
+
+        try:
+            history = yf.Ticker(ticker).history(period=f"{days}d")
+        except Exception as e:
+            if _is_rate_limit(e) and attempt < max_retries - 1:
+                continue  # Try again
+            raise
+
+        if not history.empty and history['Close'].notna().any():
+            prices = history['Close']
+            if prices.index.tz is not None:
+                prices.index = prices.index.tz_localize(None)
+            return prices.sort_index()
+
+    raise LookupError(f"Brak danych dla {ticker}")
+
+
+def fetch_yf_history(ticker, days, tickers):
+    """
+    Historia ceny jednego aktywa wycięta z paczki fetch_all_assets.
+
+    Gdy paczka nie ma kolumny tego tickera (albo nie udała się wcale), aktywo
+    pobierane jest osobno przez fetch_one_asset. Zwraca DataFrame 'date' (rosnąco)
+    + 'price' (Close) z ostatnich `days` dni. Brak danych → LookupError.
+    """
+    try:
+        batch = fetch_all_assets(tickers)
+    except LookupError:
+        batch = None
+
+    if batch is not None and ticker in batch.columns:
+        prices = batch[ticker]
+    else:
+        prices = fetch_one_asset(ticker)
+
+    # Krypto notuje 7 dni w tygodniu, akcje nie - NaN z unii dat wypada per ticker
+    prices = prices.dropna()
+    prices = prices[prices.index >= pd.Timestamp.now().normalize() - pd.Timedelta(days=days)]
+    if prices.empty:
+        raise LookupError(f"Brak danych dla {ticker}")
+
+    return pd.DataFrame({
+        'date': prices.index,
+        'price': prices.to_numpy()
+    })
+
+
+# Interpretacja korelacji aktywo vs płynność: >0.6 high, 0.3-0.6 mid, <0.3 low
+CORRELATION_TEXTS = {
+    'high': '**Silna korelacja!** Gdy Fed zwiększa płynność (QE, obniżki RRP), cena rośnie. Gdy zmniejsza (QT), cena spada.',
+    'mid': '**Średnia korelacja.** Płynność ma wpływ, ale inne czynniki też ważne (sentiment, fundamenty).',
+    'low': '**Słaba korelacja.** To aktywo reaguje bardziej na inne czynniki niż na płynność Fed.',
 }
 
-col_asset1, col_asset2 = st.columns([2, 1])
+# Sygnał tradingowy (tylko gdy korelacja > 0.5) - jedna linia, bo wstawiany w wcięty markdown
+TRADING_SIGNAL_TEXT = (
+    'Jeśli płynność rośnie → rozważ pozycję LONG '
+    'Jeśli płynność spada → rozważ pozycję SHORT lub redukcję ekspozycji'
+)
 
-with col_asset1:
-    selected_asset = st.selectbox(
-        "📈 Wybierz aktywo do analizy",
-        options=list(available_assets.keys()),
-        format_func=lambda x: available_assets[x],
-        index=0,  # Default: BTC
-        help="Wybierz aktywo aby zobaczyć korelację z płynnością Fed"
-    )
 
-with col_asset2:
-    lookback_days = st.selectbox(
-        "📅 Okres analizy",
-        options=[90, 180, 365, 730],
-        index=3,  # Default: 730 days (2 years)
-        format_func=lambda x: f"{x} dni (~{x//30} mies.)",
-        help="Jak daleko wstecz analizować korelację"
+@st.cache_data(ttl=3600, show_spinner=False)
+def _total_liquidity_series(fingerprint, _reserves, _rrp):
+    """
+    Total liquidity (Reserves + RRP) na dziennej osi dat (forward-fill), rosnąco.
+
+    Klucz cache to tylko fingerprint - ramki (z podkreślnikiem) nie są hashowane.
+    """
+    # Concat po indeksie zamiast merge (bez nadpisywania kolumny 'date' w danych z cache)
+    liq_pair = _align_daily(
+        [_reserves.set_index('date')['value'], _rrp.set_index('date')['value']]
+    ).dropna()
+    return pd.Series(
+        liq_pair.iloc[:, 0].to_numpy() + liq_pair.iloc[:, 1].to_numpy(),
+        index=liq_pair.index,
+        name='total_liquidity'
     )
 
-if total_liquidity and selected_asset:
-    try:
-        import yfinance as yf
-        import numpy as np
-        from scipy import stats
-        import time
 
-        # Fetch asset price data with retry logic (to avoid rate limiting)
-        with st.spinner(f"Pobieranie danych dla {available_assets[selected_asset]}..."):
-            max_retries = 3
-            asset_hist = None
+@st.fragment
+def render_asset_model():
+    """Liquidity-to-Asset Model - zmiana aktywa/okresu przeładowuje tylko ten fragment"""
+    st.markdown("### 💰 Liquidity-to-Asset Model")
+    st.caption("💡 Jak całkowita płynność Fed wpływa na ceny aktywów")
 
-            for attempt in range(max_retries):
-                try:
-                    if attempt > 0:
-                        wait_time = 2 ** attempt  # Exponential backoff: 2s, 4s, 8s
-                        st.info(f"⏳ Rate limit detected, czekam {wait_time}s... (próba {attempt + 1}/{max_retries})")
-                        time.sleep(wait_time)
+    # Calculate total liquidity (reserves + reverse repo)
+    reserves_val, _ = indicator_vals['reserves_alt']
+    rrp_val, _ = indicator_vals['reverse_repo']
 
-                    # Add small delay before request
-                    time.sleep(0.5)
-                    ticker = yf.Ticker(selected_asset)
-                    asset_hist = ticker.history(period=f"{lookback_days}d")
+    if reserves_val and rrp_val:
+        total_liquidity = reserves_val + rrp_val
+        st.info(f"📊 **Total Liquidity**: ${total_liquidity:.0f}B (Reserves: ${reserves_val:.0f}B + RRP: ${rrp_val:.0f}B)")
+    else:
+        st.warning("⚠️ Brak danych płynności")
+        total_liquidity = None
+
+    # Asset selection
+    available_assets = {
+        'BTC-USD': 'Bitcoin',
+        'ETH-USD': 'Ethereum',
+        'GC=F': 'Gold Futures',
+        'SI=F': 'Silver Futures',
+        'AAPL': 'Apple Inc.',
+        'GOOGL': 'Alphabet (Google)',
+        'NVDA': 'NVIDIA Corporation',
+        'AMD': 'Advanced Micro Devices',
+        'AMZN': 'Amazon.com Inc.',
+        'TSLA': 'Tesla Inc.',
+    }
 
-                    if not asset_hist.empty:
-                        break  # Success!
+    col_asset1, col_asset2 = st.columns([2, 1])
 
+    with col_asset1:
+        selected_asset = st.selectbox(
+            "📈 Wybierz aktywo do analizy",
+            options=list(available_assets.keys()),
+            format_func=lambda x: available_assets[x],
+            index=0,  # Default: BTC
+            help="Wybierz aktywo aby zobaczyć korelację z płynnością Fed"
+        )
+
+    with col_asset2:
+        lookback_days = st.selectbox(
+            "📅 Okres analizy",
+            options=[90, 180, 365, 730],
+            index=3,  # Default: 730 days (2 years)
+            format_func=lambda x: f"{x} dni (~{x//30} mies.)",
+            help="Jak daleko wstecz analizować korelację"
+        )
+
+    if total_liquidity and selected_asset:
+        try:
+            # Wszystkie aktywa pobierane razem (cache 1h), zmiana wyboru tylko wycina z paczki
+            with st.spinner(f"Pobieranie danych dla {available_assets[selected_asset]}..."):
+                try:
+                    asset_hist = fetch_yf_history(selected_asset, lookback_days, tuple(available_assets))
+                except LookupError:
+                    asset_hist = None
                 except Exception as e:
-                    error_msg = str(e)
-                    if "Too Many Requests" in error_msg or "Rate limit" in error_msg:
-                        if attempt < max_retries - 1:
-                            continue  # Try again
-                        else:
-                            st.error(f"❌ Rate limit exceeded po {max_retries} próbach. Poczekaj 30-60s i spróbuj ponownie.")
-                            asset_hist = None
-                    else:
+                    if not _is_rate_limit(e):
                         raise  # Re-raise non-rate-limit errors
+                    st.error("❌ Rate limit exceeded po 3 próbach. Poczekaj 30-60s i spróbuj ponownie.")
+                    asset_hist = None
 
-        if asset_hist is None or asset_hist.empty:
-            st.error(f"❌ Nie udało się pobrać danych dla {selected_asset}")
-            st.info("💡 Poczekaj chwilę i odśwież stronę - Yahoo Finance ma limity requestów.")
-        else:
-            # Get liquidity historical data (use 'data' key, not 'history')
-            # 'history' is just a Series of values, 'data' is DataFrame with date+value columns
-            reserves_history = indicators.get('reserves_alt', {}).get('data', pd.DataFrame())
-            rrp_history = indicators.get('reverse_repo', {}).get('data', pd.DataFrame())
-
-            # Check if history data is valid (could be list or Series)
-            def is_empty_history(hist):
-                if hist is None:
-                    return True
-                if isinstance(hist, list):
-                    return len(hist) == 0
-                if isinstance(hist, pd.Series) or isinstance(hist, pd.DataFrame):
-                    return hist.empty
-                return False
-
-            if is_empty_history(reserves_history) or is_empty_history(rrp_history):
-                st.warning("⚠️ Brak danych historycznych płynności")
+            if asset_hist is None or asset_hist.empty:
+                st.error(f"❌ Nie udało się pobrać danych dla {selected_asset}")
+                st.info("💡 Poczekaj chwilę i odśwież stronę - Yahoo Finance ma limity requestów.")
             else:
-                # Data is already DataFrame from liquidity_monitor
-                df_reserves = reserves_history
-                df_rrp = rrp_history
-
-                # Check if DataFrames have required columns
-                if df_reserves.empty or 'date' not in df_reserves.columns or 'value' not in df_reserves.columns:
-                    st.warning(f"⚠️ Nieprawidłowa struktura danych dla Reserves. Dostępne kolumny: {list(df_reserves.columns)}")
-                elif df_rrp.empty or 'date' not in df_rrp.columns or 'value' not in df_rrp.columns:
-                    st.warning(f"⚠️ Nieprawidłowa struktura danych dla RRP. Dostępne kolumny: {list(df_rrp.columns)}")
-                else:
-                    df_reserves['date'] = pd.to_datetime(df_reserves['date'])
-                    df_rrp['date'] = pd.to_datetime(df_rrp['date'])
+                # Get liquidity historical data (use 'data' key, not 'history')
+                # indicator_frames trzyma wyłącznie DataFrame'y z date+value - wystarczy .empty
+                reserves_history = indicator_frames.get('reserves_alt', EMPTY_FRAME)
+                rrp_history = indicator_frames.get('reverse_repo', EMPTY_FRAME)
 
-                    # Merge reserves + RRP to get total liquidity
-                    df_liquidity = pd.merge(df_reserves, df_rrp, on='date', suffixes=('_reserves', '_rrp'))
-                    df_liquidity['total_liquidity'] = df_liquidity['value_reserves'] + df_liquidity['value_rrp']
-                    df_liquidity = df_liquidity[['date', 'total_liquidity']]
-    
-                    # Prepare asset data
-                    df_asset = asset_hist.reset_index()
-                    df_asset['date'] = pd.to_datetime(df_asset['Date']).dt.tz_localize(None)
-                    df_asset = df_asset[['date', 'Close']].rename(columns={'Close': 'price'})
-    
-                    # Filter by lookback period
-                    cutoff_date = datetime.now() - timedelta(days=lookback_days)
-                    df_liquidity = df_liquidity[df_liquidity['date'] >= cutoff_date]
-                    df_asset = df_asset[df_asset['date'] >= cutoff_date]
-    
-                    # Merge on date (use asof merge for different frequencies)
-                    df_merged = pd.merge_asof(
-                        df_asset.sort_values('date'),
-                        df_liquidity.sort_values('date'),
-                        on='date',
-                        direction='backward'
-                    ).dropna()
-    
-                    if len(df_merged) < 10:
-                        st.warning("⚠️ Za mało punktów danych do analizy")
+                if reserves_history.empty or rrp_history.empty:
+                    st.warning("⚠️ Brak danych historycznych płynności")
+                else:
+                    # Data is already DataFrame from liquidity_monitor
+                    df_reserves = reserves_history
+                    df_rrp = rrp_history
+
+                    # Check if DataFrames have required columns
+                    if df_reserves.empty or 'date' not in df_reserves.columns or 'value' not in df_reserves.columns:
+                        st.warning(f"⚠️ Nieprawidłowa struktura danych dla Reserves. Dostępne kolumny: {list(df_reserves.columns)}")
+                    elif df_rrp.empty or 'date' not in df_rrp.columns or 'value' not in df_rrp.columns:
+                        st.warning(f"⚠️ Nieprawidłowa struktura danych dla RRP. Dostępne kolumny: {list(df_rrp.columns)}")
                     else:
-                        # Calculate correlation
-                        correlation = df_merged['price'].corr(df_merged['total_liquidity'])
-    
-                        # Calculate R-squared (linear regression)
-                        slope, intercept, r_value, p_value, std_err = stats.linregress(
-                            df_merged['total_liquidity'],
-                            df_merged['price']
+                        # Total liquidity (Reserves + RRP) z cache - indeks dat posortowany raz
+                        total_liq = _total_liquidity_series(
+                            _indicators_fingerprint(indicators, ('reserves_alt', 'reverse_repo')),
+                            df_reserves,
+                            df_rrp
                         )
-                        r_squared = r_value ** 2
+
+                        # Filter by lookback period (asset: 'date' + 'price', już posortowane w cache)
+                        cutoff_date = datetime.now() - timedelta(days=lookback_days)
+                        total_liq = total_liq[total_liq.index >= cutoff_date]
+                        df_asset = asset_hist[asset_hist['date'] >= cutoff_date]
+
+                        # Ostatnia znana płynność na każdy dzień notowań (jak merge_asof backward)
+                        liq_aligned = total_liq.reindex(df_asset['date'].to_numpy(), method='ffill').to_numpy()
+                        price_vals = df_asset['price'].to_numpy(np.float64)
+                        valid = ~(np.isnan(liq_aligned) | np.isnan(price_vals))
+                        # Tablice wyciągnięte raz - statystyki i metryki nie wracają już do pandas
+                        liq_arr = np.ascontiguousarray(liq_aligned[valid], dtype=np.float64)
+                        price_arr = np.ascontiguousarray(price_vals[valid])
+                        merged_dates = df_asset['date'].to_numpy()[valid]
     
-                        # Display metrics
-                        col_m1, col_m2, col_m3 = st.columns(3)
+                        if liq_arr.size < 10:
+                            st.warning("⚠️ Za mało punktów danych do analizy")
+                        else:
+                            # Correlation + regresja liniowa w jednym przejściu (r = correlation)
+                            correlation, slope, intercept = linreg_stats(liq_arr, price_arr)
+                            r_squared = correlation ** 2
     
-                        with col_m1:
-                            corr_color = "🟢" if correlation > 0.5 else "🟡" if correlation > 0 else "🔴"
-                            st.metric(
-                                "Correlation",
-                                f"{corr_color} {correlation:.3f}",
-                                help="Siła korelacji: >0.7 = silna, 0.3-0.7 = średnia, <0.3 = słaba"
-                            )
+                            # P-value testu t dla r (n - 2 stopni swobody), jak w linregress
+                            dof = liq_arr.size - 2
+                            if r_squared < 1.0:
+                                from scipy import stats  # scipy potrzebne tylko tutaj - import dopiero przy analizie
+
+                                t_stat = correlation * np.sqrt(dof / (1.0 - r_squared))
+                                p_value = 2 * stats.t.sf(abs(t_stat), dof)
+                            else:
+                                p_value = 0.0
     
-                        with col_m2:
-                            st.metric(
-                                "R² (R-squared)",
-                                f"{r_squared:.3f}",
-                                help="Jak dobrze płynność wyjaśnia cenę (0-1, wyżej = lepiej)"
-                            )
+                            # Display metrics
+                            col_m1, col_m2, col_m3 = st.columns(3)
     
-                        with col_m3:
-                            significance = "✅ Istotna" if p_value < 0.05 else "⚠️ Nieistotna"
-                            st.metric(
-                                "P-value",
-                                f"{p_value:.4f}",
-                                delta=significance,
-                                help="P < 0.05 = statystycznie istotna korelacja"
-                            )
+                            with col_m1:
+                                corr_color = "🟢" if correlation > 0.5 else "🟡" if correlation > 0 else "🔴"
+                                st.metric(
+                                    "Correlation",
+                                    f"{corr_color} {correlation:.3f}",
+                                    help="Siła korelacji: >0.7 = silna, 0.3-0.7 = średnia, <0.3 = słaba"
+                                )
     
-                        # Create dual-axis chart
-                        from plotly.subplots import make_subplots
-                        import plotly.graph_objects as go
+                            with col_m2:
+                                st.metric(
+                                    "R² (R-squared)",
+                                    f"{r_squared:.3f}",
+                                    help="Jak dobrze płynność wyjaśnia cenę (0-1, wyżej = lepiej)"
+                                )
     
-                        fig = make_subplots(specs=[[{"secondary_y": True}]])
+                            with col_m3:
+                                significance = "✅ Istotna" if p_value < 0.05 else "⚠️ Nieistotna"
+                                st.metric(
+                                    "P-value",
+                                    f"{p_value:.4f}",
+                                    delta=significance,
+                                    help="P < 0.05 = statystycznie istotna korelacja"
+                                )
     
-                        # Add asset price (left y-axis)
-                        fig.add_trace(
-                            go.Scatter(
-                                x=df_merged['date'],
-                                y=df_merged['price'],
-                                name=available_assets[selected_asset],
-                                line=dict(color='#00f5ff', width=2),
-                                mode='lines'
-                            ),
-                            secondary_y=False
-                        )
+                            # Create dual-axis chart
+                            fig = make_subplots(specs=[[{"secondary_y": True}]])
     
-                        # Add total liquidity (right y-axis)
-                        fig.add_trace(
-                            go.Scatter(
-                                x=df_merged['date'],
-                                y=df_merged['total_liquidity'],
-                                name='Total Liquidity',
-                                line=dict(color='#ff006e', width=2, dash='dot'),
-                                mode='lines'
-                            ),
-                            secondary_y=True
-                        )
+                            # Asset price (left y-axis) + total liquidity (right y-axis) jednym add_traces
+                            fig.add_traces(
+                                [
+                                    _line_trace(
+                                        merged_dates,
+                                        price_arr,
+                                        name=available_assets[selected_asset],
+                                        line=dict(color='#00f5ff', width=2)
+                                    ),
+                                    _line_trace(
+                                        merged_dates,
+                                        liq_arr,
+                                        name='Total Liquidity',
+                                        line=dict(color='#ff006e', width=2, dash='dot')
+                                    ),
+                                ],
+                                rows=1,
+                                cols=1,
+                                secondary_ys=[False, True]
+                            )
     
-                        # Update layout
-                        fig.update_layout(
-                            title=f"{available_assets[selected_asset]} vs Total Liquidity",
-                            xaxis_title="Data",
-                            hovermode='x unified',
-                            template='plotly_dark',
-                            height=500,
-                            paper_bgcolor='rgba(10, 14, 39, 0.9)',
-                            plot_bgcolor='rgba(26, 26, 46, 0.5)',
-                            legend=dict(
-                                orientation="h",
-                                yanchor="bottom",
-                                y=1.02,
-                                xanchor="right",
-                                x=1
+                            # Update layout
+                            fig.update_layout(
+                                title=f"{available_assets[selected_asset]} vs Total Liquidity",
+                                xaxis_title="Data",
+                                hovermode='x unified',
+                                uirevision=f"{selected_asset}-{lookback_days}",  # zoom zostaje między rerunami
+                                template='plotly_dark',
+                                height=500,
+                                paper_bgcolor='rgba(10, 14, 39, 0.9)',
+                                plot_bgcolor='rgba(26, 26, 46, 0.5)',
+                                legend=dict(
+                                    orientation="h",
+                                    yanchor="bottom",
+                                    y=1.02,
+                                    xanchor="right",
+                                    x=1
+                                )
                             )
-                        )
     
-                        # Set y-axes titles
-                        fig.update_yaxes(title_text=f"{available_assets[selected_asset]} Price", secondary_y=False)
-                        fig.update_yaxes(title_text="Total Liquidity ($B)", secondary_y=True)
+                            # Set y-axes titles
+                            fig.update_yaxes(title_text=f"{available_assets[selected_asset]} Price", secondary_y=False)
+                            fig.update_yaxes(title_text="Total Liquidity ($B)", secondary_y=True)
     
-                        st.plotly_chart(fig, use_container_width=True)
+                            st.plotly_chart(fig, use_container_width=True)
     
-                        # Interpretation
-                        with st.expander("📖 Jak interpretować wyniki?"):
-                            st.markdown(f"""
-                            **Twoja analiza: {available_assets[selected_asset]} vs Total Liquidity**
+                            # Interpretation - teksty wybrane raz z gotowych stałych
+                            correlation_band = 'high' if correlation > 0.6 else 'mid' if correlation >= 0.3 else 'low'
+                            trading_signal = TRADING_SIGNAL_TEXT if correlation > 0.5 else ''
+                            with st.expander("📖 Jak interpretować wyniki?"):
+                                st.markdown(f"""
+                                **Twoja analiza: {available_assets[selected_asset]} vs Total Liquidity**
     
-                            📊 **Wyniki:**
-                            - **Correlation**: {correlation:.3f} ({corr_color})
-                            - **R²**: {r_squared:.3f} (płynność wyjaśnia {r_squared*100:.1f}% zmienności ceny)
-                            - **P-value**: {p_value:.4f} ({significance})
+                                📊 **Wyniki:**
+                                - **Correlation**: {correlation:.3f} ({corr_color})
+                                - **R²**: {r_squared:.3f} (płynność wyjaśnia {r_squared*100:.1f}% zmienności ceny)
+                                - **P-value**: {p_value:.4f} ({significance})
     
-                            💡 **Co to znaczy?**
+                                💡 **Co to znaczy?**
     
-                            **Correlation (Korelacja):**
-                            - **> 0.7**: Silna dodatnia (płynność ↑ → cena ↑)
-                            - **0.3-0.7**: Średnia korelacja
-                            - **< 0.3**: Słaba korelacja
-                            - **Ujemna**: Odwrotna zależność (płynność ↑ → cena ↓)
+                                **Correlation (Korelacja):**
+                                - **> 0.7**: Silna dodatnia (płynność ↑ → cena ↑)
+                                - **0.3-0.7**: Średnia korelacja
+                                - **< 0.3**: Słaba korelacja
+                                - **Ujemna**: Odwrotna zależność (płynność ↑ → cena ↓)
     
-                            **R² (R-squared):**
-                            - Pokazuje jak dobrze płynność "przewiduje" cenę
-                            - **R² = 0.80** = 80% zmian ceny wyjaśnione płynnością
-                            - **R² = 0.20** = tylko 20% wyjaśnione, inne czynniki ważniejsze
+                                **R² (R-squared):**
+                                - Pokazuje jak dobrze płynność "przewiduje" cenę
+                                - **R² = 0.80** = 80% zmian ceny wyjaśnione płynnością
+                                - **R² = 0.20** = tylko 20% wyjaśnione, inne czynniki ważniejsze
     
-                            **P-value:**
-                            - **< 0.05**: Korelacja jest statystycznie istotna ✅
-                            - **> 0.05**: Może być przypadkowa ⚠️
+                                **P-value:**
+                                - **< 0.05**: Korelacja jest statystycznie istotna ✅
+                                - **> 0.05**: Może być przypadkowa ⚠️
     
-                            🎯 **Praktyczne zastosowanie:**
+                                🎯 **Praktyczne zastosowanie:**
     
-                            {'**Silna korelacja!** Gdy Fed zwiększa płynność (QE, obniżki RRP), cena rośnie. Gdy zmniejsza (QT), cena spada.' if correlation > 0.6 else ''}
-                            {'**Średnia korelacja.** Płynność ma wpływ, ale inne czynniki też ważne (sentiment, fundamenty).' if 0.3 <= correlation <= 0.6 else ''}
-                            {'**Słaba korelacja.** To aktywo reaguje bardziej na inne czynniki niż na płynność Fed.' if correlation < 0.3 else ''}
+                                {CORRELATION_TEXTS[correlation_band]}
     
-                            💡 **Dan Kostecki Framework:**
-                            - Bitcoin ma zazwyczaj **wysoką korelację** z płynnością (0.7-0.9)
-                            - Złoto: średnia korelacja (0.4-0.6)
-                            - Tech stocks (AAPL, TSLA): silna w QE, słabsza w QT
+                                💡 **Dan Kostecki Framework:**
+                                - Bitcoin ma zazwyczaj **wysoką korelację** z płynnością (0.7-0.9)
+                                - Złoto: średnia korelacja (0.4-0.6)
+                                - Tech stocks (AAPL, TSLA): silna w QE, słabsza w QT
     
-                            📈 **Trading signal:**
-                            {'Jeśli płynność rośnie → rozważ pozycję LONG' if correlation > 0.5 else ''}
-                            {'Jeśli płynność spada → rozważ pozycję SHORT lub redukcję ekspozycji' if correlation > 0.5 else ''}
-                            """)
+                                📈 **Trading signal:**
+                                {trading_signal}
+                                """)
     
-    except ImportError:
-        st.error("❌ Brak biblioteki scipy. Zainstaluj: `pip install scipy`")
-    except Exception as e:
-        st.error(f"❌ Błąd podczas analizy: {str(e)}")
-        import traceback
-        st.code(traceback.format_exc())
+        except ImportError:
+            st.error("❌ Brak biblioteki scipy. Zainstaluj: `pip install scipy`")
+        except Exception as e:
+            st.error(f"❌ Błąd podczas analizy: {type(e).__name__}: {e}")
+            # Pełny traceback tylko w trybie debug (st.session_state['debug'] = True)
+            if st.session_state.get('debug'):
+                st.code(traceback.format_exc())
+
+
+render_asset_model()
 
 st.markdown("---")
 
@@ -12,10 +12,14 @@ Features:
 - Recommendation: STRONG BUY / BUY / HOLD / SELL / STRONG SELL
 """
 
+import math
+import string
+import time
 import streamlit as st
 import plotly.graph_objects as go
 from plotly.subplots import make_subplots
 import pandas as pd
+import numpy as np
 from datetime import datetime
 import sys
 from pathlib import Path
@@ -28,6 +32,7 @@ from components.cyberpunk_theme import apply_chart_theme
 from utils.constants import CHART_COLORS, REGIME_COLORS
 from utils.mobile_styles import inject_mobile_css
 from utils.navigation import render_top_navigation
+from utils._fast_stats import lttb_indices
 from utils.education import (
     get_indicator_help,
     interpret_value,
@@ -53,6 +58,488 @@ load_cyberpunk_theme()
 inject_mobile_css()
 render_top_navigation(current_page="Stock")
 
+# ============================================
+# DATA LOADING
+# ============================================
+
+@st.cache_data(ttl=900, show_spinner=False)
+def load_stock_data(ticker, period):
+    """
+    get_stock_data z cache 15 min na (ticker, period) - powrót do tickera bez requestu do Yahoo.
+
+    Wyjątki (zły ticker, brak połączenia) nie trafiają do cache.
+
+    Returns:
+        Tuple: (dane, czas pobrania) - starszy czas niż moment wywołania = trafienie w cache
+    """
+    return get_stock_data(ticker, period=period), time.time()
+
+
+# ============================================
+# CHART HELPERS
+# ============================================
+
+# Motyw cyberpunk bez tytułu i legendy (wykresy ustawiają własną legendę) - budowany raz
+_CHART_THEME = {k: v for k, v in apply_chart_theme().items() if k not in ('title', 'legend')}
+
+# Maksymalna liczba świec na wykresie - dłuższa historia agregowana do rzadszego interwału
+CANDLE_MAX_BARS = 300
+# Kolejne interwały agregacji: (reguła resample, etykieta)
+CANDLE_RESAMPLE_RULES = (('W', 'tygodniowe'), ('MS', 'miesięczne'))
+# Agregacja OHLCV przy zmianie interwału
+OHLCV_AGG = {'open': 'first', 'high': 'max', 'low': 'min', 'close': 'last', 'volume': 'sum'}
+# Maksymalna liczba punktów dziennej linii Close nad zagregowanymi świecami (LTTB)
+CHART_MAX_POINTS = 2000
+# Linie wskaźników powyżej tylu punktów rysowane przez Scattergl (WebGL) - krótsze zostają w SVG,
+# bo przeglądarka ma limit kontekstów WebGL na stronę
+SCATTERGL_MIN_POINTS = 1000
+
+
+def _resample_candles(df_hist):
+    """
+    Świece dzienne, a gdy jest ich więcej niż CANDLE_MAX_BARS - tygodniowe lub miesięczne.
+
+    Returns:
+        Tuple (DataFrame 'date' + OHLCV, etykieta interwału)
+    """
+    candles, label = df_hist, 'dzienne'
+    for rule, rule_label in CANDLE_RESAMPLE_RULES:
+        if len(candles) <= CANDLE_MAX_BARS:
+            break
+        candles = (
+            df_hist.set_index('date')
+            .resample(rule)
+            .agg(OHLCV_AGG)
+            .dropna(subset=['close'])
+            .reset_index()
+        )
+        label = rule_label
+    return candles, label
+
+
+def _close_line_trace(dates, close):
+    """
+    Dzienna linia Close z całej historii jako go.Scattergl, zredukowana LTTB do CHART_MAX_POINTS.
+
+    LTTB zachowuje kształt (szczyty i dołki) - wykres 5y wygląda tak samo,
+    a przeglądarka dostaje stałą liczbę punktów niezależnie od okresu.
+    """
+    dates = np.asarray(dates)
+    close = np.asarray(close, dtype=np.float64)
+    ok = ~np.isnan(close)
+    dates, close = dates[ok], close[ok]
+    if close.size > CHART_MAX_POINTS:
+        keep = lttb_indices(
+            dates.astype('datetime64[ns]').astype(np.int64).astype(np.float64),
+            close,
+            CHART_MAX_POINTS
+        )
+        dates, close = dates[keep], close[keep]
+
+    return go.Scattergl(
+        x=dates,
+        y=close,
+        mode='lines',
+        name='Close',
+        line=dict(color='#00f5ff', width=1.5)
+    )
+
+
+def _figure_key(data):
+    """Klucz cache figur: ticker + znacznik aktualizacji + długość historii (okres)"""
+    return (data['ticker'], str(data['last_updated']), len(data['history'].get('date', ())))
+
+
+@st.cache_data(ttl=900, show_spinner=False)
+def _history_df(key, _history):
+    """
+    Historia OHLCV jako DataFrame z datą datetime64 - raz na klucz, wspólna dla wszystkich wykresów.
+
+    Daty z get_stock_data mają stały format 'YYYY-MM-DD' - jawny format pomija zgadywanie.
+    """
+    df_hist = pd.DataFrame(_history, copy=False)  # kolumny list z get_stock_data
+    df_hist['date'] = pd.to_datetime(df_hist['date'], format='%Y-%m-%d')
+    return df_hist
+
+
+@st.cache_data(ttl=900, show_spinner=False)
+def build_candle_fig(key, _data):
+    """
+    Świece + wolumen - budowane raz na (ticker, aktualizacja, okres), potem z cache.
+
+    Klucz cache to tylko 'key' - '_data' (z podkreślnikiem) nie jest hashowane.
+    """
+    # Długa historia (2y, 5y): świece tygodniowe/miesięczne zamiast ponad tysiąca dziennych
+    df_hist = _history_df(key, _data['history'])
+    df_candles, interval = _resample_candles(df_hist)
+    # Kolumny jako tablice NumPy - Plotly serializuje je bez konwersji przez Series
+    dates = df_candles['date'].to_numpy()
+    opens, highs, lows, closes = (df_candles[col].to_numpy() for col in ('open', 'high', 'low', 'close'))
+
+    fig_candle = make_subplots(
+        rows=2, cols=1,
+        shared_xaxes=True,
+        vertical_spacing=0.03,
+        subplot_titles=(f'Price (świece {interval})', 'Volume'),
+        row_heights=[0.7, 0.3]
+    )
+
+    # Zagregowane świece: do tego dzienna linia Close (WebGL) - widać ruchy wewnątrz interwału
+    if len(df_candles) < len(df_hist):
+        fig_candle.add_trace(_close_line_trace(df_hist['date'], df_hist['close']), row=1, col=1)
+
+    # Candlestick
+    fig_candle.add_trace(
+        go.Candlestick(
+            x=dates,
+            open=opens,
+            high=highs,
+            low=lows,
+            close=closes,
+            name='Price',
+            increasing_line_color='#39ff14',
+            decreasing_line_color='#ff073a'
+        ),
+        row=1, col=1
+    )
+
+    # MA lines (jeśli dostępne)
+    tech = _data['technicals']
+    if tech.get('ma_20'):
+        # Aktualna MA20 jako pozioma linia (jeden kształt zamiast N punktów)
+        fig_candle.add_hline(
+            y=tech['ma_20'],
+            line_color='#ffed4e',
+            line_width=1,
+            line_dash='dot',
+            annotation_text='MA20',
+            annotation_position='top left',
+            row=1, col=1
+        )
+
+    # Volume (kolory wektorowo - bez iterrows)
+    colors = np.where(closes >= opens, '#39ff14', '#ff073a')
+
+    fig_candle.add_trace(
+        go.Bar(
+            x=dates,
+            y=df_candles['volume'].to_numpy(),
+            name='Volume',
+            marker_color=colors,
+            opacity=0.5
+        ),
+        row=2, col=1
+    )
+
+    fig_candle.update_layout(
+        **_CHART_THEME,
+        hovermode='x unified',
+        spikedistance=0,  # bez szukania punktów pod spike lines przy ruchu myszy
+        height=600,
+        xaxis_rangeslider_visible=False,
+        showlegend=True,
+        legend=dict(
+            orientation="h",
+            yanchor="bottom",
+            y=1.02,
+            xanchor="right",
+            x=1
+        )
+    )
+
+    fig_candle.update_xaxes(gridcolor='rgba(0, 245, 255, 0.1)')
+    fig_candle.update_yaxes(gridcolor='rgba(0, 245, 255, 0.1)')
+
+    return fig_candle
+
+
+@st.cache_data(ttl=900, show_spinner=False)
+def build_macd_fig(key, _data):
+    """MACD + histogram - z cache jak build_candle_fig"""
+    macd_data = _data['technicals']['macd']
+
+    dates = _history_df(key, _data['history'])['date'].to_numpy()
+    line_trace = go.Scattergl if dates.size > SCATTERGL_MIN_POINTS else go.Scatter
+
+    fig_macd = make_subplots(
+        rows=2, cols=1,
+        shared_xaxes=True,
+        vertical_spacing=0.03,
+        subplot_titles=('MACD Line & Signal', 'Histogram'),
+        row_heights=[0.6, 0.4]
+    )
+
+    # MACD Line
+    fig_macd.add_trace(
+        line_trace(
+            x=dates,
+            y=np.asarray(macd_data['macd_line']),
+            mode='lines',
+            name='MACD',
+            line=dict(color='#00f5ff', width=2)
+        ),
+        row=1, col=1
+    )
+
+    # Signal Line
+    fig_macd.add_trace(
+        line_trace(
+            x=dates,
+            y=np.asarray(macd_data['signal_line']),
+            mode='lines',
+            name='Signal',
+            line=dict(color='#ff006e', width=2)
+        ),
+        row=1, col=1
+    )
+
+    # Histogram
+    histogram = np.asarray(macd_data['histogram'], dtype=np.float64)
+    colors = np.where(histogram > 0, '#39ff14', '#ff073a')
+    fig_macd.add_trace(
+        go.Bar(
+            x=dates,
+            y=histogram,
+            name='Histogram',
+            marker_color=colors,
+            opacity=0.6
+        ),
+        row=2, col=1
+    )
+
+    fig_macd.update_layout(
+        **_CHART_THEME,
+        hovermode='x unified',
+        spikedistance=0,  # bez szukania punktów pod spike lines przy ruchu myszy
+        height=500,
+        showlegend=True,
+        legend=dict(
+            orientation="h",
+            yanchor="bottom",
+            y=1.02,
+            xanchor="right",
+            x=1
+        )
+    )
+
+    fig_macd.update_xaxes(gridcolor='rgba(0, 245, 255, 0.1)')
+    fig_macd.update_yaxes(gridcolor='rgba(0, 245, 255, 0.1)')
+
+    return fig_macd
+
+
+@st.cache_data(ttl=900, show_spinner=False)
+def build_bb_fig(key, _data):
+    """Bollinger Bands + Close - z cache jak build_candle_fig"""
+    bb_data = _data['technicals']['bollinger_bands']
+
+    df_hist = _history_df(key, _data['history'])
+    dates = df_hist['date'].to_numpy()
+    line_trace = go.Scattergl if dates.size > SCATTERGL_MIN_POINTS else go.Scatter
+
+    fig_bb = go.Figure()
+
+    # Upper Band
+    fig_bb.add_trace(
+        line_trace(
+            x=dates,
+            y=np.asarray(bb_data['upper_band']),
+            mode='lines',
+            name='Upper Band',
+            line=dict(color='#ff006e', width=1, dash='dash')
+        )
+    )
+
+    # Middle Band (SMA)
+    fig_bb.add_trace(
+        line_trace(
+            x=dates,
+            y=np.asarray(bb_data['middle_band']),
+            mode='lines',
+            name='SMA (20)',
+            line=dict(color='#ffed4e', width=2)
+        )
+    )
+
+    # Lower Band
+    fig_bb.add_trace(
+        line_trace(
+            x=dates,
+            y=np.asarray(bb_data['lower_band']),
+            mode='lines',
+            name='Lower Band',
+            line=dict(color='#ff006e', width=1, dash='dash'),
+            fill='tonexty',
+            fillcolor='rgba(255, 0, 110, 0.1)'
+        )
+    )
+
+    # Price (Close)
+    fig_bb.add_trace(
+        line_trace(
+            x=dates,
+            y=df_hist['close'].to_numpy(),
+            mode='lines',
+            name='Close Price',
+            line=dict(color='#00f5ff', width=2)
+        )
+    )
+
+    fig_bb.update_layout(
+        **_CHART_THEME,
+        hovermode='x unified',
+        spikedistance=0,  # bez szukania punktów pod spike lines przy ruchu myszy
+        height=500,
+        showlegend=True,
+        legend=dict(
+            orientation="h",
+            yanchor="bottom",
+            y=1.02,
+            xanchor="right",
+            x=1
+        )
+    )
+
+    fig_bb.update_xaxes(gridcolor='rgba(0, 245, 255, 0.1)')
+    fig_bb.update_yaxes(gridcolor='rgba(0, 245, 255, 0.1)')
+
+    return fig_bb
+
+
+# Pasma gauge Overall Score: (od, do, kolor) - jak progi interpretacji score
+GAUGE_STEPS = (
+    (0, 25, 'rgba(255, 7, 58, 0.3)'),
+    (25, 40, 'rgba(255, 190, 11, 0.3)'),
+    (40, 60, 'rgba(160, 160, 160, 0.3)'),
+    (60, 75, 'rgba(255, 237, 78, 0.3)'),
+    (75, 100, 'rgba(57, 255, 20, 0.3)'),
+)
+
+RADAR_CATEGORIES = ('Valuation', 'Health', 'Growth', 'Momentum', 'Sentiment')
+
+
+def _gauge_point(value, radius, cx=100, cy=100):
+    """Punkt na półokręgu gauge dla wartości 0-100 (0 = lewo, 100 = prawo)"""
+    angle = math.pi * (1 - min(max(value, 0), 100) / 100)
+    return cx + radius * math.cos(angle), cy - radius * math.sin(angle)
+
+
+def _gauge_arc(start, end, radius):
+    """Ścieżka SVG łuku gauge od wartości start do end"""
+    x0, y0 = _gauge_point(start, radius)
+    x1, y1 = _gauge_point(end, radius)
+    return f"M {x0:.2f} {y0:.2f} A {radius} {radius} 0 0 1 {x1:.2f} {y1:.2f}"
+
+
+@st.cache_data(ttl=900, show_spinner=False)
+def gauge_svg(score):
+    """
+    Gauge Overall Score jako statyczny SVG - z cache na wartość score.
+
+    Zamiast wykresu Plotly (osobna instancja Plotly.js przy każdym renderze)
+    przeglądarka dostaje kilka ścieżek SVG.
+    """
+    bands = "".join(
+        f'<path d="{_gauge_arc(lo, hi, 80)}" stroke="{color}" stroke-width="26" fill="none"/>'
+        for lo, hi, color in GAUGE_STEPS
+    )
+    tx0, ty0 = _gauge_point(score, 64)
+    tx1, ty1 = _gauge_point(score, 96)
+
+    return f"""
+    <svg viewBox="0 0 200 135" style="width: 100%; height: 200px;" xmlns="http://www.w3.org/2000/svg">
+        {bands}
+        <path d="{_gauge_arc(0, 100, 93)}" stroke="#00f5ff" stroke-width="1" fill="none"/>
+        <path d="{_gauge_arc(0, score, 80)}" stroke="#00f5ff" stroke-width="8" fill="none"/>
+        <line x1="{tx0:.2f}" y1="{ty0:.2f}" x2="{tx1:.2f}" y2="{ty1:.2f}" stroke="#ff006e" stroke-width="3"/>
+        <text x="100" y="98" text-anchor="middle" fill="#ffffff" font-family="Orbitron, sans-serif" font-size="22">{score:.0f}/100</text>
+        <text x="20" y="114" text-anchor="middle" fill="#a0a0a0" font-size="9">0</text>
+        <text x="180" y="114" text-anchor="middle" fill="#a0a0a0" font-size="9">100</text>
+        <text x="100" y="130" text-anchor="middle" fill="#00f5ff" font-family="Orbitron, sans-serif" font-size="11">Overall Score</text>
+    </svg>
+    """
+
+
+def _radar_points(values, cx=150, cy=100, radius=70):
+    """Wierzchołki wielokąta radaru (pierwsza oś u góry, dalej zgodnie z ruchem wskazówek)"""
+    step = 2 * math.pi / len(values)
+    return [
+        (cx + radius * v / 100 * math.sin(i * step), cy - radius * v / 100 * math.cos(i * step))
+        for i, v in enumerate(values)
+    ]
+
+
+def _svg_polygon(points):
+    """Atrybut points dla <polygon>"""
+    return " ".join(f"{x:.2f},{y:.2f}" for x, y in points)
+
+
+@st.cache_data(ttl=900, show_spinner=False)
+def radar_svg(scores):
+    """Radar 5 kategorii score jako statyczny SVG - z cache na krotkę scores"""
+    n = len(RADAR_CATEGORIES)
+    grid = "".join(
+        f'<polygon points="{_svg_polygon(_radar_points((level,) * n))}" fill="none" stroke="rgba(0, 245, 255, 0.2)"/>'
+        for level in (25, 50, 75, 100)
+    )
+    axes = "".join(
+        f'<line x1="150" y1="100" x2="{x:.2f}" y2="{y:.2f}" stroke="rgba(0, 245, 255, 0.2)"/>'
+        for x, y in _radar_points((100,) * n)
+    )
+    labels = "".join(
+        f'<text x="{x:.2f}" y="{y + 4:.2f}" text-anchor="middle" fill="#ffffff" font-size="11">{name}</text>'
+        for name, (x, y) in zip(RADAR_CATEGORIES, _radar_points((100,) * n, radius=88))
+    )
+
+    return f"""
+    <svg viewBox="0 0 300 200" style="width: 100%; height: 200px;" xmlns="http://www.w3.org/2000/svg">
+        {grid}
+        {axes}
+        <polygon points="{_svg_polygon(_radar_points(scores))}" fill="rgba(0, 245, 255, 0.3)" stroke="#00f5ff" stroke-width="2"/>
+        {labels}
+    </svg>
+    """
+
+
+# Wiersze tabel w zakładce Fundamentals & Technicals: (klucz, etykieta, format)
+# Wiersz pomijany, gdy wartość jest pusta/zerowa
+FUNDAMENTALS_TABLE_SPEC = (
+    # Valuation
+    ('pe_ratio', "P/E Ratio", "{:.2f}"),
+    ('pb_ratio', "P/B Ratio", "{:.2f}"),
+    ('peg_ratio', "PEG Ratio", "{:.2f}"),
+    # Profitability
+    ('roe', "ROE", "{:.1%}"),
+    ('roa', "ROA", "{:.1%}"),
+    ('profit_margin', "Profit Margin", "{:.1%}"),
+    # Debt
+    ('debt_to_equity', "Debt/Equity", "{:.2f}"),
+    # Growth
+    ('revenue_growth', "Revenue Growth", "{:.1%}"),
+    ('earnings_growth', "Earnings Growth", "{:.1%}"),
+    # Dividend
+    ('dividend_yield', "Dividend Yield", "{:.2%}"),
+)
+
+TECHNICALS_TABLE_SPEC = (
+    # Moving Averages
+    ('ma_20', "MA(20)", "${:.2f}"),
+    ('ma_50', "MA(50)", "${:.2f}"),
+    ('ma_200', "MA(200)", "${:.2f}"),
+    # Signals
+    ('cross_signal', "MA Signal", "{}"),
+    # RSI
+    ('rsi', "RSI(14)", "{:.1f}"),
+    # Volume
+    ('volume_signal', "Volume", "{}"),
+    # 52w High/Low
+    ('52w_high', "52w High", "${:.2f}"),
+    ('52w_low', "52w Low", "${:.2f}"),
+    # Beta
+    ('beta', "Beta", "{:.2f}"),
+)
+
+
 # ============================================
 # HEADER
 # ============================================
@@ -196,7 +683,12 @@ with st.expander("📋 Popularne Tickery - Kliknij aby skopiować", expanded=Fal
 # ANALYSIS EXECUTION
 # ============================================
 
-if ticker_input and (analyze_button or 'stock_data' not in st.session_state or st.session_state.get('last_ticker') != ticker_input):
+if ticker_input and (
+    analyze_button
+    or 'stock_data' not in st.session_state
+    or st.session_state.get('last_ticker') != ticker_input
+    or st.session_state.get('last_period') != period_select
+):
 
     # Validate ticker input
     if not ticker_input.strip():
@@ -216,7 +708,10 @@ if ticker_input and (analyze_button or 'stock_data' not in st.session_state or s
         progress_placeholder.progress(0.3)
         status_placeholder.info("🔍 Pobieranie danych z Yahoo Finance...")
 
-        stock_data = get_stock_data(ticker_input, period=period_select)
+        requested_at = time.time()
+        stock_data, fetched_at = load_stock_data(ticker_input, period_select)
+        # Badge FROM CACHE: cache bazy (get_stock_data) albo wynik st.cache_data z wcześniejszego pobrania
+        stock_data['from_cache'] = stock_data['from_cache'] or fetched_at < requested_at
 
         # Stage 2: Analysis complete
         progress_placeholder.progress(1.0)
@@ -225,10 +720,10 @@ if ticker_input and (analyze_button or 'stock_data' not in st.session_state or s
         # Save to session state
         st.session_state['stock_data'] = stock_data
         st.session_state['last_ticker'] = ticker_input
+        st.session_state['last_period'] = period_select
         st.session_state['load_error'] = None
 
         # Clear loading indicators
-        import time
         time.sleep(0.5)
         progress_placeholder.empty()
         status_placeholder.empty()
@@ -274,6 +769,101 @@ if ticker_input and (analyze_button or 'stock_data' not in st.session_state or s
         st.session_state['load_error'] = error_msg
         st.stop()
 
+# ============================================
+# HTML CARDS
+# ============================================
+
+# Kolor karty rekomendacji (etykiety z get_stock_data)
+REC_COLORS = {
+    "🟢 STRONG BUY": "#39ff14",
+    "🟡 BUY": "#ffed4e",
+    "⚪ HOLD": "#a0a0a0",
+    "🟠 SELL": "#ff9500",
+    "🔴 STRONG SELL": "#ff073a"
+}
+
+
+# Szablony kart jako stałe modułu - na przebieg tylko jedno substitute() na kartę
+HEADER_TPL = string.Template("""
+<div style="
+    background: linear-gradient(135deg, rgba(26, 26, 46, 0.9), rgba(10, 14, 39, 0.9));
+    border: 2px solid #ff006e;
+    border-radius: 12px;
+    padding: 1.5rem;
+    margin-bottom: 2rem;
+">
+    <h2 style="color: #00f5ff; font-family: 'Orbitron', sans-serif; margin: 0;">
+        $company
+    </h2>
+    <p style="color: #a0a0a0; font-size: 1.1rem; margin: 0.5rem 0 0 0;">
+        $sector • $industry
+    </p>
+    <p style="color: #606060; font-size: 0.9rem; margin: 0.3rem 0 0 0;">
+        Ticker: $ticker | Updated: $updated $cache_badge
+    </p>
+</div>
+""")
+
+# Znacznik w nagłówku, gdy dane przyszły z cache
+CACHE_BADGE = '| <span style="color: #39ff14; font-weight: bold;">⚡ FROM CACHE (TTL: 15min)</span>'
+
+RECOMMENDATION_TPL = string.Template("""
+<div style="
+    background: rgba(26, 26, 46, 0.8);
+    border: 3px solid $rec_color;
+    border-radius: 8px;
+    padding: 1.5rem;
+    text-align: center;
+    box-shadow: 0 0 20px ${rec_color}80;
+    height: 180px;
+    display: flex;
+    flex-direction: column;
+    justify-content: center;
+">
+    <p style="color: #a0a0a0; font-size: 0.9rem; margin: 0 0 0.5rem 0;">
+        RECOMMENDATION
+    </p>
+    <h2 style="color: $rec_color; font-family: 'Orbitron', sans-serif; font-size: 1.8rem; margin: 0;">
+        $recommendation
+    </h2>
+</div>
+""")
+
+SUMMARY_TPL = string.Template("""
+<div style="
+    background: linear-gradient(135deg, rgba(26, 26, 46, 0.7), rgba(10, 14, 39, 0.7));
+    border-left: 4px solid #00f5ff;
+    border-radius: 8px;
+    padding: 1.5rem;
+    margin: 2rem 0;
+">
+    <h4 style="color: #00f5ff; font-family: 'Orbitron', sans-serif; margin: 0 0 1rem 0;">
+        📝 Executive Summary
+    </h4>
+    <p style="color: #e0e0e0; font-size: 1.1rem; line-height: 1.6; margin: 0;">
+        $summary
+    </p>
+</div>
+""")
+
+
+# ============================================
+# RAW DATA (DEBUG)
+# ============================================
+
+@st.fragment
+def render_raw_data(data):
+    """Surowe dane na żądanie - przełączniki przeładowują tylko ten fragment"""
+    st.markdown("#### 🔍 Raw Data (Debug)")
+
+    # JSON całego dict (z historią OHLCV) to największy payload strony - wysyłany tylko gdy zaznaczono
+    if st.checkbox("Pokaż surowy JSON", key="show_raw_json"):
+        st.json({key: value for key, value in data.items() if key != 'history'}, expanded=False)
+
+        if st.checkbox("Dołącz historię OHLCV", key="show_raw_history"):
+            st.json(data['history'], expanded=False)
+
+
 # ============================================
 # DISPLAY RESULTS
 # ============================================
@@ -287,25 +877,17 @@ if 'stock_data' in st.session_state:
     # COMPANY HEADER
     # ============================================
 
-    st.markdown(f"""
-    <div style="
-        background: linear-gradient(135deg, rgba(26, 26, 46, 0.9), rgba(10, 14, 39, 0.9));
-        border: 2px solid #ff006e;
-        border-radius: 12px;
-        padding: 1.5rem;
-        margin-bottom: 2rem;
-    ">
-        <h2 style="color: #00f5ff; font-family: 'Orbitron', sans-serif; margin: 0;">
-            {data['company_name']}
-        </h2>
-        <p style="color: #a0a0a0; font-size: 1.1rem; margin: 0.5rem 0 0 0;">
-            {data['sector']} • {data['industry']}
-        </p>
-        <p style="color: #606060; font-size: 0.9rem; margin: 0.3rem 0 0 0;">
-            Ticker: {data['ticker']} | Updated: {data['last_updated']} {'| <span style="color: #39ff14; font-weight: bold;">⚡ FROM CACHE (TTL: 15min)</span>' if data.get('from_cache', False) else ''}
-        </p>
-    </div>
-    """, unsafe_allow_html=True)
+    st.markdown(
+        HEADER_TPL.substitute(
+            company=data['company_name'],
+            sector=data['sector'],
+            industry=data['industry'],
+            ticker=data['ticker'],
+            updated=data['last_updated'],
+            cache_badge=CACHE_BADGE if data.get('from_cache', False) else ''
+        ),
+        unsafe_allow_html=True
+    )
 
     # ============================================
     # MAIN METRICS ROW
@@ -322,42 +904,7 @@ if 'stock_data' in st.session_state:
 
     with mcol2:
         # Gauge chart dla overall score
-        fig_gauge = go.Figure(go.Indicator(
-            mode="gauge+number",
-            value=data['overall_score'],
-            domain={'x': [0, 1], 'y': [0, 1]},
-            title={'text': "Overall Score", 'font': {'size': 16, 'color': '#00f5ff'}},
-            number={'suffix': "/100", 'font': {'size': 32, 'color': '#ffffff'}},
-            gauge={
-                'axis': {'range': [None, 100], 'tickwidth': 1, 'tickcolor': "#00f5ff"},
-                'bar': {'color': "#00f5ff"},
-                'bgcolor': "rgba(26, 26, 46, 0.5)",
-                'borderwidth': 2,
-                'bordercolor': "#00f5ff",
-                'steps': [
-                    {'range': [0, 25], 'color': 'rgba(255, 7, 58, 0.3)'},
-                    {'range': [25, 40], 'color': 'rgba(255, 190, 11, 0.3)'},
-                    {'range': [40, 60], 'color': 'rgba(160, 160, 160, 0.3)'},
-                    {'range': [60, 75], 'color': 'rgba(255, 237, 78, 0.3)'},
-                    {'range': [75, 100], 'color': 'rgba(57, 255, 20, 0.3)'}
-                ],
-                'threshold': {
-                    'line': {'color': "#ff006e", 'width': 4},
-                    'thickness': 0.75,
-                    'value': data['overall_score']
-                }
-            }
-        ))
-
-        fig_gauge.update_layout(
-            paper_bgcolor='rgba(0,0,0,0)',
-            plot_bgcolor='rgba(0,0,0,0)',
-            font={'color': "#ffffff", 'family': "Orbitron"},
-            height=200,
-            margin=dict(l=20, r=20, t=40, b=20)
-        )
-
-        st.plotly_chart(fig_gauge, use_container_width=True)
+        st.markdown(gauge_svg(data['overall_score']), unsafe_allow_html=True)
 
         # Interpretacja Overall Score
         score = data['overall_score']
@@ -366,82 +913,25 @@ if 'stock_data' in st.session_state:
 
     with mcol3:
         # Recommendation badge
-        rec_color_map = {
-            "🟢 STRONG BUY": "#39ff14",
-            "🟡 BUY": "#ffed4e",
-            "⚪ HOLD": "#a0a0a0",
-            "🟠 SELL": "#ff9500",
-            "🔴 STRONG SELL": "#ff073a"
-        }
-
-        rec_color = rec_color_map.get(data['recommendation'], '#a0a0a0')
-
-        st.markdown(f"""
-        <div style="
-            background: rgba(26, 26, 46, 0.8);
-            border: 3px solid {rec_color};
-            border-radius: 8px;
-            padding: 1.5rem;
-            text-align: center;
-            box-shadow: 0 0 20px {rec_color}80;
-            height: 180px;
-            display: flex;
-            flex-direction: column;
-            justify-content: center;
-        ">
-            <p style="color: #a0a0a0; font-size: 0.9rem; margin: 0 0 0.5rem 0;">
-                RECOMMENDATION
-            </p>
-            <h2 style="color: {rec_color}; font-family: 'Orbitron', sans-serif; font-size: 1.8rem; margin: 0;">
-                {data['recommendation']}
-            </h2>
-        </div>
-        """, unsafe_allow_html=True)
+        st.markdown(
+            RECOMMENDATION_TPL.substitute(
+                rec_color=REC_COLORS.get(data['recommendation'], '#a0a0a0'),
+                recommendation=data['recommendation']
+            ),
+            unsafe_allow_html=True
+        )
 
     with mcol4:
         # Category scores breakdown (mini chart)
-        categories = ['Valuation', 'Health', 'Growth', 'Momentum', 'Sentiment']
-        scores = [
+        scores = (
             data['valuation_score'],
             data['financial_health_score'],
             data['growth_score'],
             data['momentum_score'],
             data['sentiment_score']
-        ]
-
-        fig_breakdown = go.Figure()
-
-        fig_breakdown.add_trace(go.Scatterpolar(
-            r=scores,
-            theta=categories,
-            fill='toself',
-            fillcolor='rgba(0, 245, 255, 0.3)',
-            line=dict(color='#00f5ff', width=2),
-            name='Scores'
-        ))
-
-        fig_breakdown.update_layout(
-            polar=dict(
-                radialaxis=dict(
-                    visible=True,
-                    range=[0, 100],
-                    gridcolor='rgba(0, 245, 255, 0.2)',
-                    tickfont=dict(size=10, color='#a0a0a0')
-                ),
-                angularaxis=dict(
-                    gridcolor='rgba(0, 245, 255, 0.2)',
-                    tickfont=dict(size=11, color='#ffffff')
-                ),
-                bgcolor='rgba(0,0,0,0)'
-            ),
-            showlegend=False,
-            paper_bgcolor='rgba(0,0,0,0)',
-            plot_bgcolor='rgba(0,0,0,0)',
-            height=200,
-            margin=dict(l=40, r=40, t=20, b=20)
         )
 
-        st.plotly_chart(fig_breakdown, use_container_width=True)
+        st.markdown(radar_svg(scores), unsafe_allow_html=True)
 
     # Category scores details with help
     with st.expander("ℹ️ Co oznaczają poszczególne scores?"):
@@ -473,22 +963,7 @@ if 'stock_data' in st.session_state:
     # SUMMARY
     # ============================================
 
-    st.markdown(f"""
-    <div style="
-        background: linear-gradient(135deg, rgba(26, 26, 46, 0.7), rgba(10, 14, 39, 0.7));
-        border-left: 4px solid #00f5ff;
-        border-radius: 8px;
-        padding: 1.5rem;
-        margin: 2rem 0;
-    ">
-        <h4 style="color: #00f5ff; font-family: 'Orbitron', sans-serif; margin: 0 0 1rem 0;">
-            📝 Executive Summary
-        </h4>
-        <p style="color: #e0e0e0; font-size: 1.1rem; line-height: 1.6; margin: 0;">
-            {data['summary']}
-        </p>
-    </div>
-    """, unsafe_allow_html=True)
+    st.markdown(SUMMARY_TPL.substitute(summary=data['summary']), unsafe_allow_html=True)
 
     # ============================================
     # MAIN ANALYSIS SECTIONS
@@ -550,82 +1025,7 @@ if 'stock_data' in st.session_state:
 
         if data['history']:
             # Create candlestick
-            df_hist = pd.DataFrame(data['history'])
-            df_hist['date'] = pd.to_datetime(df_hist['date'])
-
-            fig_candle = make_subplots(
-                rows=2, cols=1,
-                shared_xaxes=True,
-                vertical_spacing=0.03,
-                subplot_titles=('Price', 'Volume'),
-                row_heights=[0.7, 0.3]
-            )
-
-            # Candlestick
-            fig_candle.add_trace(
-                go.Candlestick(
-                    x=df_hist['date'],
-                    open=df_hist['open'],
-                    high=df_hist['high'],
-                    low=df_hist['low'],
-                    close=df_hist['close'],
-                    name='Price',
-                    increasing_line_color='#39ff14',
-                    decreasing_line_color='#ff073a'
-                ),
-                row=1, col=1
-            )
-
-            # MA lines (jeśli dostępne)
-            tech = data['technicals']
-            if tech.get('ma_20'):
-                # Symuluj MA20 na wykresie (uproszczone)
-                fig_candle.add_trace(
-                    go.Scatter(
-                        x=df_hist['date'],
-                        y=[tech['ma_20']] * len(df_hist),
-                        mode='lines',
-                        name='MA20',
-                        line=dict(color='#ffed4e', width=1, dash='dot')
-                    ),
-                    row=1, col=1
-                )
-
-            # Volume
-            colors = ['#39ff14' if row['close'] >= row['open'] else '#ff073a' for _, row in df_hist.iterrows()]
-
-            fig_candle.add_trace(
-                go.Bar(
-                    x=df_hist['date'],
-                    y=df_hist['volume'],
-                    name='Volume',
-                    marker_color=colors,
-                    opacity=0.5
-                ),
-                row=2, col=1
-            )
-
-            # Apply theme
-            theme_config = apply_chart_theme()
-            theme_config.pop('title', None)
-            theme_config.pop('legend', None)
-
-            fig_candle.update_layout(
-                **theme_config,
-                height=600,
-                xaxis_rangeslider_visible=False,
-                showlegend=True,
-                legend=dict(
-                    orientation="h",
-                    yanchor="bottom",
-                    y=1.02,
-                    xanchor="right",
-                    x=1
-                )
-            )
-
-            fig_candle.update_xaxes(gridcolor='rgba(0, 245, 255, 0.1)')
-            fig_candle.update_yaxes(gridcolor='rgba(0, 245, 255, 0.1)')
+            fig_candle = build_candle_fig(_figure_key(data), data)
 
             st.plotly_chart(fig_candle, use_container_width=True)
 
@@ -640,74 +1040,7 @@ if 'stock_data' in st.session_state:
         macd_data = tech.get('macd')
 
         if macd_data and data['history']:
-            df_hist = pd.DataFrame(data['history'])
-            df_hist['date'] = pd.to_datetime(df_hist['date'])
-
-            fig_macd = make_subplots(
-                rows=2, cols=1,
-                shared_xaxes=True,
-                vertical_spacing=0.03,
-                subplot_titles=('MACD Line & Signal', 'Histogram'),
-                row_heights=[0.6, 0.4]
-            )
-
-            # MACD Line
-            fig_macd.add_trace(
-                go.Scatter(
-                    x=df_hist['date'],
-                    y=macd_data['macd_line'],
-                    mode='lines',
-                    name='MACD',
-                    line=dict(color='#00f5ff', width=2)
-                ),
-                row=1, col=1
-            )
-
-            # Signal Line
-            fig_macd.add_trace(
-                go.Scatter(
-                    x=df_hist['date'],
-                    y=macd_data['signal_line'],
-                    mode='lines',
-                    name='Signal',
-                    line=dict(color='#ff006e', width=2)
-                ),
-                row=1, col=1
-            )
-
-            # Histogram
-            colors = ['#39ff14' if h > 0 else '#ff073a' for h in macd_data['histogram']]
-            fig_macd.add_trace(
-                go.Bar(
-                    x=df_hist['date'],
-                    y=macd_data['histogram'],
-                    name='Histogram',
-                    marker_color=colors,
-                    opacity=0.6
-                ),
-                row=2, col=1
-            )
-
-            # Apply theme
-            theme_config = apply_chart_theme()
-            theme_config.pop('title', None)
-            theme_config.pop('legend', None)
-
-            fig_macd.update_layout(
-                **theme_config,
-                height=500,
-                showlegend=True,
-                legend=dict(
-                    orientation="h",
-                    yanchor="bottom",
-                    y=1.02,
-                    xanchor="right",
-                    x=1
-                )
-            )
-
-            fig_macd.update_xaxes(gridcolor='rgba(0, 245, 255, 0.1)')
-            fig_macd.update_yaxes(gridcolor='rgba(0, 245, 255, 0.1)')
+            fig_macd = build_macd_fig(_figure_key(data), data)
 
             st.plotly_chart(fig_macd, use_container_width=True)
 
@@ -736,77 +1069,7 @@ if 'stock_data' in st.session_state:
         bb_data = tech.get('bollinger_bands')
 
         if bb_data and data['history']:
-            df_hist = pd.DataFrame(data['history'])
-            df_hist['date'] = pd.to_datetime(df_hist['date'])
-
-            fig_bb = go.Figure()
-
-            # Upper Band
-            fig_bb.add_trace(
-                go.Scatter(
-                    x=df_hist['date'],
-                    y=bb_data['upper_band'],
-                    mode='lines',
-                    name='Upper Band',
-                    line=dict(color='#ff006e', width=1, dash='dash')
-                )
-            )
-
-            # Middle Band (SMA)
-            fig_bb.add_trace(
-                go.Scatter(
-                    x=df_hist['date'],
-                    y=bb_data['middle_band'],
-                    mode='lines',
-                    name='SMA (20)',
-                    line=dict(color='#ffed4e', width=2)
-                )
-            )
-
-            # Lower Band
-            fig_bb.add_trace(
-                go.Scatter(
-                    x=df_hist['date'],
-                    y=bb_data['lower_band'],
-                    mode='lines',
-                    name='Lower Band',
-                    line=dict(color='#ff006e', width=1, dash='dash'),
-                    fill='tonexty',
-                    fillcolor='rgba(255, 0, 110, 0.1)'
-                )
-            )
-
-            # Price (Close)
-            fig_bb.add_trace(
-                go.Scatter(
-                    x=df_hist['date'],
-                    y=df_hist['close'],
-                    mode='lines',
-                    name='Close Price',
-                    line=dict(color='#00f5ff', width=2)
-                )
-            )
-
-            # Apply theme
-            theme_config = apply_chart_theme()
-            theme_config.pop('title', None)
-            theme_config.pop('legend', None)
-
-            fig_bb.update_layout(
-                **theme_config,
-                height=500,
-                showlegend=True,
-                legend=dict(
-                    orientation="h",
-                    yanchor="bottom",
-                    y=1.02,
-                    xanchor="right",
-                    x=1
-                )
-            )
-
-            fig_bb.update_xaxes(gridcolor='rgba(0, 245, 255, 0.1)')
-            fig_bb.update_yaxes(gridcolor='rgba(0, 245, 255, 0.1)')
+            fig_bb = build_bb_fig(_figure_key(data), data)
 
             st.plotly_chart(fig_bb, use_container_width=True)
 
@@ -841,41 +1104,15 @@ if 'stock_data' in st.session_state:
 
             fund = data['fundamentals']
 
-            fund_data = []
-
-            # Valuation
-            if fund.get('pe_ratio'):
-                fund_data.append({"Metric": "P/E Ratio", "Value": f"{fund['pe_ratio']:.2f}"})
-            if fund.get('pb_ratio'):
-                fund_data.append({"Metric": "P/B Ratio", "Value": f"{fund['pb_ratio']:.2f}"})
-            if fund.get('peg_ratio'):
-                fund_data.append({"Metric": "PEG Ratio", "Value": f"{fund['peg_ratio']:.2f}"})
-
-            # Profitability
-            if fund.get('roe'):
-                fund_data.append({"Metric": "ROE", "Value": f"{fund['roe']*100:.1f}%"})
-            if fund.get('roa'):
-                fund_data.append({"Metric": "ROA", "Value": f"{fund['roa']*100:.1f}%"})
-            if fund.get('profit_margin'):
-                fund_data.append({"Metric": "Profit Margin", "Value": f"{fund['profit_margin']*100:.1f}%"})
-
-            # Debt
-            if fund.get('debt_to_equity'):
-                fund_data.append({"Metric": "Debt/Equity", "Value": f"{fund['debt_to_equity']:.2f}"})
-
-            # Growth
-            if fund.get('revenue_growth'):
-                fund_data.append({"Metric": "Revenue Growth", "Value": f"{fund['revenue_growth']*100:.1f}%"})
-            if fund.get('earnings_growth'):
-                fund_data.append({"Metric": "Earnings Growth", "Value": f"{fund['earnings_growth']*100:.1f}%"})
-
-            # Dividend
-            if fund.get('dividend_yield'):
-                fund_data.append({"Metric": "Dividend Yield", "Value": f"{fund['dividend_yield']*100:.2f}%"})
+            fund_data = [
+                {"Metric": label, "Value": fmt.format(fund[key])}
+                for key, label, fmt in FUNDAMENTALS_TABLE_SPEC
+                if fund.get(key)
+            ]
 
             if fund_data:
-                df_fund = pd.DataFrame(fund_data)
-                st.dataframe(df_fund, use_container_width=True, hide_index=True)
+                df_fund = pd.DataFrame.from_records(fund_data)
+                st.table(df_fund.set_index('Metric'))  # statyczna tabela HTML - bez komponentu data grid
 
                 # Educational expander for fundamentals
                 with st.expander("📖 Co to znaczy? (Fundamentals)"):
@@ -909,41 +1146,15 @@ if 'stock_data' in st.session_state:
 
             tech = data['technicals']
 
-            tech_data = []
-
-            # Moving Averages
-            if tech.get('ma_20'):
-                tech_data.append({"Metric": "MA(20)", "Value": f"${tech['ma_20']:.2f}"})
-            if tech.get('ma_50'):
-                tech_data.append({"Metric": "MA(50)", "Value": f"${tech['ma_50']:.2f}"})
-            if tech.get('ma_200'):
-                tech_data.append({"Metric": "MA(200)", "Value": f"${tech['ma_200']:.2f}"})
-
-            # Signals
-            if tech.get('cross_signal'):
-                tech_data.append({"Metric": "MA Signal", "Value": tech['cross_signal']})
-
-            # RSI
-            if tech.get('rsi'):
-                tech_data.append({"Metric": "RSI(14)", "Value": f"{tech['rsi']:.1f}"})
-
-            # Volume
-            if tech.get('volume_signal'):
-                tech_data.append({"Metric": "Volume", "Value": tech['volume_signal']})
-
-            # 52w High/Low
-            if tech.get('52w_high'):
-                tech_data.append({"Metric": "52w High", "Value": f"${tech['52w_high']:.2f}"})
-            if tech.get('52w_low'):
-                tech_data.append({"Metric": "52w Low", "Value": f"${tech['52w_low']:.2f}"})
-
-            # Beta
-            if tech.get('beta'):
-                tech_data.append({"Metric": "Beta", "Value": f"{tech['beta']:.2f}"})
+            tech_data = [
+                {"Metric": label, "Value": fmt.format(tech[key])}
+                for key, label, fmt in TECHNICALS_TABLE_SPEC
+                if tech.get(key)
+            ]
 
             if tech_data:
-                df_tech = pd.DataFrame(tech_data)
-                st.dataframe(df_tech, use_container_width=True, hide_index=True)
+                df_tech = pd.DataFrame.from_records(tech_data)
+                st.table(df_tech.set_index('Metric'))  # statyczna tabela HTML - bez komponentu data grid
 
                 # Educational expander for technicals
                 with st.expander("📖 Co to znaczy? (Technicals)"):
@@ -978,8 +1189,7 @@ if 'stock_data' in st.session_state:
 
     with tab4:
         # Raw data & details
-        st.markdown("#### 🔍 Raw Data (Debug)")
-        st.json(data)
+        render_raw_data(data)
 
 else:
     # No data yet
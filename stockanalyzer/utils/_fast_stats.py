@@ -0,0 +1,359 @@
+"""
+STOCKANALYZER - Fast Stats (Numba kernels)
+
+Proste redukcje statystyczne wspólne dla stron (Makro i inne).
+Kompilowane z jawną sygnaturą + cache=True: Numba kompiluje je przy imporcie
+i zapisuje wynik na dysku (__pycache__), więc kolejne cold starty Streamlit
+wczytują gotowy kod zamiast kompilować od nowa.
+
+Bez Numby pętle szłyby w interpreterze element po elemencie, więc pod każdym
+kernelem jest jego wektorowa wersja NumPy (if not NUMBA_AVAILABLE).
+
+Użycie:
+    from utils._fast_stats import quad_stats, column_stats, rolling_mean_std, lttb_indices, linreg_stats
+
+    v_min, v_max, v_mean, v_std = quad_stats(values)  # values: float64 1D
+    stats = column_stats(panel)                       # per kolumna: mean, std, first, last
+    sma, sd = rolling_mean_std(close, 20)             # jak rolling(20).mean() / .std()
+    idx = lttb_indices(x, y, 1000)                    # indeksy punktów do wykresu
+    r, slope, intercept = linreg_stats(x, y)          # regresja y = slope * x + intercept
+"""
+
+import math
+
+import numpy as np
+
+from utils._njit import njit, NUMBA_AVAILABLE
+
+
+@njit('UniTuple(f8, 4)(f8[:])', cache=True)
+def quad_stats(a):
+    """
+    Min, max, średnia i odchylenie standardowe w jednym przejściu po tablicy.
+
+    Średnia i wariancja metodą Welforda - bez odejmowania dużych sum
+    (utrata precyzji przy wartościach rzędu bilansu Fed w $M).
+
+    Args:
+        a: Tablica float64 (bez NaN)
+
+    Returns:
+        Tuple: (min, max, mean, std) - std z ddof=1, jak pandas Series.std();
+        pusta tablica → same NaN
+    """
+    if a.size == 0:
+        return math.nan, math.nan, math.nan, math.nan
+
+    mn = a[0]
+    mx = a[0]
+    mean = 0.0
+    m2 = 0.0
+    n = a.size
+    for i in range(n):
+        v = a[i]
+        if v < mn:
+            mn = v
+        if v > mx:
+            mx = v
+        d = v - mean
+        mean += d / (i + 1)
+        m2 += d * (v - mean)
+    var = m2 / (n - 1) if n > 1 else 0.0
+    return mn, mx, mean, math.sqrt(var)
+
+
+if not NUMBA_AVAILABLE:
+    def quad_stats(a):
+        """Min, max, średnia, std (ddof=1) - wersja NumPy"""
+        if a.size == 0:
+            return math.nan, math.nan, math.nan, math.nan
+        std = a.std(ddof=1) if a.size > 1 else 0.0
+        return float(a.min()), float(a.max()), float(a.mean()), float(std)
+
+
+@njit('f8[:, :](f8[:, :])', cache=True)
+def column_stats(a):
+    """
+    Średnia, odchylenie, pierwsza i ostatnia wartość każdej kolumny w jednym przejściu.
+
+    NaN (brak obserwacji serii w danej dacie) są pomijane. Średnia i wariancja
+    metodą Welforda.
+
+    Args:
+        a: Tablica float64 (wiersze = daty, kolumny = serie)
+
+    Returns:
+        Tablica (kolumny, 4): mean, std (ddof=0, jak np.nanstd), first, last;
+        kolumna bez obserwacji → same NaN
+    """
+    rows, cols = a.shape
+    out = np.full((cols, 4), np.nan)
+    for j in range(cols):
+        n = 0
+        mean = 0.0
+        m2 = 0.0
+        for i in range(rows):
+            v = a[i, j]
+            if math.isnan(v):
+                continue
+            if n == 0:
+                out[j, 2] = v
+            n += 1
+            d = v - mean
+            mean += d / n
+            m2 += d * (v - mean)
+            out[j, 3] = v
+        if n > 0:
+            out[j, 0] = mean
+            out[j, 1] = math.sqrt(m2 / n)
+    return out
+
+
+if not NUMBA_AVAILABLE:
+    def column_stats(a):
+        """Mean, std (ddof=0), first, last każdej kolumny z pominięciem NaN - wersja NumPy"""
+        rows, cols = a.shape
+        valid = ~np.isnan(a)
+        counts = valid.sum(axis=0)
+        out = np.full((cols, 4), np.nan)
+        has = counts > 0
+        if not has.any():
+            return out
+
+        filled = np.where(valid, a, 0.0)
+        mean = filled.sum(axis=0)[has] / counts[has]
+        dev = np.where(valid[:, has], a[:, has] - mean, 0.0)
+        cols_idx = np.arange(cols)[has]
+        out[has, 0] = mean
+        out[has, 1] = np.sqrt((dev * dev).sum(axis=0) / counts[has])
+        out[has, 2] = a[valid.argmax(axis=0)[has], cols_idx]
+        out[has, 3] = a[rows - 1 - valid[::-1].argmax(axis=0)[has], cols_idx]
+        return out
+
+
+@njit('UniTuple(f8[:], 2)(f8[:], i8)', cache=True)
+def rolling_mean_std(a, window):
+    """
+    Średnia krocząca i odchylenie standardowe z okna w jednym przejściu.
+
+    Sumy okna aktualizowane przesuwnie (dodaj nowy, odejmij wypadający),
+    liczone względem pierwszej wartości - ogranicza utratę precyzji.
+
+    Args:
+        a: Tablica float64 (NaN dozwolone)
+        window: Długość okna (>= 2)
+
+    Returns:
+        Tuple: (mean, std) - tablice długości a, std z ddof=1; NaN gdy okno niepełne
+        lub zawiera NaN (jak pandas rolling(window).mean() / .std())
+    """
+    n = a.size
+    mean = np.full(n, np.nan)
+    std = np.full(n, np.nan)
+
+    ref = 0.0
+    for i in range(n):
+        if not math.isnan(a[i]):
+            ref = a[i]
+            break
+
+    s = 0.0
+    s2 = 0.0
+    nan_count = 0
+    for i in range(n):
+        v = a[i]
+        if math.isnan(v):
+            nan_count += 1
+        else:
+            d = v - ref
+            s += d
+            s2 += d * d
+        if i >= window:
+            old = a[i - window]
+            if math.isnan(old):
+                nan_count -= 1
+            else:
+                d = old - ref
+                s -= d
+                s2 -= d * d
+        if i >= window - 1 and nan_count == 0:
+            mean[i] = ref + s / window
+            var = (s2 - s * s / window) / (window - 1)
+            std[i] = math.sqrt(max(var, 0.0))
+    return mean, std
+
+
+if not NUMBA_AVAILABLE:
+    def rolling_mean_std(a, window):
+        """Rolling mean/std (ddof=1) jak pandas rolling(window) - wersja NumPy (okna jako widok)"""
+        n = a.size
+        mean = np.full(n, np.nan)
+        std = np.full(n, np.nan)
+        if n >= window:
+            windows = np.lib.stride_tricks.sliding_window_view(a, window)
+            mean[window - 1:] = windows.mean(axis=1)
+            std[window - 1:] = windows.std(axis=1, ddof=1)
+        return mean, std
+
+
+@njit('UniTuple(f8, 3)(f8[:], f8[:])', cache=True)
+def linreg_stats(x, y):
+    """
+    Korelacja Pearsona i regresja liniowa y na x w jednym przejściu.
+
+    Sumy liczone od pierwszego punktu (przesunięcie), żeby ograniczyć utratę
+    precyzji przy dużych wartościach (np. ceny BTC vs płynność w $B).
+
+    Args:
+        x: Niepusta tablica float64 (bez NaN)
+        y: Tablica float64 tej samej długości (bez NaN)
+
+    Returns:
+        Tuple: (r, slope, intercept) - jak r_value/slope/intercept z scipy.stats.linregress;
+        r = 0 gdy któraś seria jest stała
+    """
+    n = x.size
+    x0 = x[0]
+    y0 = y[0]
+    sx = 0.0
+    sy = 0.0
+    sxx = 0.0
+    syy = 0.0
+    sxy = 0.0
+    for i in range(n):
+        dx = x[i] - x0
+        dy = y[i] - y0
+        sx += dx
+        sy += dy
+        sxx += dx * dx
+        syy += dy * dy
+        sxy += dx * dy
+    cov = n * sxy - sx * sy
+    var_x = n * sxx - sx * sx
+    var_y = n * syy - sy * sy
+    r = cov / math.sqrt(var_x * var_y) if var_x > 0 and var_y > 0 else 0.0
+    slope = cov / var_x if var_x > 0 else 0.0
+    intercept = y0 + (sy - slope * sx) / n - slope * x0
+    return r, slope, intercept
+
+
+if not NUMBA_AVAILABLE:
+    def linreg_stats(x, y):
+        """Korelacja Pearsona + regresja liniowa y na x - wersja NumPy (te same sumy co kernel)"""
+        n = x.size
+        dx = x - x[0]
+        dy = y - y[0]
+        sx = dx.sum()
+        sy = dy.sum()
+        cov = n * dx.dot(dy) - sx * sy
+        var_x = n * dx.dot(dx) - sx * sx
+        var_y = n * dy.dot(dy) - sy * sy
+        r = cov / math.sqrt(var_x * var_y) if var_x > 0 and var_y > 0 else 0.0
+        slope = cov / var_x if var_x > 0 else 0.0
+        intercept = y[0] + (sy - slope * sx) / n - slope * x[0]
+        return float(r), float(slope), float(intercept)
+
+
+@njit('i8[:](f8[:], f8[:], i8)', cache=True)
+def lttb_indices(x, y, n_out):
+    """
+    Downsampling Largest-Triangle-Three-Buckets - indeksy punktów zachowujących kształt linii.
+
+    Pierwszy i ostatni punkt zawsze zostają; z każdego kubełka pomiędzy
+    wybierany jest punkt tworzący największy trójkąt z poprzednio wybranym
+    punktem i średnią następnego kubełka.
+
+    Args:
+        x: Oś X jako float64 (np. daty w ns), rosnąco
+        y: Wartości float64 (bez NaN)
+        n_out: Docelowa liczba punktów (>= 3)
+
+    Returns:
+        Tablica int64 rosnących indeksów (wszystkie, gdy n <= n_out)
+    """
+    n = x.size
+    if n_out >= n or n_out < 3:
+        return np.arange(n)
+
+    out = np.empty(n_out, dtype=np.int64)
+    out[0] = 0
+    out[n_out - 1] = n - 1
+    every = (n - 2) / (n_out - 2)
+    a = 0
+
+    for i in range(n_out - 2):
+        # Średnia następnego kubełka (dla ostatniego - ostatni punkt)
+        nxt_start = int((i + 1) * every) + 1
+        nxt_end = min(int((i + 2) * every) + 1, n)
+        avg_x = 0.0
+        avg_y = 0.0
+        for j in range(nxt_start, nxt_end):
+            avg_x += x[j]
+            avg_y += y[j]
+        cnt = nxt_end - nxt_start
+        if cnt > 0:
+            avg_x /= cnt
+            avg_y /= cnt
+        else:
+            avg_x = x[n - 1]
+            avg_y = y[n - 1]
+
+        # Punkt bieżącego kubełka z największym polem trójkąta
+        start = int(i * every) + 1
+        end = int((i + 1) * every) + 1
+        ax = x[a]
+        ay = y[a]
+        best = start
+        best_area = -1.0
+        for j in range(start, end):
+            area = abs((ax - avg_x) * (y[j] - ay) - (ax - x[j]) * (avg_y - ay))
+            if area > best_area:
+                best_area = area
+                best = j
+        out[i + 1] = best
+        a = best
+
+    return out
+
+
+if not NUMBA_AVAILABLE:
+    def lttb_indices(x, y, n_out):
+        """
+        Downsampling LTTB - wersja NumPy.
+
+        Kotwicą trójkąta jest średnia poprzedniego kubełka (zamiast poprzednio
+        wybranego punktu), więc wszystkie kubełki liczone są naraz, bez pętli.
+        Wybrane punkty mogą się nieznacznie różnić od kernela.
+        """
+        n = x.size
+        if n_out >= n or n_out < 3:
+            return np.arange(n)
+
+        every = (n - 2) / (n_out - 2)
+        # Granice kubełków środkowych: [bounds[i], bounds[i + 1])
+        bounds = (np.arange(n_out - 1) * every).astype(np.int64) + 1
+        bounds[-1] = n - 1
+        lengths = np.diff(bounds)
+        bucket = np.repeat(np.arange(n_out - 2), lengths)
+
+        sum_x = np.add.reduceat(x[1:n - 1], bounds[:-1] - 1)
+        sum_y = np.add.reduceat(y[1:n - 1], bounds[:-1] - 1)
+        # Średnie kubełków z pierwszym i ostatnim punktem jako skrajnymi "kubełkami"
+        avg_x = np.concatenate(([x[0]], sum_x / lengths, [x[n - 1]]))
+        avg_y = np.concatenate(([y[0]], sum_y / lengths, [y[n - 1]]))
+
+        ax, ay = avg_x[bucket], avg_y[bucket]
+        cx, cy = avg_x[bucket + 2], avg_y[bucket + 2]
+        px, py = x[1:n - 1], y[1:n - 1]
+        area = np.abs((ax - cx) * (py - ay) - (ax - px) * (cy - ay))
+
+        # Pierwszy punkt z maksymalnym polem w każdym kubełku
+        best = np.maximum.reduceat(area, bounds[:-1] - 1)
+        hits = np.flatnonzero(area == best[bucket])
+        _, first = np.unique(bucket[hits], return_index=True)
+
+        out = np.empty(n_out, dtype=np.int64)
+        out[0] = 0
+        out[1:n_out - 1] = hits[first] + 1
+        out[n_out - 1] = n - 1
+        return out
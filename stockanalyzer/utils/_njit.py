@@ -0,0 +1,29 @@
+"""
+STOCKANALYZER - Numba JIT (opcjonalny)
+
+Eksportuje `njit` z Numba. Gdy Numba nie jest zainstalowana, `njit` jest
+no-opem i funkcje działają jako zwykły Python/NumPy (wolniej, ale poprawnie).
+
+Użycie:
+    from utils._njit import njit
+
+    @njit(cache=True)
+    def kernel(a):
+        ...
+"""
+
+try:
+    from numba import njit
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+
+    def njit(*args, **kwargs):
+        """No-op zamiennik numba.njit - obsługuje @njit oraz @njit(...)"""
+        if len(args) == 1 and callable(args[0]) and not kwargs:
+            return args[0]
+
+        def decorator(func):
+            return func
+
+        return decorator
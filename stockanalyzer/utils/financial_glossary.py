@@ -8,6 +8,7 @@ Użycie:
     from utils.financial_glossary import get_explanation, format_term_with_tooltip
 """
 
+from functools import lru_cache
 from typing import Dict, Tuple
 
 
@@ -380,9 +381,10 @@ Czasem są w konflikcie (wysoka inflacja = FED podnosi stopy = bezrobocie rośni
 # HELPER FUNCTIONS
 # ============================================
 
+@lru_cache(maxsize=128)
 def get_explanation(term: str) -> Tuple[str, str, str, str]:
     """
-    Zwraca wyjaśnienie terminu.
+    Zwraca wyjaśnienie terminu (krotka niemutowalna - wynik cache'owany per termin).
 
     Args:
         term: Nazwa terminu (np. 'VIX', 'SOFR')
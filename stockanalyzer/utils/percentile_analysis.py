@@ -12,6 +12,7 @@ Użycie:
     from utils.percentile_analysis import calculate_percentile, interpret_percentile
 
     percentile = calculate_percentile(current_value, historical_values)
+    # lub na posortowanej historii (np. z cache): percentile_from_sorted(current_value, sorted_values)
     interpretation = interpret_percentile('VIX', percentile)
 """
 
@@ -51,6 +52,34 @@ def calculate_percentile(current_value: float, historical_data: pd.Series) -> fl
     return round(percentile, 1)
 
 
+def percentile_from_sorted(current_value: float, sorted_values: np.ndarray) -> float:
+    """
+    Percentyl jak w calculate_percentile, ale na posortowanej tablicy (bez NaN).
+
+    Wyszukiwanie binarne O(log n) - opłaca się, gdy posortowana historia jest
+    trzymana w cache i używana przy wielu rerunach.
+
+    Args:
+        current_value: Obecna wartość wskaźnika
+        sorted_values: Rosnąco posortowana tablica wartości historycznych (bez NaN)
+
+    Returns:
+        float: Percentyl (0-100) - odsetek wartości historycznych < current_value
+
+    Example:
+        >>> percentile_from_sorted(22, np.array([10, 15, 20, 25, 30]))
+        60.0
+    """
+    if current_value is None or sorted_values.size == 0:
+        return 50.0
+
+    # side='left' = liczba wartości ściśle mniejszych (jak historical_data < current_value);
+    # current_value w typie tablicy, żeby float32 porównywał się z float32
+    current = np.asarray(current_value, dtype=sorted_values.dtype)
+    below = np.searchsorted(sorted_values, current, side='left')
+    return round(float(below) / sorted_values.size * 100, 1)
+
+
 def interpret_percentile(
     indicator_name: str,
     percentile: float,
@@ -16,6 +16,12 @@ import numpy as np
 from typing import Dict, Tuple
 from datetime import datetime, timedelta
 
+from utils._njit import njit, NUMBA_AVAILABLE
+
+
+# Kolejność regime = kod numeryczny (UNKNOWN=0, RISK_ON=1, RISK_OFF=2, CRISIS=3)
+REGIME_ORDER = ['UNKNOWN', 'RISK_ON', 'RISK_OFF', 'CRISIS']
+
 
 def calculate_regime_for_day(
     vix: float,
@@ -132,7 +138,8 @@ def calculate_regime_history(indicators: Dict) -> pd.DataFrame:
         indicators: Dict z danymi wskaźników (z fred_collector)
 
     Returns:
-        DataFrame z kolumnami: date, regime, confidence, vix, spread, reserves
+        DataFrame z kolumnami: date, regime, regime_numeric, confidence, vix, spread, reserves
+        (regime_numeric = kod int8 wg REGIME_ORDER)
 
     Example:
         >>> history = calculate_regime_history(fred_data['indicators'])
@@ -148,7 +155,7 @@ def calculate_regime_history(indicators: Dict) -> pd.DataFrame:
 
     if vix_data is None or spread_data is None:
         # Return empty DataFrame if missing critical data
-        return pd.DataFrame(columns=['date', 'regime', 'confidence', 'vix', 'spread', 'reserves'])
+        return pd.DataFrame(columns=['date', 'regime', 'regime_numeric', 'confidence', 'vix', 'spread', 'reserves'])
 
     # Merge all data on date
     result = vix_data[['date', 'value']].copy()
@@ -190,6 +197,10 @@ def calculate_regime_history(indicators: Dict) -> pd.DataFrame:
         confidences.append(confidence)
 
     result['regime'] = regimes
+    # Kody liczbowe przez Categorical - jedna pętla w C zamiast mapowania słownikiem
+    result['regime_numeric'] = pd.Categorical(
+        regimes, categories=REGIME_ORDER, ordered=True
+    ).codes.astype(np.int8)
     result['confidence'] = confidences
 
     # Sort by date
@@ -198,6 +209,75 @@ def calculate_regime_history(indicators: Dict) -> pd.DataFrame:
     return result
 
 
+def _regime_codes(history_df: pd.DataFrame) -> np.ndarray:
+    """
+    Kody int8 regime (wg REGIME_ORDER) - z kolumny regime_numeric lub wyliczone.
+
+    Regime spoza REGIME_ORDER (kod -1 z Categorical) dostaje kod UNKNOWN -
+    inaczej REGIME_ORDER[-1] zamieniłby go po cichu na 'CRISIS'.
+    """
+    if 'regime_numeric' in history_df.columns:
+        codes = history_df['regime_numeric'].to_numpy(dtype=np.int8)
+    else:
+        codes = pd.Categorical(
+            history_df['regime'], categories=REGIME_ORDER, ordered=True
+        ).codes.astype(np.int8)
+    return np.where(codes < 0, REGIME_ORDER.index('UNKNOWN'), codes).astype(np.int8)
+
+
+@njit(cache=True)
+def _regime_stats_kernel(codes):
+    """
+    Statystyki regime w jednym przejściu po kodach.
+
+    Returns:
+        Tuple: (counts[4], długość najdłuższego ciągu, jego kod, indeks startu,
+                indeks ostatniej zmiany lub -1)
+    """
+    counts = np.zeros(4, dtype=np.int64)
+    n = codes.size
+    best_len = 0
+    best_code = 0
+    best_start = 0
+    run_start = 0
+    last_change = -1
+
+    for i in range(n):
+        if codes[i] >= 0:
+            counts[codes[i]] += 1
+        if i > 0 and codes[i] != codes[i - 1]:
+            last_change = i
+            if i - run_start > best_len:
+                best_len = i - run_start
+                best_code = codes[i - 1]
+                best_start = run_start
+            run_start = i
+
+    # Ostatni ciąg
+    if n - run_start > best_len:
+        best_len = n - run_start
+        best_code = codes[n - 1]
+        best_start = run_start
+
+    return counts, best_len, best_code, best_start, last_change
+
+
+if not NUMBA_AVAILABLE:
+    def _regime_stats_kernel(codes):
+        """Statystyki regime (jak wyżej) - wersja NumPy przez granice ciągów"""
+        counts = np.bincount(codes[codes >= 0].astype(np.int64), minlength=4)[:4]
+        n = codes.size
+        if n == 0:
+            return counts, 0, 0, 0, -1
+
+        changes = np.flatnonzero(codes[1:] != codes[:-1]) + 1
+        starts = np.concatenate(([0], changes))
+        lengths = np.diff(np.append(starts, n))
+        k = int(lengths.argmax())  # pierwszy najdłuższy ciąg, jak w pętli
+        last_change = int(changes[-1]) if changes.size else -1
+        return counts, int(lengths[k]), int(codes[starts[k]]), int(starts[k]), last_change
+
+
 def get_regime_stats(history_df: pd.DataFrame) -> Dict:
     """
     Oblicza statystyki regime history.
@@ -227,8 +307,16 @@ def get_regime_stats(history_df: pd.DataFrame) -> Dict:
             'longest_streak': {'regime': 'UNKNOWN', 'days': 0}
         }
 
-    # Count days in each regime
-    regime_counts = history_df['regime'].value_counts().to_dict()
+    # Jedno przejście po kodach int8: liczności, najdłuższy ciąg, ostatnia zmiana
+    counts, best_len, best_code, best_start, last_change = _regime_stats_kernel(_regime_codes(history_df))
+    dates = history_df['date']
+
+    # Count days in each regime (malejąco, jak value_counts)
+    regime_counts = {
+        REGIME_ORDER[code]: int(counts[code])
+        for code in np.argsort(-counts, kind='stable')
+        if counts[code] > 0
+    }
 
     # Calculate percentages
     total_days = len(history_df)
@@ -238,47 +326,18 @@ def get_regime_stats(history_df: pd.DataFrame) -> Dict:
     }
 
     # Current regime
-    current_regime = history_df.iloc[-1]['regime']
-
-    # Find last regime change
-    last_regime_change = None
-    if len(history_df) > 1:
-        for i in range(len(history_df) - 1, 0, -1):
-            if history_df.iloc[i]['regime'] != history_df.iloc[i-1]['regime']:
-                last_regime_change = history_df.iloc[i]['date']
-                break
-
-    # Find longest streak
-    longest_streak = {'regime': 'UNKNOWN', 'days': 0, 'start_date': None, 'end_date': None}
-    current_streak_regime = None
-    current_streak_length = 0
-    current_streak_start = None
-
-    for i, row in history_df.iterrows():
-        if row['regime'] != current_streak_regime:
-            # Streak ended, check if it was longest
-            if current_streak_length > longest_streak['days']:
-                longest_streak = {
-                    'regime': current_streak_regime,
-                    'days': current_streak_length,
-                    'start_date': current_streak_start,
-                    'end_date': history_df.iloc[i-1]['date'] if i > 0 else None
-                }
-            # Start new streak
-            current_streak_regime = row['regime']
-            current_streak_length = 1
-            current_streak_start = row['date']
-        else:
-            current_streak_length += 1
-
-    # Check last streak
-    if current_streak_length > longest_streak['days']:
-        longest_streak = {
-            'regime': current_streak_regime,
-            'days': current_streak_length,
-            'start_date': current_streak_start,
-            'end_date': history_df.iloc[-1]['date']
-        }
+    current_regime = history_df['regime'].iloc[-1]
+
+    # Last regime change
+    last_regime_change = dates.iloc[last_change] if last_change >= 0 else None
+
+    # Longest streak
+    longest_streak = {
+        'regime': REGIME_ORDER[best_code],
+        'days': int(best_len),
+        'start_date': dates.iloc[best_start],
+        'end_date': dates.iloc[best_start + best_len - 1]
+    }
 
     return {
         'regime_counts': regime_counts,
@@ -290,6 +349,26 @@ def get_regime_stats(history_df: pd.DataFrame) -> Dict:
     }
 
 
+@njit(cache=True)
+def _transitions_loop(codes):
+    """Indeksy wierszy, w których kod regime różni się od poprzedniego (jedno przejście)"""
+    n = codes.size
+    idx = np.empty(n, dtype=np.int64)
+    k = 0
+    for i in range(1, n):
+        if codes[i] != codes[i - 1]:
+            idx[k] = i
+            k += 1
+    return idx[:k]
+
+
+if not NUMBA_AVAILABLE:
+    # Bez Numby pętla szłaby w interpreterze po każdym dniu - te same wyniki wektorowo
+    def _transitions_loop(codes):
+        """Indeksy zmian kodu regime - wersja NumPy"""
+        return np.flatnonzero(codes[1:] != codes[:-1]) + 1
+
+
 def detect_regime_transitions(history_df: pd.DataFrame) -> pd.DataFrame:
     """
     Wykrywa wszystkie zmiany regime (transition points).
@@ -310,20 +389,16 @@ def detect_regime_transitions(history_df: pd.DataFrame) -> pd.DataFrame:
     if history_df.empty or len(history_df) < 2:
         return pd.DataFrame(columns=['date', 'from_regime', 'to_regime'])
 
-    transitions = []
-
-    for i in range(1, len(history_df)):
-        current = history_df.iloc[i]
-        previous = history_df.iloc[i-1]
-
-        if current['regime'] != previous['regime']:
-            transitions.append({
-                'date': current['date'],
-                'from_regime': previous['regime'],
-                'to_regime': current['regime']
-            })
+    idx = _transitions_loop(_regime_codes(history_df))
+    if idx.size == 0:
+        return pd.DataFrame(columns=['date', 'from_regime', 'to_regime'])
 
-    return pd.DataFrame(transitions)
+    regimes = history_df['regime'].to_numpy()
+    return pd.DataFrame({
+        'date': history_df['date'].to_numpy()[idx],
+        'from_regime': regimes[idx - 1],
+        'to_regime': regimes[idx]
+    })
 
 
 # ============================================